@@ -0,0 +1,14 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Benchmarks for ReadySetDone.
+
+Run a benchmark as a module from the repository root, e.g.:
+
+    python -m benchmarks.bench_first_command --tasks 1000
+
+`bench_core` times the store, codec, sorting, rendering and IPC paths in
+process and compares them with `core_baseline.json`. `bench_load` drives a
+daemon with many concurrent clients and subscribers.
+"""
@@ -0,0 +1,175 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Shared helpers for benchmarks that drive the real `rsd`/`rsdd` executables.
+
+Provides a private D-Bus session bus, an isolated XDG environment with a
+generated config and synthetic task store, and daemon lifecycle helpers.
+"""
+
+import json
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BUS_NAME = "com.readysetdone"
+
+
+@contextmanager
+def private_bus() -> Iterator[str]:
+    """Start a throwaway `dbus-daemon` and yield its address."""
+    if shutil.which("dbus-daemon") is None:
+        raise RuntimeError("dbus-daemon is required to run this benchmark")
+    proc = subprocess.Popen(
+        ["dbus-daemon", "--session", "--nofork", "--print-address=1"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        address = proc.stdout.readline().strip()
+        yield address
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def synthetic_tasks(count: int) -> list[dict]:
+    """Generate `count` tasks with a realistic mix of done and pinned tasks."""
+    now = datetime.now()
+    tasks = []
+    for i in range(count):
+        created = now - timedelta(minutes=count - i)
+        done = i % 3 == 0
+        tasks.append(
+            {
+                "id": str(uuid.uuid4()),
+                "task": f"Synthetic task number {i}",
+                "done": done,
+                "created": str(created),
+                "completed": str(created) if done else None,
+                "due": str(now + timedelta(days=i % 30)) if i % 4 == 0 else None,
+                "pinned": i % 25 == 0,
+            }
+        )
+    return tasks
+
+
+def synthetic_descriptions(tasks: list[dict], every: int = 10) -> dict[str, str]:
+    """Generate Markdown descriptions for every `every`-th task, by task ID."""
+    return {
+        task["id"]: (
+            f"# {task['task']}\n\nNotes for step {i} of the synthetic project.\n"
+            "\n- check the inputs\n- write it down\n- follow up next week\n"
+        )
+        for i, task in enumerate(tasks)
+        if i % every == 0
+    }
+
+
+@contextmanager
+def isolated_env(bus_address: str, tasks: int = 0, **daemon_options) -> Iterator[dict]:
+    """
+    Yield an environment with private XDG dirs, a config and a task store.
+
+    Extra keyword arguments are written to the `[daemon]` config section.
+    """
+    root = Path(tempfile.mkdtemp(prefix="rsd-bench-"))
+    try:
+        config_dir = root / "config" / "readysetdone"
+        data_dir = root / "data" / "readysetdone"
+        config_dir.mkdir(parents=True)
+        data_dir.mkdir(parents=True)
+
+        daemon = {
+            "task_store_path": str(data_dir / "tasks.json"),
+            "description_store_path": str(data_dir / "descriptions"),
+            **daemon_options,
+        }
+        lines = ["[rsd]", 'log_level = "warn"', "", "[cli]", "", "[daemon]"]
+        lines += [f"{key} = {json.dumps(value)}" for key, value in daemon.items()]
+        (config_dir / "config.toml").write_text("\n".join(lines) + "\n")
+        (data_dir / "tasks.json").write_text(json.dumps(synthetic_tasks(tasks)))
+
+        env = dict(os.environ)
+        env.update(
+            DBUS_SESSION_BUS_ADDRESS=bus_address,
+            XDG_CONFIG_HOME=str(root / "config"),
+            XDG_DATA_HOME=str(root / "data"),
+            XDG_STATE_HOME=str(root / "state"),
+        )
+        yield env
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def run_cli(env: dict, *args: str) -> float:
+    """Run `rsd` with the given arguments and return its wall time in seconds."""
+    start = time.perf_counter()
+    subprocess.run(["rsd", *args], env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def daemon_pid(env: dict) -> int | None:
+    """Return the PID owning the daemon bus name, or None if it is not running."""
+    result = subprocess.run(
+        [
+            "dbus-send",
+            "--session",
+            "--print-reply=literal",
+            "--dest=org.freedesktop.DBus",
+            "/org/freedesktop/DBus",
+            "org.freedesktop.DBus.GetConnectionUnixProcessID",
+            f"string:{BUS_NAME}",
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return None
+    return int(result.stdout.split()[-1])
+
+
+def stop_daemon(env: dict, timeout: float = 10) -> None:
+    """Terminate the running daemon and wait until it released its bus name."""
+    pid = daemon_pid(env)
+    if pid is None:
+        return
+    os.kill(pid, signal.SIGTERM)
+    deadline = time.monotonic() + timeout
+    while daemon_pid(env) is not None:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"rsdd (pid {pid}) did not stop within {timeout}s")
+        time.sleep(0.01)
+
+
+def git_revision() -> str:
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() or "unknown"
+
+
+def summarize(samples: list[float], digits: int = 2) -> dict:
+    """Summarize wall-time samples (seconds) as milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0] * 1000, digits),
+        "median_ms": round(ordered[len(ordered) // 2] * 1000, digits),
+        "max_ms": round(ordered[-1] * 1000, digits),
+    }
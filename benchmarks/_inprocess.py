@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+In-process transport for benchmarking the IPC layer without a bus.
+
+`inprocess_client` returns a real `DbusClient` whose proxy interface calls the
+daemon's `DbusServerInterface` directly. Arguments and replies are still
+marshalled into D-Bus messages and back, so a round trip covers the client's
+and the server's encoding, the wire format, the request scheduler and the
+task service: everything but the socket and the bus daemon.
+"""
+
+import io
+import re
+from typing import Any, Callable
+
+from dbus_next import Message
+from dbus_next._private.unmarshaller import Unmarshaller
+
+from rsd.ipc import RequestScheduler
+from rsd.ipc.dbus.constants import DBUS_INTERFACE
+from rsd.ipc.dbus.dbus_client import DbusClient
+from rsd.ipc.dbus.dbus_server import DbusServerInterface
+from rsd.service import TaskService
+
+_NAME = ".".join(DBUS_INTERFACE)
+_PATH = "/" + "/".join(DBUS_INTERFACE)
+
+
+def _roundtrip(member: str, signature: str, body: list) -> list:
+    """Marshal a message body and read it back, as the bus would deliver it."""
+    message = Message(
+        destination=_NAME,
+        path=_PATH,
+        interface=_NAME,
+        member=member,
+        signature=signature,
+        body=body,
+    )
+    return Unmarshaller(io.BytesIO(message._marshall())).unmarshall().body
+
+
+class FakeProxyInterface:
+    """Stands in for the dbus-next proxy: `call_list_page` runs `ListPage`."""
+
+    def __init__(self, interface: DbusServerInterface) -> None:
+        self._interface = interface
+        self._methods = {}
+        for name, member in vars(type(interface)).items():
+            method = getattr(member, "__dict__", {}).get("__DBUS_METHOD")
+            if method is not None:
+                snake = re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+                self._methods[f"call_{snake}"] = method
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = self._methods.get(name)
+        if method is None:
+            raise AttributeError(name)
+
+        async def call(*args):
+            args = _roundtrip(method.name, method.in_signature, list(args))
+            result = method.fn(self._interface, *args)
+            if hasattr(result, "__await__"):
+                result = await result
+            if not method.out_signature:
+                return None
+            return _roundtrip(method.name, method.out_signature, [result])[0]
+
+        return call
+
+
+def inprocess_client(
+    task_service: TaskService, scheduler: RequestScheduler | None = None
+) -> DbusClient:
+    """Return a client served in-process by `task_service`, which must be running."""
+    interface = DbusServerInterface(task_service, scheduler or RequestScheduler())
+    client = DbusClient()
+    client._iface = FakeProxyInterface(interface)
+    return client
@@ -0,0 +1,242 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Core benchmarks: task store, codec, sorting, rendering and IPC round trips.
+
+For each store size in `--sizes`, generates a synthetic store (a mix of done,
+pinned and due tasks, a tenth of them with descriptions) and times, in
+process:
+
+- `TaskStore.load_all`, `save`, `delete` and `save_all`;
+- `serialize` and `deserialize` of the whole task list;
+- `sort_tasks` and `get_task_id_by_index`;
+- `RichCli.render` of the sorted list (at most `--render-limit` rows);
+- client -> daemon round trips through a real task service, request
+  scheduler and D-Bus marshalling, over an in-process transport: a 50-task
+  `list_page`, a full `list_tasks` and a `toggle` (a committed write).
+
+Each operation is repeated until a run takes `--min-time`, and the median
+time per call over `--runs` runs is reported. Results are printed and written
+to `--output` as JSON. They are compared with `--baseline`, and the run exits
+non-zero when an operation got more than `--threshold` times slower.
+`--save-baseline` makes this run the new baseline.
+
+    python -m benchmarks.bench_core --sizes 100 10000 --runs 5
+"""
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable
+
+import anyio
+from rich.console import Console
+
+from rsd.api import deserialize, serialize
+from rsd.api.sorting import get_task_id_by_index, sort_tasks
+from rsd.api.types import Id, Task, TaskPage
+from rsd.service import TaskService
+from rsd.service.store.task_store import TaskStore
+from rsd.ui.cli.rich_cli import RichCli
+
+from ._harness import git_revision, summarize, synthetic_descriptions, synthetic_tasks
+from ._inprocess import inprocess_client
+
+BASELINE_FILE = Path(__file__).with_name("core_baseline.json")
+DEFAULT_OUTPUT = Path(__file__).parent / "results" / "core.json"
+MISSING_ID = "00000000-0000-0000-0000-000000000000"
+IPC_BENCHMARKS = ("ipc.list_page", "ipc.list_tasks", "ipc.toggle")
+
+
+async def measure(fn: Callable[[], Any], runs: int, min_time: float) -> dict:
+    """Time `fn` (sync or async) and summarize the time per call."""
+
+    async def run(loops: int) -> float:
+        start = time.perf_counter()
+        for _ in range(loops):
+            result = fn()
+            if inspect.isawaitable(result):
+                await result
+        return time.perf_counter() - start
+
+    # Calibrate like timeit.autorange; the calibration runs double as warm-up
+    loops = 1
+    while (elapsed := await run(loops)) < min_time:
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)))
+    samples = [await run(loops) / loops for _ in range(runs)]
+    return {**summarize(samples, digits=4), "loops": loops}
+
+
+def write_store(path: Path, rows: list[dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(rows))
+
+
+async def bench_size(size: int, args: argparse.Namespace) -> dict[str, dict]:
+    rows = synthetic_tasks(size)
+    tasks = [Task.from_dict(row) for row in rows]
+    payload = serialize(tasks)
+    middle = tasks[size // 2]
+    rendered = sort_tasks(tasks)[: args.render_limit]
+
+    ui = RichCli()
+    devnull = open(os.devnull, "w")
+    ui.console = Console(file=devnull, width=120, force_terminal=True)
+
+    results = {}
+
+    async def bench(name: str, fn: Callable[[], Any]) -> None:
+        if args.filter and args.filter not in name:
+            return
+        result = await measure(fn, args.runs, args.min_time)
+        results[f"{name}/{size}"] = result
+        print(f"{name}/{size}: {result['median_ms']} ms", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory(prefix="rsd-bench-") as tmp, devnull:
+        root = Path(tmp)
+        write_store(root / "store" / "tasks.json", rows)
+        store = TaskStore(str(root / "store" / "tasks.json"))
+        edited = replace(middle, task=f"{middle.task} (edited)")
+
+        await bench("store.load_all", store.load_all)
+        await bench("store.save", lambda: store.save(edited))
+        # A missing ID keeps the store size across runs at the same cost
+        await bench("store.delete", lambda: store.delete(MISSING_ID))
+        await bench("store.save_all", lambda: store.save_all(tasks))
+
+        await bench("codec.serialize", lambda: serialize(tasks))
+        await bench("codec.deserialize", lambda: deserialize(payload))
+
+        await bench("sort.sort_tasks", lambda: sort_tasks(tasks))
+        await bench(
+            "sort.get_task_id_by_index",
+            lambda: get_task_id_by_index(tasks, size // 2 or 1),
+        )
+
+        page = TaskPage(tasks=rendered, total=size)
+        await bench("ui.rich_render", lambda: ui.render(page, color=True, pager=False))
+
+        if args.filter and not any(args.filter in name for name in IPC_BENCHMARKS):
+            return results
+        service_dir = root / "service"
+        write_store(service_dir / "tasks.json", rows)
+        descriptions = service_dir / "descriptions"
+        descriptions.mkdir()
+        for task_id, text in synthetic_descriptions(rows).items():
+            (descriptions / f"{task_id}.md").write_text(text)
+        service = TaskService(
+            service_dir / "tasks.json",
+            descriptions,
+            service_dir / "search_index.json",
+            history_path=service_dir / "history.json",
+            stats_path=service_dir / "stats.json",
+        )
+        async with anyio.create_task_group() as tg:
+            await tg.start(service.run)
+            client = inprocess_client(service)
+            await bench("ipc.list_page", lambda: client.list_page(limit=50))
+            await bench("ipc.list_tasks", client.list_tasks)
+            await bench("ipc.toggle", lambda: client.toggle(Id(middle.id)))
+            await service.aclose()
+            tg.cancel_scope.cancel()
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print each result next to its baseline and return the regressed keys."""
+    regressions = []
+    print(
+        f"\n{'benchmark':<36} {'baseline':>10} {'now':>10} {'ratio':>7}",
+        file=sys.stderr,
+    )
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None or not base["median_ms"]:
+            continue
+        ratio = result["median_ms"] / base["median_ms"]
+        flag = "  slower" if ratio > threshold else ""
+        print(
+            f"{key:<36} {base['median_ms']:>10.3f} {result['median_ms']:>10.3f} "
+            f"{ratio:>6.2f}x{flag}",
+            file=sys.stderr,
+        )
+        if ratio > threshold:
+            regressions.append(key)
+    return regressions
+
+
+async def async_main(args: argparse.Namespace) -> dict:
+    results = {}
+    for size in args.sizes:
+        results.update(await bench_size(size, args))
+    return {
+        "benchmark": "core",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "sizes": args.sizes,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 10_000, 100_000],
+        help="Store sizes (default: 100 10000 100000; up to 1000000)",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Runs per operation")
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="Minimum seconds per run"
+    )
+    parser.add_argument(
+        "--render-limit", type=int, default=10_000, help="Rows rendered at most"
+    )
+    parser.add_argument("--filter", help="Only run operations containing this text")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Slowdown over the baseline that fails the run (default: 1.25)",
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Save this run as the baseline"
+    )
+    args = parser.parse_args()
+
+    result = anyio.run(async_main, args)
+    print(json.dumps(result, indent=2))
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(result, indent=2) + "\n")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(result, indent=2) + "\n")
+        return
+    if not args.baseline.exists():
+        return
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(result["results"], baseline["results"], args.threshold)
+    if regressions:
+        print(f"Slower than the baseline: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
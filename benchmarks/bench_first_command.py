@@ -0,0 +1,53 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+First-command latency of `rsd list` with a cold and a warm daemon.
+
+Cold: no daemon is running, so `rsd` spawns `rsdd` and waits for it to claim
+its bus name. Warm: the daemon is already running with its store preloaded.
+
+Runs against a private `dbus-daemon`, so it never touches the user's session.
+"""
+
+import argparse
+import json
+
+from ._harness import (
+    isolated_env,
+    private_bus,
+    run_cli,
+    stop_daemon,
+    summarize,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1000, help="Store size")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per scenario")
+    args = parser.parse_args()
+
+    cold, warm = [], []
+    with private_bus() as address, isolated_env(address, tasks=args.tasks) as env:
+        for _ in range(args.runs):
+            stop_daemon(env)
+            cold.append(run_cli(env, "list"))
+            warm.append(run_cli(env, "list"))
+        stop_daemon(env)
+
+    print(
+        json.dumps(
+            {
+                "benchmark": "first_command",
+                "tasks": args.tasks,
+                "cold": summarize(cold),
+                "warm": summarize(warm),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
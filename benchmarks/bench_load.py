@@ -0,0 +1,278 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Multi-client load generator for `rsdd`.
+
+Starts a daemon on a private `dbus-daemon` (or targets the daemon already on
+the bus at `--address`) and drives it with simulated clients, each with its
+own bus connection:
+
+- `--clients` active clients, like scripts: each sends requests at `--rate`
+  per second (0: back to back), a `--write-ratio` share of them writes
+  (renaming a probe task the client owns, and deletes at the end) and the
+  rest reads (a 50-task `list_page`);
+- `--subscribers` passive clients, like open TUIs: they only receive the
+  `TaskUpdated` signal, which every write fans out to every client.
+
+Clients are spread over `--processes` worker processes so the load generator
+does not become the bottleneck. With a rate, latency is measured from when
+each request was due rather than when it was sent, so a stalled daemon shows
+up as latency instead of silently lowering the load.
+
+Reports throughput and latency percentiles per request type, the fan-out
+delay from a write being sent to a subscriber having decoded the signal that
+carries it, errors by type, and the daemon's RSS over the run.
+
+    python -m benchmarks.bench_load --clients 8 --subscribers 4 --duration 20
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Optional
+
+import anyio
+
+from rsd.api.types import Id, Task
+from rsd.ipc import get_ipc_client
+
+from ._harness import daemon_pid, isolated_env, private_bus, stop_daemon
+
+_PROBE = "load probe"
+
+
+@dataclass
+class WorkerSpec:
+    address: str
+    worker: int
+    clients: int
+    subscribers: int
+    duration: float
+    rate: float
+    write_ratio: float
+    seed: int
+
+
+def percentiles(samples: list[float]) -> dict:
+    """Summarize latency samples (seconds) as millisecond percentiles."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": at(0.5),
+        "p90_ms": at(0.9),
+        "p99_ms": at(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+async def _active_client(
+    spec: WorkerSpec, index: int, deadline: float, result: dict
+) -> None:
+    client = await get_ipc_client().start()
+    rng = random.Random(spec.seed * 1000 + index)
+    probe = Task.new(f"{_PROBE} {spec.worker}.{index} {time.monotonic_ns()}")
+    await client.add_task(probe)
+
+    interval = 1 / spec.rate if spec.rate > 0 else 0.0
+    due = time.monotonic() + rng.random() * interval  # spread the clients out
+    try:
+        while (now := time.monotonic()) < deadline:
+            if interval:
+                if due > now:
+                    await anyio.sleep(due - now)
+                start = due
+                due += interval
+            else:
+                start = time.monotonic()
+            write = rng.random() < spec.write_ratio
+            try:
+                if write:
+                    probe.task = f"{_PROBE} {spec.worker}.{index} {time.monotonic_ns()}"
+                    await client.update_task(probe)
+                else:
+                    await client.list_page(limit=50)
+            except Exception as e:
+                result["errors"][type(e).__name__] += 1
+                continue
+            result["write" if write else "read"].append(time.monotonic() - start)
+    finally:
+        # Leave the store as it was, which matters on a daemon given by --address
+        with anyio.CancelScope(shield=True):
+            await client.delete_task(Id(probe.id))
+
+
+def _subscribe(client, result: dict) -> None:
+    seen: dict[str, int] = {}
+
+    def on_updated(tasks) -> None:
+        arrived = time.monotonic_ns()
+        result["signals"] += 1
+        for task in tasks:
+            if not task.task.startswith(_PROBE):
+                continue
+            sent = int(task.task.rsplit(" ", 1)[1])
+            if seen.get(task.id, sent) < sent:
+                result["fanout"].append((arrived - sent) / 1e9)
+            seen[task.id] = sent
+
+    client.on_task_updated(on_updated)
+
+
+async def _worker(spec: WorkerSpec) -> dict:
+    os.environ["DBUS_SESSION_BUS_ADDRESS"] = spec.address
+    result = {
+        "read": [],
+        "write": [],
+        "fanout": [],
+        "signals": 0,
+        "errors": Counter(),
+    }
+    subscribers = [await get_ipc_client().start() for _ in range(spec.subscribers)]
+    for client in subscribers:
+        _subscribe(client, result)
+    deadline = time.monotonic() + spec.duration
+    started = time.monotonic()
+    async with anyio.create_task_group() as tg:
+        for index in range(spec.clients):
+            tg.start_soon(_active_client, spec, index, deadline, result)
+    await anyio.sleep(0.5)  # let the last signals arrive
+    result["elapsed"] = time.monotonic() - started
+    return result
+
+
+def run_worker(spec: WorkerSpec) -> dict:
+    return anyio.run(_worker, spec)
+
+
+def rss_mib(pid: int) -> Optional[float]:
+    """Return the resident set size of a process in MiB, if it is running."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def split(total: int, parts: int) -> list[int]:
+    return [total // parts + (i < total % parts) for i in range(parts)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--clients", type=int, default=8, help="Active clients")
+    parser.add_argument("--subscribers", type=int, default=4, help="Passive clients")
+    parser.add_argument("--processes", type=int, default=2, help="Worker processes")
+    parser.add_argument(
+        "--rate", type=float, default=20, help="Requests/s per client (0: no limit)"
+    )
+    parser.add_argument(
+        "--write-ratio", type=float, default=0.2, help="Share of requests that write"
+    )
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to run")
+    parser.add_argument("--tasks", type=int, default=1000, help="Store size")
+    parser.add_argument(
+        "--address",
+        help="Bus address of a running daemon to target, instead of a private one",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with ExitStack() as stack:
+        if args.address:
+            address = args.address
+            env = {**os.environ, "DBUS_SESSION_BUS_ADDRESS": address}
+        else:
+            address = stack.enter_context(private_bus())
+            env = stack.enter_context(
+                isolated_env(address, tasks=args.tasks, idle_timeout=0)
+            )
+            daemon = stack.enter_context(subprocess.Popen(["rsdd"], env=env))
+            stack.callback(stop_daemon, env)
+            while daemon_pid(env) is None:
+                if daemon.poll() is not None:
+                    sys.exit("rsdd exited before claiming its bus name")
+                time.sleep(0.05)
+        pid = daemon_pid(env)
+        if pid is None:
+            sys.exit(f"No daemon is running on {address}")
+
+        processes = max(1, min(args.processes, args.clients + args.subscribers))
+        specs = [
+            WorkerSpec(
+                address=address,
+                worker=worker,
+                clients=clients,
+                subscribers=subscribers,
+                duration=args.duration,
+                rate=args.rate,
+                write_ratio=args.write_ratio,
+                seed=args.seed + worker,
+            )
+            for worker, (clients, subscribers) in enumerate(
+                zip(
+                    split(args.clients, processes),
+                    split(args.subscribers, processes),
+                )
+            )
+        ]
+        rss = [rss_mib(pid)]
+        with ProcessPoolExecutor(processes) as pool:
+            futures = [pool.submit(run_worker, spec) for spec in specs]
+            while not all(future.done() for future in futures):
+                time.sleep(0.25)
+                rss.append(rss_mib(pid))
+            results = [future.result() for future in futures]
+
+    elapsed = max(result["elapsed"] for result in results)
+    reads = [sample for result in results for sample in result["read"]]
+    writes = [sample for result in results for sample in result["write"]]
+    fanout = [sample for result in results for sample in result["fanout"]]
+    errors = sum((result["errors"] for result in results), Counter())
+    samples = [value for value in rss if value is not None]
+    report = {
+        "benchmark": "load",
+        "clients": args.clients,
+        "subscribers": args.subscribers,
+        "rate": args.rate,
+        "write_ratio": args.write_ratio,
+        "tasks": args.tasks,
+        "duration_s": round(elapsed, 2),
+        "throughput_rps": round((len(reads) + len(writes)) / elapsed, 1),
+        "read": percentiles(reads),
+        "write": percentiles(writes),
+        "fanout": {
+            **percentiles(fanout),
+            "signals": sum(result["signals"] for result in results),
+        },
+        "errors": dict(errors),
+        "rss_mib": {
+            "start": samples[0] if samples else None,
+            "peak": max(samples, default=None),
+            "end": samples[-1] if samples else None,
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Cold-start budget for the `rsd` CLI.
+
+Measures two things and compares them with `startup_budget.json`:
+
+- import time of `rsd.cmd.rsd` from `python -X importtime`, with a breakdown of
+  self time per top-level package, so it is clear what a regression pulled in;
+- wall clock of `rsd list` against a warm daemon on a private bus.
+
+Every run is appended to a JSONL history file so the numbers can be tracked
+over time. Exits non-zero when a budget is exceeded.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from ._harness import (
+    git_revision,
+    isolated_env,
+    private_bus,
+    run_cli,
+    stop_daemon,
+)
+
+BUDGET_FILE = Path(__file__).with_name("startup_budget.json")
+DEFAULT_HISTORY = Path(__file__).parent / "results" / "startup.jsonl"
+
+
+def import_profile(module: str = "rsd.cmd.rsd") -> tuple[float, Counter]:
+    """Return the cumulative import time (ms) and self time per package (ms)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0.0
+    per_package: Counter = Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (
+            field.strip() for field in line[len("import time:") :].split("|")
+        )
+        per_package[name.split(".")[0]] += int(self_us) / 1000
+        if name == module:
+            total = int(cumulative_us) / 1000
+    return total, per_package
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100, help="Store size")
+    parser.add_argument("--runs", type=int, default=7, help="Runs per measurement")
+    parser.add_argument("--top", type=int, default=10, help="Packages to show")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY)
+    args = parser.parse_args()
+
+    budget = json.loads(BUDGET_FILE.read_text())
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    import_ms, breakdown = min(profiles, key=lambda p: p[0])
+
+    walls = []
+    with private_bus() as address, isolated_env(address, tasks=args.tasks) as env:
+        run_cli(env, "list")  # autostart the daemon; measure warm runs only
+        for _ in range(args.runs):
+            walls.append(run_cli(env, "list") * 1000)
+        stop_daemon(env)
+    list_wall_ms = sorted(walls)[len(walls) // 2]
+
+    result = {
+        "benchmark": "startup",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "import_ms": round(import_ms, 2),
+        "list_wall_ms": round(list_wall_ms, 2),
+        "breakdown_ms": {
+            package: round(ms, 2) for package, ms in breakdown.most_common(args.top)
+        },
+        "budget": budget,
+    }
+    print(json.dumps(result, indent=2))
+
+    args.history.parent.mkdir(parents=True, exist_ok=True)
+    with args.history.open("a") as f:
+        f.write(json.dumps(result) + "\n")
+
+    over = [key for key, limit in budget.items() if result[key] > limit]
+    if over:
+        print(f"Over budget: {', '.join(over)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
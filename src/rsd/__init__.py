@@ -5,12 +5,23 @@
 ReadySetDone - A terminal-based task management system.
 """
 
-import tomllib
-from importlib.metadata import PackageNotFoundError, version
-from pathlib import Path
+from functools import cache
+
+
+@cache
+def _resolve_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("readysetdone")
+    except PackageNotFoundError:
+        return _fallback_version()
 
 
 def _fallback_version() -> str:
+    import tomllib
+    from pathlib import Path
+
     pyproject = Path(__file__).parent.parent.parent / "pyproject.toml"
     if pyproject.exists():
         with pyproject.open("rb") as f:
@@ -19,7 +30,9 @@ def _fallback_version() -> str:
     return "unknown"
 
 
-try:
-    __version__ = version("readysetdone")
-except PackageNotFoundError:
-    __version__ = _fallback_version()
+def __getattr__(name: str) -> str:
+    # Resolving the installed version is slow (importlib.metadata scans
+    # sys.path), so only do it when `__version__` is actually used.
+    if name == "__version__":
+        return _resolve_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
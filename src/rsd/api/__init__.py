@@ -6,10 +6,41 @@ This module exposes the ReadySetDone API functions for easy access.
 """
 
 from .deserialize import deserialize
-from .serialize import serialize
-from .sorting import get_task_id_by_index, sort_tasks
+from .offload import deserialize_async, offload, serialize_async
+from .serialize import (
+    history_entry_to_dict,
+    serialize,
+    stats_to_dict,
+    task_to_dict,
+)
+from .short_ids import AmbiguousIdError, ShortIdTrie, UnknownIdError, short_ids
+from .sorting import (
+    SORT_KEYS,
+    SortedTasks,
+    get_task_id_by_index,
+    select_page,
+    sort_tasks,
+)
 
 serialize = serialize
 deserialize = deserialize
 
-__all__ = ["serialize", "deserialize", "sort_tasks", "get_task_id_by_index"]
+__all__ = [
+    "serialize",
+    "deserialize",
+    "serialize_async",
+    "deserialize_async",
+    "offload",
+    "task_to_dict",
+    "history_entry_to_dict",
+    "stats_to_dict",
+    "SORT_KEYS",
+    "sort_tasks",
+    "select_page",
+    "SortedTasks",
+    "get_task_id_by_index",
+    "short_ids",
+    "ShortIdTrie",
+    "UnknownIdError",
+    "AmbiguousIdError",
+]
@@ -17,7 +17,7 @@ import json
 from datetime import datetime
 from typing import Union
 
-from rsd.api.types import Id, Task
+from rsd.api.types import HistoryEntry, Id, Task, TaskPage, TaskStats
 
 
 def _deserialize_task(data: dict) -> Task:
@@ -32,10 +32,28 @@ def _deserialize_task(data: dict) -> Task:
         completed=completed,
         due=due,
         pinned=data["pinned"],
+        recurrence=data.get("recurrence"),
+        tags=data.get("tags", []),
+        parent=data.get("parent"),
     )
 
 
-def deserialize(payload: str) -> Union[None, Id, Task, list[Task]]:
+def _deserialize_history_entry(data: dict) -> HistoryEntry:
+    return HistoryEntry(
+        id=data["id"],
+        label=data["label"],
+        time=datetime.fromisoformat(data["time"]),
+        tasks=data["tasks"],
+        count=data["count"],
+        undone=data.get("undone", False),
+    )
+
+
+def deserialize(
+    payload: str,
+) -> Union[
+    None, Id, Task, list[Task], TaskPage, HistoryEntry, list[HistoryEntry], TaskStats
+]:
     """Deserialize a JSON string to the appropriate Python object."""
     if not payload.strip():
         return None
@@ -44,8 +62,31 @@ def deserialize(payload: str) -> Union[None, Id, Task, list[Task]]:
 
     # Handle a list of tasks
     if isinstance(data, list):
+        if data and "label" in data[0]:
+            return [_deserialize_history_entry(item) for item in data]
         return [_deserialize_task(item) for item in data if "task" in item]
 
+    # A page of tasks
+    if "tasks" in data and "total" in data:
+        return TaskPage(
+            tasks=[_deserialize_task(item) for item in data["tasks"]],
+            total=data["total"],
+            offset=data.get("offset", 0),
+            short_ids=data.get("short_ids", {}),
+            progress={
+                task_id: tuple(counts)
+                for task_id, counts in data.get("progress", {}).items()
+            },
+        )
+
+    # Task statistics
+    if "overdue" in data and "completed_daily" in data:
+        return TaskStats(**data)
+
+    # History entry
+    if "label" in data:
+        return _deserialize_history_entry(data)
+
     # Single Task
     if "task" in data:
         return _deserialize_task(data)
@@ -0,0 +1,249 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Import and export of tasks in common file formats.
+
+Supported formats:
+- jsonl:    one JSON object per task, with the fields of `task_to_dict` and an
+            optional "description"
+- csv:      a header row, then one row per task with the same fields; tags
+            are separated by spaces
+- todo.txt: the todo.txt format (https://github.com/todotxt/todo.txt), with
+            tags as +projects and `due:`, `rec:`, `id:` and `parent:`
+            extensions. Dates are kept to the day, a priority means pinned,
+            and descriptions are not stored.
+
+Records are read and written one at a time, so a file of any size can be
+streamed through in bounded chunks. A record is a task and its description,
+or None when it has none.
+"""
+
+import csv
+import json
+import re
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+from .recurrence import parse_recurrence
+from .serialize import task_to_dict
+from .tag_filter import normalize_tag
+from .types import Task
+
+FORMATS = ("jsonl", "csv", "todo.txt")
+
+Record = tuple[Task, Optional[str]]
+
+_CSV_FIELDS = list(task_to_dict(Task(id="", task="")))
+_TRUE = {"1", "true", "yes", "y", "x"}
+_FALSE = {"0", "false", "no", "n", ""}
+_TODO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_TODO_PRIORITY = re.compile(r"\([A-Z]\)")
+
+
+def guess_format(path: str) -> str:
+    """Return the format matching a file name's extension, defaulting to jsonl."""
+    name = Path(path).name.lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith(".txt"):
+        return "todo.txt"
+    return "jsonl"
+
+
+def record_to_dict(task: Task, description: Optional[str] = None) -> dict:
+    """Return the JSON-compatible form of a record, as written to JSONL."""
+    data = task_to_dict(task)
+    if description is not None:
+        data["description"] = description
+    return data
+
+
+def record_from_dict(data: dict[str, Any]) -> Record:
+    """
+    Build a record from loosely typed fields, as found in JSONL or CSV files.
+
+    Only "task" is required. A missing ID is generated, a missing creation
+    time defaults to now, and tags may be a list or a space-separated string.
+    A parent is given by its task ID.
+    Raises ValueError for invalid fields.
+    """
+    name = data.get("task")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("missing task name")
+    tags = data.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.split()
+    recurrence = data.get("recurrence") or None
+    if recurrence:
+        parse_recurrence(recurrence)
+    description = data.get("description")
+    task = Task(
+        id=_task_id(data.get("id")),
+        task=name,
+        done=_bool(data.get("done")),
+        created=_datetime(data.get("created")) or datetime.now(),
+        completed=_datetime(data.get("completed")),
+        due=_datetime(data.get("due")),
+        pinned=_bool(data.get("pinned")),
+        recurrence=recurrence,
+        tags=list(dict.fromkeys(normalize_tag(tag) for tag in tags)),
+        parent=_task_id(data.get("parent")) if data.get("parent") else None,
+    )
+    return task, description or None
+
+
+def read_records(lines: Iterable[str], fmt: str) -> Iterator[Record]:
+    """
+    Yield the records in `lines` (e.g. an open file), one at a time.
+
+    Raises ValueError, naming the line, for malformed input.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            try:
+                yield record_from_dict(row)
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"Line {reader.line_num}: {e}") from None
+        return
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+
+    parse = _parse_json_line if fmt == "jsonl" else _parse_todo_line
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield parse(line)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Line {number}: {e}") from None
+
+
+class RecordWriter:
+    """Write records to a text stream in one of `FORMATS`."""
+
+    def __init__(self, out: TextIO, fmt: str, descriptions: bool = False) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format: {fmt}")
+        self.out = out
+        self.fmt = fmt
+        self.descriptions = descriptions
+        self._csv: Optional[csv.DictWriter] = None
+        if fmt == "csv":
+            fields = _CSV_FIELDS + (["description"] if descriptions else [])
+            self._csv = csv.DictWriter(out, fields, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, records: Iterable[Record]) -> None:
+        for task, description in records:
+            if not self.descriptions:
+                description = None
+            if self._csv is not None:
+                row = record_to_dict(task, description)
+                row["tags"] = " ".join(task.tags)
+                self._csv.writerow(row)
+            elif self.fmt == "jsonl":
+                self.out.write(json.dumps(record_to_dict(task, description)) + "\n")
+            else:
+                self.out.write(_format_todo_line(task) + "\n")
+
+
+def _task_id(value: Any) -> str:
+    if not value:
+        return str(uuid.uuid4())
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        raise ValueError(f"invalid task ID: {value!r}") from None
+
+
+def _bool(value: Any) -> bool:
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"invalid boolean: {value!r}")
+
+
+def _datetime(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value)
+
+
+def _parse_json_line(line: str) -> Record:
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object")
+    return record_from_dict(data)
+
+
+def _parse_todo_line(line: str) -> Record:
+    words = line.split()
+    fields: dict[str, Any] = {"tags": []}
+
+    if words and words[0] == "x":
+        fields["done"] = True
+        words.pop(0)
+        if words and _TODO_DATE.fullmatch(words[0]):
+            fields["completed"] = words.pop(0)
+    if words and _TODO_PRIORITY.fullmatch(words[0]):
+        fields["pinned"] = True
+        words.pop(0)
+    if words and _TODO_DATE.fullmatch(words[0]):
+        fields["created"] = words.pop(0)
+
+    name = []
+    for word in words:
+        key, _, value = word.partition(":")
+        if word.startswith("+") and len(word) > 1:
+            fields["tags"].append(word)
+        elif value and key == "due":
+            fields["due"] = value
+        elif value and key == "rec":
+            fields["recurrence"] = value.removeprefix("+")
+        elif value and key == "id":
+            fields["id"] = value
+        elif value and key == "parent":
+            fields["parent"] = value
+        elif value and key == "pri":
+            fields["pinned"] = True
+        else:
+            name.append(word)
+    fields["task"] = " ".join(name)
+    return record_from_dict(fields)
+
+
+def _format_todo_line(task: Task) -> str:
+    def day(value: datetime) -> str:
+        return value.date().isoformat()
+
+    parts = []
+    if task.done:
+        parts.append("x")
+        if task.created:
+            parts.append(day(task.completed or task.created))
+    elif task.pinned:
+        parts.append("(A)")
+    if task.created:
+        parts.append(day(task.created))
+    parts.append(" ".join(task.task.split()))
+    parts.extend(f"+{tag}" for tag in task.tags)
+    if task.due:
+        midnight = task.due.tzinfo is None and task.due.time() == datetime.min.time()
+        due = day(task.due) if midnight else task.due.isoformat(timespec="minutes")
+        parts.append(f"due:{due}")
+    if task.recurrence:
+        parts.append(f"rec:{task.recurrence}")
+    if task.done and task.pinned:
+        parts.append("pri:A")
+    parts.append(f"id:{task.id}")
+    if task.parent:
+        parts.append(f"parent:{task.parent}")
+    return " ".join(parts)
@@ -0,0 +1,108 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Offloading of large JSON encoding and decoding to worker threads.
+
+Encoding or decoding a large task list takes long enough to stall the event
+loop, and with it every client of the daemon. Above a size threshold, the
+work is run in a worker thread instead, while the loop keeps serving small
+requests and signals:
+
+- `serialize_async` offloads the serialization of `OFFLOAD_MIN_TASKS` tasks
+  or more (as a list or a page);
+- `deserialize_async` offloads the deserialization of payloads of
+  `OFFLOAD_MIN_BYTES` or more;
+- `offload` runs any other function in a worker thread.
+
+At most `OFFLOAD_THREADS` calls are offloaded at a time, per event loop, so
+large requests cannot use up the default thread pool that file I/O relies on.
+
+A worker thread only helps while it runs Python code, which gives up the GIL
+every few milliseconds: the `json` C code holds it until it returns. Long
+lists are therefore encoded in slices with `dumps_chunked`. Decoding is not
+split up, so the loop still waits for the `json` parse, but building the
+tasks, most of the work, is shared with it.
+"""
+
+import json
+from typing import Any, Callable, TypeVar
+
+import anyio
+from anyio.lowlevel import RunVar
+
+from .deserialize import deserialize
+from .serialize import serializable, serialize
+from .types import TaskPage
+
+OFFLOAD_MIN_TASKS = 1000
+OFFLOAD_MIN_BYTES = 256 * 1024
+OFFLOAD_THREADS = 2
+
+_CHUNK_ITEMS = 500  # list items encoded per call into the json C code
+
+T = TypeVar("T")
+
+_limiter: RunVar[anyio.CapacityLimiter] = RunVar("_limiter")
+
+
+def _offload_limiter() -> anyio.CapacityLimiter:
+    try:
+        return _limiter.get()
+    except LookupError:
+        limiter = anyio.CapacityLimiter(OFFLOAD_THREADS)
+        _limiter.set(limiter)
+        return limiter
+
+
+async def offload(fn: Callable[..., T], *args: Any) -> T:
+    """Run `fn(*args)` in a worker thread, at most `OFFLOAD_THREADS` at a time."""
+    return await anyio.to_thread.run_sync(fn, *args, limiter=_offload_limiter())
+
+
+def dumps_chunked(obj: Any, **kwargs: Any) -> str:
+    """
+    Return `json.dumps(obj, **kwargs)`, encoding long lists in slices.
+
+    Slices are taken of a list, or of the list values of a dict with string
+    keys (but not with an `indent`). The default separators must be used.
+    """
+    if isinstance(obj, list) and len(obj) > _CHUNK_ITEMS:
+        parts = [
+            json.dumps(obj[i : i + _CHUNK_ITEMS], **kwargs)[1:-1]
+            for i in range(0, len(obj), _CHUNK_ITEMS)
+        ]
+        if kwargs.get("indent") is None:
+            return "[" + ", ".join(parts) + "]"
+        return "[" + ",".join(part.rstrip("\n") for part in parts) + "\n]"
+    if isinstance(obj, dict) and kwargs.get("indent") is None:
+        members = (
+            f"{json.dumps(key, **kwargs)}: "
+            + (
+                dumps_chunked(value, **kwargs)
+                if isinstance(value, list)
+                else json.dumps(value, **kwargs)
+            )
+            for key, value in obj.items()
+        )
+        return "{" + ", ".join(members) + "}"
+    return json.dumps(obj, **kwargs)
+
+
+def _serialize_chunked(obj: Any) -> str:
+    return dumps_chunked(serializable(obj))
+
+
+async def serialize_async(obj: Any) -> str:
+    """Serialize like `serialize`, in a worker thread for many tasks."""
+    tasks = obj.tasks if isinstance(obj, TaskPage) else obj
+    if isinstance(tasks, list) and len(tasks) >= OFFLOAD_MIN_TASKS:
+        return await offload(_serialize_chunked, obj)
+    return serialize(obj)
+
+
+async def deserialize_async(payload: str) -> Any:
+    """Deserialize like `deserialize`, in a worker thread for large payloads."""
+    if len(payload) >= OFFLOAD_MIN_BYTES:
+        return await offload(deserialize, payload)
+    return deserialize(payload)
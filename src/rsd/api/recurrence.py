@@ -0,0 +1,46 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Recurrence rules for repeating tasks.
+
+A recurring task is stored once: the task row is the series template, and its
+`due` date is the next pending occurrence. Completing the occurrence moves
+`due` forward to the next one instead of marking the task done, so a series
+takes one row however far ahead it repeats.
+
+Rules:
+- "daily", "weekly"
+- "<n>h", "<n>d", "<n>w": every n hours, days or weeks (e.g. "2d", "3w")
+"""
+
+import re
+from datetime import datetime, timedelta
+
+_NAMED = {"daily": timedelta(days=1), "weekly": timedelta(weeks=1)}
+_EVERY = re.compile(r"(\d+)([hdw])")
+_UNITS = {"h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_recurrence(rule: str) -> timedelta:
+    """Return the interval of a recurrence rule, or raise ValueError."""
+    if rule in _NAMED:
+        return _NAMED[rule]
+    if (match := _EVERY.fullmatch(rule)) and int(match.group(1)) > 0:
+        return timedelta(**{_UNITS[match.group(2)]: int(match.group(1))})
+    raise ValueError(
+        f"Invalid recurrence: {rule!r} (use daily, weekly, or e.g. 12h, 2d, 3w)"
+    )
+
+
+def next_due(due: datetime, rule: str, now: datetime) -> datetime:
+    """
+    Return the occurrence after the one due at `due`.
+
+    Occurrences missed while the task was not completed are skipped, so the
+    result is always in the future, and stays aligned with the original `due`.
+    """
+    step = parse_recurrence(rule)
+    if due > now:
+        return due + step
+    return due + ((now - due) // step + 1) * step
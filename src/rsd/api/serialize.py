@@ -11,51 +11,86 @@ over DBus or stored in persistent storage.
 
 Functions:
 - serialize: Serializes a Python object to a JSON string.
+- serializable: Converts a Python object to the JSON-compatible form that
+  `serialize` encodes.
+- task_to_dict: Converts a task to its JSON-compatible dictionary form.
+- history_entry_to_dict: Converts a history entry to its dictionary form.
+- stats_to_dict: Converts task statistics to their dictionary form.
 """
 
 import json
+from dataclasses import asdict
 from datetime import datetime
 from typing import Any
 
-from rsd.api.types import Id, Task
+from rsd.api.types import HistoryEntry, Id, Task, TaskPage, TaskStats
+
+
+def task_to_dict(task: Task) -> dict:
+    """Return the JSON-compatible dictionary representation of a task."""
+
+    def dt(val):
+        return val.isoformat() if isinstance(val, datetime) else val
+
+    return {
+        "id": task.id,
+        "task": task.task,
+        "done": task.done,
+        "created": dt(task.created),
+        "completed": dt(task.completed),
+        "due": dt(task.due),
+        "pinned": task.pinned,
+        "recurrence": task.recurrence,
+        "tags": task.tags,
+        "parent": task.parent,
+    }
+
+
+def history_entry_to_dict(entry: HistoryEntry) -> dict:
+    """Return the JSON-compatible dictionary representation of a history entry."""
+    return {
+        "id": entry.id,
+        "label": entry.label,
+        "time": entry.time.isoformat(),
+        "tasks": entry.tasks,
+        "count": entry.count,
+        "undone": entry.undone,
+    }
+
+
+def stats_to_dict(stats: TaskStats) -> dict:
+    """Return the JSON-compatible dictionary representation of task statistics."""
+    return asdict(stats)
 
 
 def serialize(obj: Any) -> str:
     """Serialize a Python object to a JSON string."""
     if obj == "":
         return ""
+    return json.dumps(serializable(obj))
 
-    def dt(val):
-        return val.isoformat() if isinstance(val, datetime) else val
 
+def serializable(obj: Any) -> Any:
+    """Return the JSON-compatible form of an object, as `serialize` encodes it."""
     if isinstance(obj, Task):
-        return json.dumps(
-            {
-                "id": obj.id,
-                "task": obj.task,
-                "done": obj.done,
-                "created": dt(obj.created),
-                "completed": dt(obj.completed),
-                "due": dt(obj.due),
-                "pinned": obj.pinned,
-            }
-        )
+        return task_to_dict(obj)
     elif isinstance(obj, list) and all(isinstance(t, Task) for t in obj):
-        return json.dumps(
-            [
-                {
-                    "id": t.id,
-                    "task": t.task,
-                    "done": t.done,
-                    "created": dt(t.created),
-                    "completed": dt(t.completed),
-                    "due": dt(t.due),
-                    "pinned": t.pinned,
-                }
-                for t in obj
-            ]
-        )
+        return [task_to_dict(t) for t in obj]
+    elif isinstance(obj, TaskPage):
+        return {
+            "tasks": [task_to_dict(t) for t in obj.tasks],
+            "total": obj.total,
+            "offset": obj.offset,
+            "short_ids": obj.short_ids,
+            "progress": obj.progress,
+        }
+    elif isinstance(obj, HistoryEntry):
+        return history_entry_to_dict(obj)
+    elif isinstance(obj, list) and all(isinstance(e, HistoryEntry) for e in obj):
+        return [history_entry_to_dict(e) for e in obj]
+    elif isinstance(obj, TaskStats):
+        return stats_to_dict(obj)
     elif isinstance(obj, Id):
-        return json.dumps({"id": obj.id})
+        return {"id": obj.id}
     else:
         raise TypeError(f"Unsupported type for serialization: {type(obj)}")
@@ -0,0 +1,181 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Short task IDs for ReadySetDone.
+
+A task's short ID is the shortest prefix of its ID that no other task shares,
+but at least `MIN_LENGTH` characters long, like abbreviated commit hashes.
+Because task IDs are random UUIDs, a short ID only grows when a new task
+happens to share its prefix. A short ID is also extended past any leading
+digits, since the command line reads a number as a list index: "453" would
+otherwise name the 453rd task rather than the task it abbreviates.
+
+- `short_ids` computes the short IDs of a whole list at once.
+- `ShortIdTrie` keeps them up to date under adds and deletes, and resolves a
+  prefix to a task ID in time proportional to the prefix length.
+"""
+
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+MIN_LENGTH = 3
+
+
+class UnknownIdError(LookupError):
+    """No task ID starts with the given prefix."""
+
+
+class AmbiguousIdError(LookupError):
+    """More than one task ID starts with the given prefix."""
+
+
+def _prefix(task_id: str, length: int) -> str:
+    """Return the first `length` characters of an ID, extended past leading digits."""
+    while length < len(task_id) and task_id[:length].isdecimal():
+        length += 1
+    return task_id[:length]
+
+
+def short_ids(ids: Iterable[str], min_length: int = MIN_LENGTH) -> dict[str, str]:
+    """Return the short ID of every ID in `ids`, keyed by ID."""
+    ordered = sorted(set(ids))
+    # Longest common prefix of each pair of neighbours in sorted order
+    shared = [0] * (len(ordered) + 1)
+    for i in range(1, len(ordered)):
+        a, b = ordered[i - 1], ordered[i]
+        n = 0
+        while n < len(a) and n < len(b) and a[n] == b[n]:
+            n += 1
+        shared[i] = n
+    return {
+        task_id: _prefix(task_id, max(min_length, max(shared[i], shared[i + 1]) + 1))
+        for i, task_id in enumerate(ordered)
+    }
+
+
+class _Node:
+    __slots__ = ("count", "children", "task_id")
+
+    def __init__(self) -> None:
+        self.count = 0  # IDs stored in this subtree
+        self.children: dict[str, _Node] = {}
+        self.task_id: Optional[str] = None  # set on leaves, which hold one ID
+
+
+def _char(task_id: str, depth: int) -> str:
+    return task_id[depth] if depth < len(task_id) else ""
+
+
+class ShortIdTrie:
+    """
+    A prefix trie over task IDs, split only as deep as needed to tell IDs apart.
+
+    A subtree holding a single ID is collapsed into one leaf, so the depth of a
+    leaf is exactly the length of the shortest unique prefix of its ID and the
+    trie has about as many nodes as IDs.
+    """
+
+    def __init__(self, ids: Iterable[str] = (), min_length: int = MIN_LENGTH) -> None:
+        self.min_length = min_length
+        self._root = _Node()
+        self._ids: set[str] = set()
+        for task_id in ids:
+            self.add(task_id)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._ids
+
+    def add(self, task_id: str) -> None:
+        """Insert an ID, splitting the leaf it collides with if needed."""
+        if task_id in self._ids:
+            return
+        self._ids.add(task_id)
+
+        node, depth = self._root, 0
+        node.count += 1
+        while node.count > 1:
+            if node.task_id is not None:
+                # Push the ID held by this leaf one level down
+                other, node.task_id = node.task_id, None
+                child = node.children[_char(other, depth)] = _Node()
+                child.count, child.task_id = 1, other
+            node = node.children.setdefault(_char(task_id, depth), _Node())
+            node.count += 1
+            depth += 1
+        node.task_id = task_id
+
+    def remove(self, task_id: str) -> None:
+        """Delete an ID and collapse the subtree it leaves with a single ID."""
+        if task_id not in self._ids:
+            return
+        self._ids.remove(task_id)
+
+        path, depth = [self._root], 0
+        while path[-1].task_id is None:
+            path.append(path[-1].children[_char(task_id, depth)])
+            depth += 1
+        for node in path:
+            node.count -= 1
+        if len(path) == 1:
+            self._root.task_id = None
+            return
+        del path[-2].children[_char(task_id, depth - 1)]
+
+        for node in path[:-1]:
+            if node.count == 1:
+                node.task_id = next(self._iter_ids(node))
+                node.children = {}
+                break
+
+    def short_id(self, task_id: str) -> str:
+        """Return the shortest unique prefix of a known ID that is not all digits."""
+        if task_id not in self._ids:
+            raise UnknownIdError(f"Unknown task ID: {task_id}")
+        node, depth = self._root, 0
+        while node.task_id is None:
+            node = node.children[_char(task_id, depth)]
+            depth += 1
+        return _prefix(task_id, max(self.min_length, depth))
+
+    def resolve(self, prefix: str) -> str:
+        """
+        Return the single ID starting with `prefix`.
+
+        Raises:
+            UnknownIdError: No ID starts with `prefix`.
+            AmbiguousIdError: Several IDs start with `prefix`.
+        """
+        prefix = prefix.lower()
+        node = self._root
+        for char in prefix:
+            if node.task_id is not None:
+                break
+            node = node.children.get(char)
+            if node is None:
+                raise UnknownIdError(f"No task ID starts with {prefix!r}")
+
+        if node.task_id is not None:
+            if node.task_id.startswith(prefix):
+                return node.task_id
+            raise UnknownIdError(f"No task ID starts with {prefix!r}")
+        if node.count == 0:
+            raise UnknownIdError(f"No task ID starts with {prefix!r}")
+
+        candidates = [self.short_id(t) for t in islice(self._iter_ids(node), 5)]
+        more = ", ..." if node.count > len(candidates) else ""
+        raise AmbiguousIdError(
+            f"{node.count} task IDs start with {prefix!r}: "
+            f"{', '.join(candidates)}{more}"
+        )
+
+    def _iter_ids(self, node: _Node) -> Iterator[str]:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.task_id is not None:
+                yield node.task_id
+            stack.extend(node.children.values())
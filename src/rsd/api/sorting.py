@@ -5,11 +5,16 @@
 Task sorting utilities for ReadySetDone.
 
 This module provides reusable sorting logic for task lists,
-including a default sort key and a convenience sort function.
+including the named sort orders in `SORT_KEYS`, a convenience sort function
+and `SortedTasks`, a sorted view that is updated incrementally. The daemon
+keeps one `SortedTasks` per order, so clients never sort themselves.
 """
 
+import heapq
+from bisect import bisect_left, insort
 from datetime import datetime
-from typing import Any, Callable
+from itertools import islice
+from typing import AbstractSet, Any, Callable, Iterable, Optional
 
 from .types import Id, Task
 
@@ -24,6 +29,41 @@ def default_sort_key(task: Task) -> Any:
     return (not task.pinned, task.done, task.created or datetime.min)
 
 
+def due_sort_key(task: Task) -> Any:
+    """
+    Due date order:
+    - Incomplete before completed
+    - Then tasks with a due date, soonest first
+    - Then by creation date (oldest first)
+    """
+    return (
+        task.done,
+        task.due is None,
+        task.due or datetime.max,
+        task.created or datetime.min,
+    )
+
+
+def created_sort_key(task: Task) -> Any:
+    """Creation date order, newest first; tasks without a date last."""
+    if task.created is None:
+        return (True, 0.0)
+    return (False, -task.created.timestamp())
+
+
+def name_sort_key(task: Task) -> Any:
+    """Alphabetical order, ignoring case."""
+    return task.task.casefold()
+
+
+SORT_KEYS: dict[str, Callable[[Task], Any]] = {
+    "default": default_sort_key,
+    "due": due_sort_key,
+    "created": created_sort_key,
+    "name": name_sort_key,
+}
+
+
 def sort_tasks(
     tasks: list[Task], key: Callable[[Task], Any] = default_sort_key
 ) -> list[Task]:
@@ -31,9 +71,139 @@ def sort_tasks(
     return sorted(tasks, key=key)
 
 
+def select_page(
+    tasks: list[Task],
+    limit: Optional[int] = None,
+    offset: int = 0,
+    key: Callable[[Task], Any] = default_sort_key,
+) -> list[Task]:
+    """Return `limit` tasks after skipping `offset`, in sorted order.
+
+    With a limit, only the first `offset + limit` tasks are ordered.
+    """
+    if limit is None:
+        return sort_tasks(tasks, key=key)[offset:]
+    return heapq.nsmallest(offset + limit, tasks, key=key)[offset:]
+
+
 def get_task_id_by_index(tasks: list[Task], index: int, key=default_sort_key) -> Id:
     """Return the ID of the task at a given index based on the sorted order."""
     sorted_tasks = sort_tasks(tasks, key=key)
     if not (1 <= index <= len(sorted_tasks)):
         raise IndexError(f"Index {index} is out of range (1..{len(sorted_tasks)})")
     return Id(sorted_tasks[index - 1].id)
+
+
+class SortedTasks:
+    """
+    Tasks kept in sort order under incremental updates.
+
+    Entries are `(key(task), task.id)` tuples in a list maintained with
+    bisect, so lookups by position are O(1), finding a task's position is
+    O(log n), and an update moves a single entry instead of re-sorting.
+    Batches that touch a large share of the view are applied by re-sorting
+    once instead. The task ID breaks ties, which makes the order total.
+    """
+
+    def __init__(
+        self, tasks: Iterable[Task] = (), key: Callable[[Task], Any] = default_sort_key
+    ) -> None:
+        self._key = key
+        self._tasks: dict[str, Task] = {task.id: task for task in tasks}
+        self._entries: list[tuple[Any, str]] = sorted(
+            (key(task), task.id) for task in self._tasks.values()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, position: int) -> Task:
+        return self._tasks[self._entries[position][1]]
+
+    def __iter__(self):
+        return (self._tasks[task_id] for _, task_id in self._entries)
+
+    def get(self, task_id: str) -> Optional[Task]:
+        return self._tasks.get(task_id)
+
+    def position(self, task_id: str) -> Optional[int]:
+        """Return the 0-based position of a task, or None if it is unknown."""
+        task = self._tasks.get(task_id)
+        if task is None:
+            return None
+        return bisect_left(self._entries, (self._key(task), task_id))
+
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> list[Task]:
+        end = None if limit is None else offset + limit
+        return [self._tasks[task_id] for _, task_id in self._entries[offset:end]]
+
+    def subset(
+        self, ids: AbstractSet[str], offset: int = 0, limit: Optional[int] = None
+    ) -> list[Task]:
+        """Like `page`, but only over the tasks whose ID is in `ids`."""
+        end = None if limit is None else offset + limit
+        if len(ids) * 8 < len(self._entries):
+            # Few matches: order just those instead of walking the whole view
+            entries = sorted(
+                (self._key(self._tasks[i]), i) for i in ids if i in self._tasks
+            )
+            return [self._tasks[task_id] for _, task_id in entries[offset:end]]
+        matching = (self._tasks[i] for _, i in self._entries if i in ids)
+        return list(islice(matching, offset, end))
+
+    def upsert(self, task: Task) -> int:
+        """Insert or replace a task; return the lowest position that changed."""
+        old_position = self.remove(task.id)
+        entry = (self._key(task), task.id)
+        insort(self._entries, entry)
+        self._tasks[task.id] = task
+        new_position = bisect_left(self._entries, entry)
+        return new_position if old_position is None else min(old_position, new_position)
+
+    def remove(self, task_id: str) -> Optional[int]:
+        """Remove a task; return its former position, or None if it was unknown."""
+        position = self.position(task_id)
+        if position is not None:
+            del self._entries[position]
+            del self._tasks[task_id]
+        return position
+
+    def update(
+        self, upserts: Iterable[Task] = (), removals: Iterable[str] = ()
+    ) -> Optional[int]:
+        """
+        Insert or replace several tasks and remove others in one go.
+
+        Returns the lowest position whose row changed, or None if nothing did.
+        When the batch is large compared to the view, the entries are re-sorted
+        once instead of being moved one by one, and 0 is returned.
+        """
+        upserts = [task for task in upserts if self._tasks.get(task.id) != task]
+        removals = [task_id for task_id in removals if task_id in self._tasks]
+        if not upserts and not removals:
+            return None
+
+        if (len(upserts) + len(removals)) * 8 <= len(self._entries):
+            positions = [self.remove(task_id) for task_id in removals]
+            positions += [self.upsert(task) for task in upserts]
+            return min(p for p in positions if p is not None)
+
+        for task_id in removals:
+            del self._tasks[task_id]
+        for task in upserts:
+            self._tasks[task.id] = task
+        self._entries = sorted(
+            (self._key(task), task.id) for task in self._tasks.values()
+        )
+        return 0
+
+    def sync(self, tasks: Iterable[Task]) -> Optional[int]:
+        """
+        Bring the view in line with a full task list, touching only what changed.
+
+        Returns the lowest position whose row changed, or None if nothing did.
+        """
+        incoming = {task.id: task for task in tasks}
+        return self.update(
+            incoming.values(), [t for t in self._tasks if t not in incoming]
+        )
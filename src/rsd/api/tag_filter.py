@@ -0,0 +1,148 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Tag filter expressions for ReadySetDone.
+
+Syntax:
+- `+work` or `work`:  tasks tagged "work"
+- `-waiting`:         tasks not tagged "waiting"
+- `not X`, `X and Y`, `X or Y`, parentheses; adjacent terms are ANDed
+
+`not` binds tightest, then `and`, then `or`, so `+work -waiting or +urgent`
+means "(work and not waiting) or urgent".
+
+Expressions are evaluated against an index of tag -> task IDs using only set
+operations: intersections start from the smallest set, and negated terms
+inside an AND are subtracted instead of complemented.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import AbstractSet, Mapping, Union
+
+_TOKEN = re.compile(r"\s*(\(|\)|[+-]?[^\s()+-][^\s()]*)")
+TAG = re.compile(r"[^\s()+-][^\s()]*")
+
+
+@dataclass(frozen=True)
+class Has:
+    tag: str
+
+
+@dataclass(frozen=True)
+class Not:
+    operand: "TagFilter"
+
+
+@dataclass(frozen=True)
+class And:
+    operands: tuple["TagFilter", ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    operands: tuple["TagFilter", ...]
+
+
+TagFilter = Union[Has, Not, And, Or]
+
+
+@lru_cache(maxsize=1024)
+def normalize_tag(tag: str) -> str:
+    """Return the canonical form of a tag, or raise ValueError if it is invalid."""
+    tag = tag.removeprefix("+").casefold()
+    if not TAG.fullmatch(tag):
+        raise ValueError(f"Invalid tag: {tag!r}")
+    return tag
+
+
+def parse_tag_filter(text: str) -> TagFilter:
+    """Parse a tag filter expression, raising ValueError on syntax errors."""
+    tokens = _tokenize(text)
+    if not tokens:
+        raise ValueError("Empty tag filter")
+    position = 0
+
+    def peek() -> str:
+        return tokens[position] if position < len(tokens) else ""
+
+    def take() -> str:
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or() -> TagFilter:
+        operands = [parse_and()]
+        while peek().casefold() == "or":
+            take()
+            operands.append(parse_and())
+        return operands[0] if len(operands) == 1 else Or(tuple(operands))
+
+    def parse_and() -> TagFilter:
+        operands = [parse_not()]
+        while peek() and peek() != ")" and peek().casefold() != "or":
+            if peek().casefold() == "and":
+                take()
+            operands.append(parse_not())
+        return operands[0] if len(operands) == 1 else And(tuple(operands))
+
+    def parse_not() -> TagFilter:
+        token = take() if peek() else ""
+        lowered = token.casefold()
+        if lowered == "not":
+            return Not(parse_not())
+        if token == "(":
+            inner = parse_or()
+            if peek() != ")":
+                raise ValueError(f"Missing ')' in tag filter: {text!r}")
+            take()
+            return inner
+        if not token or token == ")" or lowered in ("and", "or"):
+            raise ValueError(f"Unexpected {token or 'end'!r} in tag filter: {text!r}")
+        if token.startswith("-"):
+            return Not(Has(normalize_tag(token[1:])))
+        return Has(normalize_tag(token))
+
+    result = parse_or()
+    if position != len(tokens):
+        raise ValueError(f"Unexpected {peek()!r} in tag filter: {text!r}")
+    return result
+
+
+def _tokenize(text: str) -> list[str]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise ValueError(f"Invalid tag filter: {text!r}")
+        tokens.append(match.group(1))
+        position = match.end()
+    return tokens
+
+
+def select(
+    expr: TagFilter, index: Mapping[str, AbstractSet[str]], universe: AbstractSet[str]
+) -> set[str]:
+    """Return the IDs in `universe` matched by `expr`, given tag -> IDs `index`."""
+    match expr:
+        case Has(tag):
+            return set(index.get(tag, ()))
+        case Not(operand):
+            return set(universe) - select(operand, index, universe)
+        case Or(operands):
+            return set().union(*(select(op, index, universe) for op in operands))
+        case And(operands):
+            positive = [op for op in operands if not isinstance(op, Not)]
+            negative = [op.operand for op in operands if isinstance(op, Not)]
+            sets = sorted((select(op, index, universe) for op in positive), key=len)
+            result = sets[0].intersection(*sets[1:]) if sets else set(universe)
+            for op in negative:
+                if not result:
+                    break
+                result -= select(op, index, universe)
+            return result
+    raise TypeError(f"Unknown tag filter node: {expr!r}")
@@ -10,10 +10,13 @@ due date, and more. The `Id` class represents a unique identifier for each task.
 Classes:
 - Task: Represents a task in the application.
 - Id: Represents the unique identifier of a task.
+- TaskPage: A slice of the sorted task list, as served by the daemon.
+- HistoryEntry: Summary of an operation in the daemon's undo/redo history.
+- TaskStats: Task counts and completion histograms kept by the daemon.
 """
 
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
@@ -29,6 +32,9 @@ class Task:
     completed: Optional[datetime] = None  # Task completion time
     due: Optional[datetime] = None  # Task due date
     pinned: bool = False  # Indicates whether the task is pinned
+    recurrence: Optional[str] = None  # Repeat rule, see `rsd.api.recurrence`
+    tags: list[str] = field(default_factory=list)  # Lowercase tags, e.g. "work"
+    parent: Optional[str] = None  # ID of the task this is a subtask of
 
     @classmethod
     def from_dict(cls, data: dict) -> "Task":
@@ -45,6 +51,9 @@ class Task:
             else None,
             due=datetime.fromisoformat(data["due"]) if data["due"] else None,
             pinned=data["pinned"],
+            recurrence=data.get("recurrence"),
+            tags=data.get("tags", []),
+            parent=data.get("parent"),
         )
 
     @classmethod
@@ -72,3 +81,45 @@ class Id:
     def from_string(cls, id_str: str) -> "Id":
         """Create an Id object from a string representing the ID."""
         return cls(id=id_str)
+
+
+@dataclass
+class TaskPage:
+    """A slice of the task list in a given sort order, as served by the daemon."""
+
+    tasks: list[Task]  # Tasks in sort order
+    total: int  # Number of tasks in the whole list
+    offset: int = 0  # Position of the first task in the whole list
+    short_ids: dict[str, str] = field(default_factory=dict)  # Task ID -> short ID
+    # Task ID -> (done, total) subtasks, for the tasks that have subtasks
+    progress: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+
+@dataclass
+class HistoryEntry:
+    """Summary of an operation in the daemon's undo/redo history."""
+
+    id: int  # Operation number, increasing
+    label: str  # What was done, e.g. "delete"
+    time: datetime  # When it was done
+    tasks: list[str]  # Names of (up to a few of) the tasks it changed
+    count: int  # Number of tasks it changed
+    undone: bool = False  # Whether it is undone, and can be redone
+
+
+@dataclass
+class TaskStats:
+    """Task counts and completion histograms, as maintained by the daemon."""
+
+    total: int = 0  # Number of tasks
+    open: int = 0  # Tasks not done
+    done: int = 0  # Tasks done
+    pinned: int = 0  # Pinned tasks
+    recurring: int = 0  # Recurring tasks
+    due: int = 0  # Open tasks with a due date
+    overdue: int = 0  # Open tasks past their due date
+    subtasks: int = 0  # Tasks that are a subtask of another
+    # Completions per day ("2025-06-01") and per hour ("2025-06-01T17"), oldest
+    # first, for the recent days and hours that had any
+    completed_daily: dict[str, int] = field(default_factory=dict)
+    completed_hourly: dict[str, int] = field(default_factory=dict)
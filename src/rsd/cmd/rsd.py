@@ -4,42 +4,129 @@
 """
 Client entrypoint for ReadySetDone (`rsd`).
 Responsible for sending task operations to the daemon and rendering UI.
+
+Startup latency matters here: heavy modules (the UI backend, the IPC transport)
+are imported only once the command is known, and the UI is loaded in a worker
+thread while the bus connection is being set up.
 """
 
 import logging
+import shutil
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Optional
 
 import anyio
 
-from rsd.api import get_task_id_by_index
-from rsd.api.types import Task
+from rsd.api.types import Id, Task
 from rsd.config import Config
 from rsd.config.args import Args
-from rsd.ipc import get_ipc_client
+from rsd.config.completion import CACHE_LIMIT, write_completion_cache
+from rsd.ipc import IpcClient, get_ipc_client
 from rsd.logger import setup_logger
 from rsd.ui import get_ui
+from rsd.ui.ui import history_summary
 
 logger = logging.getLogger(__name__)
 
 
+def _daemon_command(config_path: Path) -> Optional[list[str]]:
+    """Return the command used to autostart `rsdd`, or None if it is not installed."""
+    rsdd = shutil.which("rsdd")
+    if rsdd is None:
+        return None
+    return [rsdd, "--background", "--config", str(config_path)]
+
+
+async def _resolve_task(ipc: IpcClient, ref: str) -> Id:
+    """
+    Resolve a task reference from the command line.
+
+    Digits are an index into the default-ordered list; anything else is a short
+    ID, which is never all digits. A full-ID prefix that is all digits can be
+    given with a leading "@". Both are resolved by the daemon, without
+    transferring the list.
+    """
+    if ref.isdecimal():
+        return await ipc.task_id_at(int(ref))
+    return await ipc.resolve_id(ref.removeprefix("@"))
+
+
+async def _import(ipc: IpcClient, path: str, fmt: Optional[str]) -> None:
+    """Stream the records of a file (or stdin) to the daemon as one import."""
+    from rsd.api.interchange import guess_format, read_records
+
+    fmt = fmt or guess_format(path)
+    try:
+        source = nullcontext(sys.stdin) if path == "-" else open(path, newline="")
+        with source as lines:
+            count = await ipc.import_tasks(read_records(lines, fmt))
+    except (OSError, ValueError) as e:
+        logger.error(f"Import failed, nothing was imported: {e}")
+        return
+    logger.info(f"Imported {count} tasks")
+
+
+async def _export(
+    ipc: IpcClient, path: str, fmt: Optional[str], descriptions: bool
+) -> None:
+    """Write every task to a file (or stdout), fetching them chunk by chunk."""
+    from rsd.api.interchange import RecordWriter, guess_format
+
+    fmt = fmt or guess_format(path)
+    if descriptions and fmt == "todo.txt":
+        logger.warning("todo.txt cannot hold descriptions; exporting without them")
+    try:
+        target = nullcontext(sys.stdout) if path == "-" else open(path, "w", newline="")
+        with target as out:
+            writer = RecordWriter(out, fmt, descriptions)
+            async for chunk in ipc.export_tasks(descriptions):
+                writer.write(chunk)
+    except BrokenPipeError:
+        pass  # the reader went away, e.g. `rsd export | head`
+    except OSError as e:
+        logger.error(f"Export failed: {e}")
+
+
 async def async_main() -> None:
     args = Args()
     config = Config(path=args.config_path, args=args, mode=args.mode)
     setup_logger(level=config.log_level, color=config.color)
 
-    if args.mode == "tui":
-        logger.info("TUI not yet implemented")
-        return
+    ipc = get_ipc_client(
+        connect_timeout=config.connect_timeout,
+        reconnect_interval=config.reconnect_interval,
+        daemon_command=_daemon_command(args.config_path) if config.autostart else None,
+    )
+    ui = None
+
+    async def load_ui() -> None:
+        nonlocal ui
+        if config.is_tui:
+            ui = await anyio.to_thread.run_sync(get_ui, "tui", config.ui_mode)
+        else:
+            ui = await anyio.to_thread.run_sync(
+                get_ui, "cli", args.format or config.ui_mode
+            )
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(load_ui)
+        await ipc.start()
 
-    ui = get_ui("cli", config.ui_mode)
-    ipc = get_ipc_client()
-    await ipc.start()
+    if config.is_tui:
+        await ui.run(ipc)
+        return
 
-    id = None
-    if args.index:
-        try:
-            id = get_task_id_by_index(await ipc.list_tasks(), args.index)
-        except IndexError:
-            logger.warning(f"No task found at index {args.index}")
+    id = parent = None
+    try:
+        if args.index:
+            id = await _resolve_task(ipc, args.index)
+        if args.parent:
+            parent = await _resolve_task(ipc, args.parent)
+    except LookupError as e:
+        logger.error(str(e))
+        sys.exit(1)  # do not act on, or list, the wrong tasks
 
     match args.command:
         case "add":
@@ -48,7 +135,15 @@ async def async_main() -> None:
                 task.done = True
             if args.pin:
                 task.pinned = True
-            await ipc.add_task(task)
+            task.due = args.due
+            task.recurrence = args.every
+            task.tags = list(dict.fromkeys(args.tags or []))
+            task.parent = parent.id if parent else None
+            try:
+                await ipc.add_task(task)
+            except ValueError as e:
+                logger.error(str(e))
+                return
         case "delete":
             if id:
                 await ipc.delete_task(id)
@@ -67,16 +162,118 @@ async def async_main() -> None:
         case "unpin":
             if id:
                 await ipc.unpin(id)
+        case "move":
+            if id:
+                try:
+                    await ipc.set_parent(id, parent)
+                except ValueError as e:
+                    logger.error(str(e))
+                    return
         case "description":
             if id:
                 desc = await ipc.get_description(id)
                 ui.render_description(desc)
                 return
+        case "undo" | "redo":
+            action = ipc.undo if args.command == "undo" else ipc.redo
+            try:
+                entry = await action()
+            except RuntimeError as e:
+                logger.error(str(e))
+                return
+            if entry is None:
+                logger.warning(f"Nothing to {args.command}")
+            else:
+                verb = "Undid" if args.command == "undo" else "Redid"
+                logger.info(f"{verb} #{entry.id}: {history_summary(entry)}")
+        case "history":
+            ui.render_history(await ipc.history(args.limit), color=config.color)
+            return
+        case "stats":
+            ui.render_stats(await ipc.get_stats(), color=config.color)
+            return
+        case "metrics":
+            metrics = await ipc.get_metrics()
+            if args.prometheus:
+                from rsd.metrics import prometheus_text
+
+                sys.stdout.write(prometheus_text(metrics))
+            else:
+                ui.render_metrics(metrics, color=config.color)
+            return
+        case "profile":
+            try:
+                if args.profile_action == "start":
+                    await ipc.start_profile(args.profile_mode)
+                    logger.info(f"Started {args.profile_mode} profiling")
+                else:
+                    logger.info(f"Wrote profile to {await ipc.stop_profile()}")
+            except (ValueError, RuntimeError) as e:
+                logger.error(str(e))
+            return
+        case "memory":
+            try:
+                if args.memory_action is None:
+                    ui.render_memory(await ipc.get_memory(), color=config.color)
+                    return
+                result = await ipc.trace_memory(args.memory_action)
+            except (ValueError, RuntimeError) as e:
+                logger.error(str(e))
+                return
+            if args.memory_action != "snapshot":
+                logger.info(f"Allocation tracing: {args.memory_action}")
+                return
+            logger.info(f"Wrote allocation snapshot to {result['path']}")
+            for site in result["top"]:
+                logger.info(f"{site['size_diff'] / 1024:+.1f} KiB  {site['site']}")
+            return
+        case "import":
+            await _import(ipc, args.file, args.file_format)
+            return
+        case "export":
+            await _export(ipc, args.file, args.file_format, args.descriptions)
+            return
+        case "search":
+            results = await ipc.search(args.query, args.limit)
+            ui.render_search(results, color=config.color)
+            return
         case "list" | _:
             pass  # list is the default fallback
 
-    tasks = await ipc.list_tasks()
-    ui.render(tasks=tasks, color=config.color, metadata=args.metadata)
+    # Repeated --tag filters are ANDed; on add, --tag sets the new task's tags
+    tag_filter = None
+    if args.command == "list" and args.tags:
+        tag_filter = (
+            args.tags[0]
+            if len(args.tags) == 1
+            else " ".join(f"({expr})" for expr in args.tags)
+        )
+    subtasks = args.command == "list" and (parent is not None or args.top)
+    if subtasks and tag_filter:
+        logger.error("--tag cannot be combined with --parent or --top")
+        return
+    try:
+        if subtasks:
+            page = await ipc.list_children(parent, args.sort, args.offset, args.limit)
+        else:
+            page = await ipc.list_page(args.sort, args.offset, args.limit, tag_filter)
+    except ValueError as e:
+        logger.error(str(e))
+        return
+    # Only a page from the top of the full default list, long enough not to
+    # cut the cache short, matches the indexes that completion offers
+    if (
+        args.sort == "default"
+        and args.offset == 0
+        and (args.limit is None or args.limit >= CACHE_LIMIT)
+        and tag_filter is None
+        and not subtasks
+    ):
+        write_completion_cache(
+            (index, task.done, task.task)
+            for index, task in enumerate(page.tasks[:CACHE_LIMIT], start=1)
+        )
+    ui.render(page=page, color=config.color, metadata=args.metadata, pager=args.pager)
 
 
 def main() -> None:
@@ -9,15 +9,17 @@ Handles signals to gracefully shutdown.
 """
 
 import logging
+import os
 import signal
 
 import anyio
 from anyio import create_task_group
 
 from rsd.config import Args, Config
-from rsd.ipc import get_ipc_server
+from rsd.ipc import RequestScheduler, get_ipc_server
 from rsd.logger import setup_logger
-from rsd.service import TaskService
+from rsd.metrics import REGISTRY, MemoryDiagnostics, Profiler, prometheus_text
+from rsd.service import DueScheduler, TaskService
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -31,23 +33,129 @@ async def shutdown_handler(stop_event: anyio.Event) -> None:
             break
 
 
+async def profile_handler(profiler: Profiler, mode: str) -> None:
+    """Start a profiling session on SIGUSR1, and stop it on the next one."""
+    with anyio.open_signal_receiver(signal.SIGUSR1) as signals:
+        async for _ in signals:
+            try:
+                profiler.toggle(mode)
+            except (ValueError, RuntimeError, OSError) as e:
+                logger.error(f"Profiling failed: {e}")
+
+
+async def idle_handler(
+    ipc_server,
+    due_scheduler: DueScheduler,
+    idle_timeout: float,
+    stop_event: anyio.Event,
+) -> None:
+    """
+    Stop the daemon once no client request arrived for `idle_timeout` seconds.
+
+    The daemon stays up while a client is still connected, since it would stop
+    receiving signals, and while a due date is pending, so its reminder fires.
+    """
+    while True:
+        remaining = idle_timeout - ipc_server.idle_time()
+        if remaining <= 0:
+            clients = ipc_server.client_count()
+            deadline = due_scheduler.next_deadline()
+            if not clients and deadline is None:
+                logger.info(f"Idle for {idle_timeout}s, shutting down...")
+                stop_event.set()
+                return
+            logger.debug(
+                f"Idle, but staying up for {clients} clients, next due {deadline}"
+            )
+            remaining = idle_timeout
+        await anyio.sleep(remaining)
+
+
+async def metrics_dumper(path: str, interval: float) -> None:
+    """Write the metrics to `path` every `interval` seconds, replacing it atomically."""
+    target = anyio.Path(path)
+    temp = target.with_name(f".{target.name}.tmp")
+    await target.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        try:
+            await temp.write_text(prometheus_text(REGISTRY.snapshot()))
+            await anyio.to_thread.run_sync(os.replace, temp, target)
+        except OSError as e:
+            logger.warning(f"Failed to write metrics to {path}: {e}")
+        await anyio.sleep(interval)
+
+
 async def async_main() -> None:
     args = Args()
     config = Config(path=args.config_path, args=args, mode=args.mode)
 
-    setup_logger(level=config.log_level, color=config.color)
-    task_service = TaskService(config.task_store_path)
-    ipc_server = get_ipc_server(task_service)
+    setup_logger(
+        level=config.log_level,
+        color=config.color,
+        log_file=config.log_file_location,
+        max_bytes=config.log_file_max_bytes,
+        backups=config.log_file_backups,
+        background=True,
+    )
+    task_service = TaskService(
+        config.task_store_path,
+        config.description_store_path,
+        config.search_index_path,
+        sort_orders=config.sort_orders,
+        history_path=config.history_path,
+        history_depth=config.history_depth,
+        stats_path=config.stats_path,
+    )
+    scheduler = RequestScheduler(
+        max_concurrent=config.max_concurrent_requests,
+        max_queue_depth=config.max_queue_depth,
+        max_pending_per_client=config.max_pending_per_client,
+        read_burst=config.read_burst,
+    )
+    profiler = Profiler(config.profile_dir)
+    ipc_server = get_ipc_server(
+        task_service,
+        scheduler=scheduler,
+        profiler=profiler,
+        memory=MemoryDiagnostics(config.profile_dir),
+    )
 
     async with create_task_group() as tg:
-        await ipc_server.start()
+        # Load the store before claiming the bus name: clients treat the name
+        # appearing on the bus as the signal that the daemon is ready.
+        await tg.start(task_service.run)
+        try:
+            await ipc_server.start()
+        except RuntimeError as e:
+            logger.warning(str(e))
+            tg.cancel_scope.cancel()
+            return
         logger.info("Daemon is running. Waiting for events...")
 
+        due_scheduler = DueScheduler(
+            task_service, ipc_server.notify_due, ipc_server.notify_overdue
+        )
+        tg.start_soon(due_scheduler.run)
+
         stop_event = anyio.Event()
         tg.start_soon(shutdown_handler, stop_event)
+        tg.start_soon(profile_handler, profiler, config.profile_mode)
+        if config.idle_timeout > 0:
+            tg.start_soon(
+                idle_handler, ipc_server, due_scheduler, config.idle_timeout, stop_event
+            )
+        if config.metrics_file:
+            tg.start_soon(metrics_dumper, config.metrics_file, config.metrics_interval)
 
         await stop_event.wait()
         await ipc_server.stop()
+        await task_service.aclose()
+        if profiler.mode is not None:
+            try:
+                profiler.stop()
+            except OSError as e:
+                logger.error(f"Profiling failed: {e}")
+        tg.cancel_scope.cancel()
 
     logger.info("Daemon shutdown complete.")
 
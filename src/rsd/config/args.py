@@ -10,13 +10,13 @@ This module defines:
 
 import argparse
 import os
+import re
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Literal, Optional
 
-import argcomplete
-
-from rsd import __version__
+from .completion import complete_index
 
 ColorWhen = Literal["auto", "never", "always"]
 Mode = Literal["cli", "daemon"]
@@ -37,11 +37,8 @@ class Args:
             self.mode: Mode = "daemon"
             parsed = _parse_daemon_args()
         else:
-            parser = argparse.ArgumentParser(add_help=False)
-            parser.add_argument("command", nargs="?", default="list")
-            known, _ = parser.parse_known_args()
             self.mode: Mode = "cli"
-            parsed = _parse_cli_args(known.command)
+            parsed = _parse_cli_args()
 
         self.config_path = parsed.common.config_path
         self.verbose = parsed.common.verbose
@@ -52,8 +49,26 @@ class Args:
         self.task = getattr(parsed, "task", None)
         self.done = getattr(parsed, "done", False)
         self.pin = getattr(parsed, "pin", False)
+        self.due = getattr(parsed, "due", None)
+        self.every = getattr(parsed, "every", None)
+        self.tags = getattr(parsed, "tags", None)
+        self.parent = getattr(parsed, "parent", None)
+        self.top = getattr(parsed, "top", False)
         self.metadata = getattr(parsed, "metadata", False)
         self.index = getattr(parsed, "index", None)
+        self.query = getattr(parsed, "query", None)
+        self.limit = getattr(parsed, "limit", None)
+        self.offset = getattr(parsed, "offset", 0)
+        self.sort = getattr(parsed, "sort", "default")
+        self.pager = getattr(parsed, "pager", True)
+        self.format = getattr(parsed, "format", None)
+        self.file = getattr(parsed, "file", None)
+        self.file_format = getattr(parsed, "file_format", None)
+        self.descriptions = getattr(parsed, "descriptions", False)
+        self.prometheus = getattr(parsed, "prometheus", False)
+        self.profile_action = getattr(parsed, "profile_action", None)
+        self.profile_mode = getattr(parsed, "profile_mode", "cprofile")
+        self.memory_action = getattr(parsed, "memory_action", None)
         self.background = getattr(parsed, "background", False)
 
 
@@ -76,17 +91,75 @@ class _CliArgs:
         task: Optional[str] = None,
         done: bool = False,
         pin: bool = False,
+        due: Optional[datetime] = None,
+        every: Optional[str] = None,
+        tags: Optional[list[str]] = None,
+        parent: Optional[str] = None,
+        top: bool = False,
         metadata: bool = False,
-        index: Optional[int] = None,
+        index: Optional[str] = None,
+        query: Optional[str] = None,
         command: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort: str = "default",
+        pager: bool = True,
+        format: Optional[str] = None,
+        file: Optional[str] = None,
+        file_format: Optional[str] = None,
+        descriptions: bool = False,
+        prometheus: bool = False,
+        profile_action: Optional[str] = None,
+        profile_mode: str = "cprofile",
+        memory_action: Optional[str] = None,
     ):
         self.common = common
         self.task = task
         self.done = done
         self.pin = pin
+        self.due = due
+        self.every = every
+        self.tags = tags
+        self.parent = parent
+        self.top = top
         self.metadata = metadata
         self.index = index
+        self.query = query
         self.command = command
+        self.limit = limit
+        self.offset = offset
+        self.sort = sort
+        self.pager = pager
+        self.format = format
+        self.file = file
+        self.file_format = file_format
+        self.descriptions = descriptions
+        self.prometheus = prometheus
+        self.profile_action = profile_action
+        self.profile_mode = profile_mode
+        self.memory_action = memory_action
+
+
+class _VersionAction(argparse.Action):
+    """Like argparse's "version" action, but resolves the version only when used."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, **kwargs):
+        super().__init__(
+            option_strings, dest, nargs=0, default=argparse.SUPPRESS, **kwargs
+        )
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        from rsd import __version__
+
+        parser.exit(message=f"ReadySetDone version {__version__}\n")
+
+
+def _autocomplete(parser: argparse.ArgumentParser) -> None:
+    """Hook up argcomplete, importing it only when the shell asks for completions."""
+    if "_ARGCOMPLETE" in os.environ:
+        import argcomplete
+
+        argcomplete.autocomplete(parser)
 
 
 class _DaemonArgs:
@@ -95,11 +168,54 @@ class _DaemonArgs:
         self.background = background
 
 
+def _non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {value}")
+    return number
+
+
+_OFFSET = re.compile(r"\+(\d+)([mhdw])")
+_OFFSET_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def _due_date(value: str) -> datetime:
+    """Parse an ISO date/time, or an offset from now such as +30m, +2h, +3d, +1w."""
+    if match := _OFFSET.fullmatch(value):
+        amount, unit = match.groups()
+        offset = timedelta(**{_OFFSET_UNITS[unit]: int(amount)})
+        return (datetime.now() + offset).replace(microsecond=0)
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid due date: {value} (use e.g. 2025-06-01, 2025-06-01T17:00 or +2h)"
+        ) from None
+
+
+def _recurrence(value: str) -> str:
+    from rsd.api.recurrence import parse_recurrence
+
+    try:
+        parse_recurrence(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+    return value
+
+
+def _tag(value: str) -> str:
+    from rsd.api.tag_filter import normalize_tag
+
+    try:
+        return normalize_tag(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
 def _parse_common_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "--version",
-        action="version",
-        version=f"ReadySetDone version {__version__}",
+        action=_VersionAction,
         help="Show program version and exit",
     )
     parser.add_argument(
@@ -122,7 +238,7 @@ def _parse_common_args(parser: argparse.ArgumentParser) -> None:
     )
 
 
-def _parse_cli_args(primary_command: str) -> _CliArgs:
+def _parse_cli_args() -> _CliArgs:
     parser = argparse.ArgumentParser(prog="rsd")
     _parse_common_args(parser)
     subparsers = parser.add_subparsers(dest="command", required=False)
@@ -131,21 +247,213 @@ def _parse_cli_args(primary_command: str) -> _CliArgs:
     list_parser.add_argument(
         "-m", "--metadata", action="store_true", help="Show metadata"
     )
+    list_parser.add_argument(
+        "-n", "--limit", type=_non_negative_int, help="Show at most this many tasks"
+    )
+    list_parser.add_argument(
+        "--offset", type=_non_negative_int, default=0, help="Skip this many tasks"
+    )
+    list_parser.add_argument(
+        "-s",
+        "--sort",
+        choices=["default", "due", "created", "name"],
+        default="default",
+        help="Sort order (indexes used by other commands follow the default order)",
+    )
+    list_parser.add_argument(
+        "-t",
+        "--tag",
+        dest="tags",
+        action="append",
+        metavar="FILTER",
+        help=(
+            "Only list tasks matching a tag filter, e.g. +work, --tag=-waiting or "
+            "'work and not (waiting or someday)'; repeated filters are ANDed"
+        ),
+    )
+    subtasks = list_parser.add_mutually_exclusive_group()
+    subtasks.add_argument(
+        "-P",
+        "--parent",
+        metavar="TASK",
+        help="Only list the subtasks of a task (list index or short ID)",
+    )
+    subtasks.add_argument(
+        "--top", action="store_true", help="Only list top-level tasks"
+    )
+    list_parser.add_argument(
+        "--no-pager",
+        dest="pager",
+        action="store_false",
+        help="Do not page output, even when writing to a terminal",
+    )
+    list_parser.add_argument(
+        "-f",
+        "--format",
+        choices=["rich", "plain", "jsonl", "tsv", "ids"],
+        help="Output format (default: ui_mode from the config)",
+    )
     subparsers.add_parser("tui", help="Launch TUI")
 
+    search_parser = subparsers.add_parser("search", help="Search tasks")
+    search_parser.add_argument("query", nargs="+", help="Words or word prefixes")
+    search_parser.add_argument(
+        "-n",
+        "--limit",
+        type=_non_negative_int,
+        default=20,
+        help="Show at most this many tasks (default: 20)",
+    )
+    search_parser.add_argument(
+        "-f",
+        "--format",
+        choices=["rich", "plain", "jsonl", "tsv", "ids"],
+        help="Output format (default: ui_mode from the config)",
+    )
+
     add_parser = subparsers.add_parser("add", help="Add a task")
     add_parser.add_argument("task", type=str, help="Task description")
     add_parser.add_argument(
         "-d", "--done", action="store_true", help="Mark task as done"
     )
     add_parser.add_argument("-p", "--pin", action="store_true", help="Pin task")
+    add_parser.add_argument(
+        "--due",
+        type=_due_date,
+        help="Due date: ISO date/time, or offset from now (+30m, +2h, +3d, +1w)",
+    )
+    add_parser.add_argument(
+        "--every",
+        type=_recurrence,
+        metavar="RULE",
+        help="Repeat: daily, weekly, or every n hours/days/weeks (12h, 2d, 3w); "
+        "without --due, first due one interval from now",
+    )
+    add_parser.add_argument(
+        "-t",
+        "--tag",
+        dest="tags",
+        action="append",
+        type=_tag,
+        help="Tag the task (can be repeated)",
+    )
+    add_parser.add_argument(
+        "-P",
+        "--parent",
+        metavar="TASK",
+        help="Add as a subtask of a task (list index or short ID)",
+    )
+
+    subparsers.add_parser("undo", help="Undo the last change")
+    subparsers.add_parser("redo", help="Redo the last undone change")
+    history_parser = subparsers.add_parser("history", help="List recent changes")
+    history_parser.add_argument(
+        "-n",
+        "--limit",
+        type=_non_negative_int,
+        default=20,
+        help="Show at most this many changes (default: 20)",
+    )
+    history_parser.add_argument(
+        "-f",
+        "--format",
+        choices=["rich", "plain", "jsonl", "tsv", "ids"],
+        help="Output format (default: ui_mode from the config)",
+    )
+
+    stats_parser = subparsers.add_parser("stats", help="Show task statistics")
+    stats_parser.add_argument(
+        "-f",
+        "--format",
+        choices=["rich", "plain", "jsonl", "tsv"],
+        help="Output format (default: ui_mode from the config)",
+    )
+
+    metrics_parser = subparsers.add_parser("metrics", help="Show daemon metrics")
+    metrics_parser.add_argument(
+        "-f",
+        "--format",
+        choices=["rich", "plain", "jsonl"],
+        help="Output format (default: ui_mode from the config)",
+    )
+    metrics_parser.add_argument(
+        "--prometheus",
+        action="store_true",
+        help="Write the metrics in the Prometheus text format",
+    )
+
+    profile_parser = subparsers.add_parser("profile", help="Profile the daemon")
+    profile_parser.add_argument(
+        "profile_action",
+        metavar="action",
+        choices=["start", "stop"],
+        help="Start a profiling session, or stop it and write the profile",
+    )
+    profile_parser.add_argument(
+        "-m",
+        "--mode",
+        dest="profile_mode",
+        choices=["cprofile", "sample"],
+        default="cprofile",
+        help="cprofile records every call, sample records stacks (default: cprofile)",
+    )
+
+    memory_parser = subparsers.add_parser("memory", help="Show the daemon's memory use")
+    memory_parser.add_argument(
+        "memory_action",
+        metavar="action",
+        nargs="?",
+        choices=["start", "snapshot", "stop"],
+        help="Start tracing allocations, write a snapshot diff, or stop tracing",
+    )
+    memory_parser.add_argument(
+        "-f",
+        "--format",
+        choices=["rich", "plain", "jsonl"],
+        help="Output format (default: ui_mode from the config)",
+    )
+
+    import_parser = subparsers.add_parser("import", help="Import tasks from a file")
+    import_parser.add_argument("file", help="File to read, or - for stdin")
+    export_parser = subparsers.add_parser("export", help="Export tasks to a file")
+    export_parser.add_argument(
+        "file", nargs="?", default="-", help="File to write (default: - for stdout)"
+    )
+    export_parser.add_argument(
+        "-D", "--descriptions", action="store_true", help="Include descriptions"
+    )
+    for file_parser in (import_parser, export_parser):
+        file_parser.add_argument(
+            "-f",
+            "--format",
+            dest="file_format",
+            choices=["jsonl", "csv", "todo.txt"],
+            help="File format (default: from the file extension, else jsonl)",
+        )
 
     for cmd in ["done", "toggle", "not-done", "delete", "pin", "unpin", "description"]:
-        subparsers.add_parser(cmd, help=f"{cmd.title()} a task").add_argument(
-            "index", type=int
+        index_arg = subparsers.add_parser(
+            cmd, help=f"{cmd.title()} a task"
+        ).add_argument(
+            "index",
+            metavar="task",
+            help="List index, or short ID (prefix with @ if it is all digits)",
         )
+        index_arg.completer = complete_index
+
+    move_parser = subparsers.add_parser("move", help="Move a task under another")
+    move_parser.add_argument(
+        "index",
+        metavar="task",
+        help="List index, or short ID (prefix with @ if it is all digits)",
+    ).completer = complete_index
+    move_parser.add_argument(
+        "parent",
+        nargs="?",
+        help="New parent task; omit to make the task a top-level task",
+    ).completer = complete_index
 
-    argcomplete.autocomplete(parser)
+    _autocomplete(parser)
     args = parser.parse_args()
     common = _CommonArgs(
         config_path=args.config, verbose=args.verbose, color=args.color
@@ -156,8 +464,26 @@ def _parse_cli_args(primary_command: str) -> _CliArgs:
         task=getattr(args, "task", None),
         done=getattr(args, "done", False),
         pin=getattr(args, "pin", False),
+        due=getattr(args, "due", None),
+        every=getattr(args, "every", None),
+        tags=getattr(args, "tags", None),
+        parent=getattr(args, "parent", None),
+        top=getattr(args, "top", False),
         metadata=getattr(args, "metadata", False),
         index=getattr(args, "index", None),
+        query=" ".join(args.query) if getattr(args, "query", None) else None,
+        limit=getattr(args, "limit", None),
+        offset=getattr(args, "offset", 0),
+        sort=getattr(args, "sort", "default"),
+        pager=getattr(args, "pager", True),
+        format=getattr(args, "format", None),
+        file=getattr(args, "file", None),
+        file_format=getattr(args, "file_format", None),
+        descriptions=getattr(args, "descriptions", False),
+        prometheus=getattr(args, "prometheus", False),
+        profile_action=getattr(args, "profile_action", None),
+        profile_mode=getattr(args, "profile_mode", "cprofile"),
+        memory_action=getattr(args, "memory_action", None),
     )
 
 
@@ -165,7 +491,7 @@ def _parse_daemon_args() -> _DaemonArgs:
     parser = argparse.ArgumentParser(prog="rsdd")
     _parse_common_args(parser)
     parser.add_argument("--background", action="store_true", help="Run in background")
-    argcomplete.autocomplete(parser)
+    _autocomplete(parser)
     args = parser.parse_args()
     common = _CommonArgs(
         config_path=args.config, verbose=args.verbose, color=args.color
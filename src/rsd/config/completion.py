@@ -0,0 +1,65 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Offline completion cache for task-index arguments.
+
+After each command the CLI writes a tiny TSV file with the displayed index,
+state and a shortened name of the first tasks in display order. The
+argcomplete completer reads only that file, so pressing TAB never connects to
+the bus or imports the IPC layer. The cache may lag behind changes made by
+other clients until the next `rsd` command refreshes it.
+"""
+
+import os
+from pathlib import Path
+from typing import Iterable
+
+COMPLETION_CACHE_PATH = (
+    Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "readysetdone"
+    / "completion.tsv"
+)
+
+CACHE_LIMIT = 500  # tasks kept in the cache
+_NAME_WIDTH = 40  # characters of the task name kept in the cache
+
+
+def write_completion_cache(
+    entries: Iterable[tuple[int, bool, str]], path: Path = COMPLETION_CACHE_PATH
+) -> None:
+    """
+    Atomically replace the cache with `(index, done, name)` entries.
+
+    Failures are ignored: completion is a convenience and must never make a
+    command fail.
+    """
+    lines = []
+    for index, done, name in entries:
+        short = " ".join(name.split())
+        if len(short) > _NAME_WIDTH:
+            short = short[: _NAME_WIDTH - 1] + "…"
+        lines.append(f"{index}\t{'done' if done else 'open'}\t{short}\n")
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text("".join(lines), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def complete_index(prefix: str, **kwargs) -> dict[str, str]:
+    """argcomplete completer offering task indexes with their state and name."""
+    try:
+        with COMPLETION_CACHE_PATH.open(encoding="utf-8") as f:
+            rows = [line.rstrip("\n").split("\t", 2) for line in f]
+    except OSError:
+        return {}
+
+    return {
+        index: f"[{state}] {name}"
+        for index, state, name in rows
+        if index.startswith(prefix)
+    }
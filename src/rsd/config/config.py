@@ -15,7 +15,7 @@ Resolves environment variables and provides structured access via flattened fiel
 import os
 import sys
 import tomllib
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Literal
 
@@ -42,7 +42,9 @@ def _supports_color() -> bool:
 @dataclass
 class _CommonConfig:
     log_level: str = "info"
-    log_file_location: str = str(_RSD_STATE_HOME / "rsd.log")
+    log_file_location: str = str(_RSD_STATE_HOME / "rsdd.log")
+    log_file_max_bytes: int = 1024 * 1024
+    log_file_backups: int = 3
     color: bool = _supports_color()
 
 
@@ -52,14 +54,29 @@ class _CliConfig:
     show_timestamps: bool = True
     connect_timeout: int = 10
     reconnect_interval: int = 5
+    autostart: bool = True
 
 
 @dataclass
 class _DaemonConfig:
     task_store_path: str = str(_RSD_DATA_HOME / "tasks.json")
     description_store_path: str = str(_RSD_DATA_HOME / "descriptions")
+    search_index_path: str = str(_RSD_DATA_HOME / "search_index.json")
+    history_path: str = str(_RSD_DATA_HOME / "history.json")
+    history_depth: int = 100
+    stats_path: str = str(_RSD_DATA_HOME / "stats.json")
+    sort_orders: list[str] = field(default_factory=lambda: ["default", "due"])
     task_polling_interval: int = 3
     shutdown_timeout: int = 5
+    idle_timeout: int = 600
+    max_concurrent_requests: int = 4
+    max_queue_depth: int = 256
+    max_pending_per_client: int = 64
+    read_burst: int = 8
+    metrics_file: str = ""
+    metrics_interval: int = 15
+    profile_dir: str = str(_RSD_STATE_HOME / "profiles")
+    profile_mode: str = "cprofile"
 
 
 class Config:
@@ -87,6 +104,8 @@ class Config:
         self.mode = "tui" if args.command == "tui" else mode
         self.log_level = common.log_level
         self.log_file_location = common.log_file_location
+        self.log_file_max_bytes = common.log_file_max_bytes
+        self.log_file_backups = common.log_file_backups
         self.color = common.color
 
         if args.mode in ("cli", "tui"):
@@ -96,13 +115,28 @@ class Config:
             self.show_timestamps = cli.show_timestamps
             self.connect_timeout = cli.connect_timeout
             self.reconnect_interval = cli.reconnect_interval
+            self.autostart = cli.autostart
 
         elif args.mode == "daemon":
             daemon = _DaemonConfig(**expanded.get("daemon", {}))
             self.task_store_path = daemon.task_store_path
             self.description_store_path = daemon.description_store_path
+            self.search_index_path = daemon.search_index_path
+            self.history_path = daemon.history_path
+            self.history_depth = daemon.history_depth
+            self.stats_path = daemon.stats_path
+            self.sort_orders = daemon.sort_orders
             self.task_polling_interval = daemon.task_polling_interval
             self.shutdown_timeout = daemon.shutdown_timeout
+            self.idle_timeout = daemon.idle_timeout
+            self.max_concurrent_requests = daemon.max_concurrent_requests
+            self.max_queue_depth = daemon.max_queue_depth
+            self.max_pending_per_client = daemon.max_pending_per_client
+            self.read_burst = daemon.read_burst
+            self.metrics_file = daemon.metrics_file
+            self.metrics_interval = daemon.metrics_interval
+            self.profile_dir = daemon.profile_dir
+            self.profile_mode = daemon.profile_mode
 
         else:
             raise ValueError(f"Unknown config mode: {args.mode}")
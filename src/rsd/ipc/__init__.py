@@ -11,20 +11,34 @@ This setup allows easy switching between D-Bus and Socket-based IPC.
 - `ipc/dbus/__init__.py`: Concrete D-Bus client and server.
 - `ipc/socket/__init__.py`: Concrete socket client and server.
 - `ipc/__init__.py`: Exports public API and provides factory functions.
+
+Transport implementations are imported by the factory functions, so clients
+never load server-side modules and nothing is loaded until it is needed.
 """
 
-from .dbus import DbusClient, DbusServer
 from .interface import IpcClient, IpcServer
+from .scheduler import RequestScheduler, SchedulerBusyError
 
 
-def get_ipc_client() -> IpcClient:
+def get_ipc_client(**options) -> IpcClient:
     """Factory method to get the default IPC client implementation."""
-    return DbusClient()
+    from .dbus.dbus_client import DbusClient
+
+    return DbusClient(**options)
 
 
-def get_ipc_server(task_service) -> IpcServer:
+def get_ipc_server(task_service, **options) -> IpcServer:
     """Factory method to get the default IPC server implementation."""
-    return DbusServer(task_service)
+    from .dbus.dbus_server import DbusServer
+
+    return DbusServer(task_service, **options)
 
 
-__all__ = ["IpcClient", "IpcServer", "get_ipc_client", "get_ipc_server"]
+__all__ = [
+    "IpcClient",
+    "IpcServer",
+    "RequestScheduler",
+    "SchedulerBusyError",
+    "get_ipc_client",
+    "get_ipc_server",
+]
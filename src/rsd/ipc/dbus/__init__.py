@@ -8,7 +8,17 @@ Exposes the D-Bus server and client implementations for use in the IPC layer.
 This file allows `ipc.dbus` to serve as a public interface for the D-Bus backend.
 """
 
-from .dbus_client import DbusClient
-from .dbus_server import DbusServer
-
 __all__ = ["DbusServer", "DbusClient"]
+
+
+def __getattr__(name: str):
+    # Import lazily so that the client never pays for the server-side imports.
+    if name == "DbusClient":
+        from .dbus_client import DbusClient
+
+        return DbusClient
+    if name == "DbusServer":
+        from .dbus_server import DbusServer
+
+        return DbusServer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1 +1,8 @@
 DBUS_INTERFACE = ("com", "readysetdone")
+DBUS_ERROR_BUSY = ".".join(DBUS_INTERFACE) + ".Error.Busy"
+DBUS_ERROR_UNKNOWN_ID = ".".join(DBUS_INTERFACE) + ".Error.UnknownId"
+DBUS_ERROR_AMBIGUOUS_ID = ".".join(DBUS_INTERFACE) + ".Error.AmbiguousId"
+DBUS_ERROR_INDEX_OUT_OF_RANGE = ".".join(DBUS_INTERFACE) + ".Error.IndexOutOfRange"
+DBUS_ERROR_HISTORY_CONFLICT = ".".join(DBUS_INTERFACE) + ".Error.HistoryConflict"
+DBUS_ERROR_PROFILER = ".".join(DBUS_INTERFACE) + ".Error.Profiler"
+DBUS_ERROR_TRACE = ".".join(DBUS_INTERFACE) + ".Error.Trace"
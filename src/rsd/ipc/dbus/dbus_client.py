@@ -4,32 +4,80 @@
 """
 D-Bus client implementation for ReadySetDone.
 Connects to the D-Bus daemon and provides methods to call task-related operations
-and receive task update signals.
+and receive task update signals. Starts the daemon on demand when it is not
+running yet.
 """
 
+import asyncio
+import functools
+import inspect
+import json
 import logging
-from typing import Awaitable, Callable
+import subprocess
+from itertools import islice
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional, Sequence
 
 import anyio
+from dbus_next import DBusError, ErrorType, Message, MessageType
 from dbus_next.aio import MessageBus
 
-from rsd.api import deserialize, serialize
-from rsd.api.types import Id, Task
+from rsd.api import (
+    AmbiguousIdError,
+    UnknownIdError,
+    deserialize,
+    deserialize_async,
+    serialize,
+)
+from rsd.api.interchange import Record, record_to_dict
+from rsd.api.types import HistoryEntry, Id, Task, TaskPage, TaskStats
 from rsd.ipc.interface import IpcClient
 
-from .constants import DBUS_INTERFACE
+from .constants import (
+    DBUS_ERROR_AMBIGUOUS_ID,
+    DBUS_ERROR_HISTORY_CONFLICT,
+    DBUS_ERROR_INDEX_OUT_OF_RANGE,
+    DBUS_ERROR_PROFILER,
+    DBUS_ERROR_TRACE,
+    DBUS_ERROR_UNKNOWN_ID,
+    DBUS_INTERFACE,
+)
 
 logger = logging.getLogger(__name__)
 
+_BUS_NAME = ".".join(DBUS_INTERFACE)
+_DBUS = "org.freedesktop.DBus"
+_DBUS_PATH = "/org/freedesktop/DBus"
+_SIGNALS = ("task_updated", "task_due", "task_overdue")
+
+SignalHandler = Callable[[list[Task]], Awaitable[None] | None]
+
 
 class DbusClient(IpcClient):
-    def __init__(self) -> None:
-        self._on_update: Callable[[list[Task]], Awaitable[None]] | None = None
+    def __init__(
+        self,
+        connect_timeout: float = 10,
+        reconnect_interval: float = 5,
+        daemon_command: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        Create a new D-Bus client.
+
+        Args:
+            connect_timeout: Seconds to wait for an autostarted daemon to be ready.
+            reconnect_interval: Seconds between bus name checks while waiting.
+            daemon_command: Command used to spawn the daemon when it is not
+                running. Autostart is disabled when None.
+        """
+        self._handlers: dict[str, SignalHandler] = {}
         self._iface = None
+        self._connect_timeout = connect_timeout
+        self._reconnect_interval = reconnect_interval
+        self._daemon_command = daemon_command
 
     async def start(self) -> IpcClient:
         """Connect to the D-Bus daemon and subscribe to signals."""
         bus = await MessageBus().connect()
+        await self._ensure_daemon(bus)
         object_path = "/" + "/".join(DBUS_INTERFACE)
         introspection = await bus.introspect(".".join(DBUS_INTERFACE), object_path)
         proxy = bus.get_proxy_object(
@@ -37,32 +85,137 @@ class DbusClient(IpcClient):
         )
         self._iface = proxy.get_interface(".".join(DBUS_INTERFACE))
 
-        # Register signal handler
-        self._iface.on_task_updated(self._on_task_updated_signal)
+        # Register signal handlers
+        for name in _SIGNALS:
+            getattr(self._iface, f"on_{name}")(functools.partial(self._on_signal, name))
 
         logger.debug("D-Bus client connected")
         return self
 
-    def _on_task_updated_signal(self, payload: str) -> None:
-        """Signal handler that runs in a sync context, delegates to async."""
-        anyio.from_thread.run(self._handle_task_updated, payload)
+    async def _ensure_daemon(self, bus: MessageBus) -> None:
+        """
+        Make sure the daemon owns its bus name, spawning it if needed.
+
+        The daemon claims its name only once its store is loaded, so the
+        NameOwnerChanged signal doubles as the readiness signal. The name is
+        also re-checked every `reconnect_interval` seconds in case the signal
+        raced with the subscription.
+        """
+        if await self._name_has_owner(bus):
+            return
+        if not self._daemon_command:
+            raise ConnectionError(f"Daemon is not running on the bus ({_BUS_NAME})")
+
+        ready = anyio.Event()
+        match_rule = (
+            f"type='signal',sender='{_DBUS}',interface='{_DBUS}',"
+            f"member='NameOwnerChanged',arg0='{_BUS_NAME}'"
+        )
+
+        def on_message(msg: Message) -> None:
+            if (
+                msg.message_type == MessageType.SIGNAL
+                and msg.member == "NameOwnerChanged"
+                and msg.body[0] == _BUS_NAME
+                and msg.body[2]
+            ):
+                ready.set()
+
+        bus.add_message_handler(on_message)
+        await self._call_dbus(bus, "AddMatch", "s", [match_rule])
+        try:
+            logger.debug(f"Starting daemon: {' '.join(self._daemon_command)}")
+            _spawn_daemon(self._daemon_command)
+            with anyio.fail_after(self._connect_timeout):
+                while not ready.is_set():
+                    with anyio.move_on_after(self._reconnect_interval):
+                        await ready.wait()
+                    if await self._name_has_owner(bus):
+                        break
+        except TimeoutError:
+            raise TimeoutError(
+                f"Daemon did not become ready within {self._connect_timeout}s"
+            ) from None
+        finally:
+            bus.remove_message_handler(on_message)
+            await self._call_dbus(bus, "RemoveMatch", "s", [match_rule])
+
+    async def _name_has_owner(self, bus: MessageBus) -> bool:
+        reply = await self._call_dbus(bus, "NameHasOwner", "s", [_BUS_NAME])
+        return bool(reply.body[0])
 
-    def _on_task_updated_signal(self, payload: str) -> None:
-        """Raw signal handler — just forwards to registered callback."""
-        if self._on_update:
-            self._on_update(payload)  # handler is now sync!
+    @staticmethod
+    async def _call_dbus(
+        bus: MessageBus, member: str, signature: str, body: list
+    ) -> Message:
+        """Call a method on the message bus itself, without introspection."""
+        reply = await bus.call(
+            Message(
+                destination=_DBUS,
+                path=_DBUS_PATH,
+                interface=_DBUS,
+                member=member,
+                signature=signature,
+                body=body,
+            )
+        )
+        if reply.message_type == MessageType.ERROR:
+            raise ConnectionError(f"{member} failed: {reply.body}")
+        return reply
+
+    def _on_signal(self, name: str, payload: str) -> None:
+        """
+        Signal handler, called by dbus-next on the event loop.
+
+        Deserializes the payload and forwards it to the handler registered for
+        the signal. Coroutine handlers are scheduled as tasks on the same loop.
+        """
+        handler = self._handlers.get(name)
+        if handler is None:
+            return
+        result = handler(deserialize(payload))
+        if inspect.isawaitable(result):
+            asyncio.ensure_future(result)
+
+    def on_task_updated(self, handler: SignalHandler) -> None:
+        self._handlers["task_updated"] = handler
+
+    def on_task_due(self, handler: SignalHandler) -> None:
+        """Call `handler` with the tasks that reach their due date."""
+        self._handlers["task_due"] = handler
 
-    def on_task_updated(self, handler: Callable[[list[Task]], Awaitable[None]]) -> None:
-        self._on_update = handler
+    def on_task_overdue(self, handler: SignalHandler) -> None:
+        """Call `handler` with tasks found past their due date."""
+        self._handlers["task_overdue"] = handler
 
     async def add_task(self, task: Task) -> None:
-        await self._iface.call_add_task(serialize(task))
+        try:
+            await self._iface.call_add_task(serialize(task))
+        except DBusError as e:
+            if e.type == ErrorType.INVALID_ARGS.value:
+                raise ValueError(e.text) from None
+            raise
 
     async def delete_task(self, task_id: Id) -> None:
         await self._iface.call_delete_task(serialize(task_id))
 
     async def update_task(self, task: Task) -> None:
-        await self._iface.call_update_task(serialize(task))
+        try:
+            await self._iface.call_update_task(serialize(task))
+        except DBusError as e:
+            if e.type == ErrorType.INVALID_ARGS.value:
+                raise ValueError(e.text) from None
+            raise
+
+    async def set_parent(self, task_id: Id, parent: Optional[Id]) -> None:
+        try:
+            await self._iface.call_set_parent(
+                serialize(task_id), serialize(parent) if parent else ""
+            )
+        except DBusError as e:
+            if e.type == ErrorType.INVALID_ARGS.value:
+                raise ValueError(e.text) from None
+            raise
 
     async def mark_done(self, task_id: Id) -> None:
         await self._iface.call_mark_done(serialize(task_id))
@@ -87,4 +240,187 @@ class DbusClient(IpcClient):
 
     async def list_tasks(self) -> list[Task]:
         payload = await self._iface.call_list_tasks()
-        return deserialize(payload)
+        return await deserialize_async(payload)
+
+    async def list_page(
+        self,
+        order: str = "default",
+        offset: int = 0,
+        limit: Optional[int] = None,
+        tag_filter: Optional[str] = None,
+    ) -> TaskPage:
+        try:
+            payload = await self._iface.call_list_page(
+                order, offset, -1 if limit is None else limit, tag_filter or ""
+            )
+        except DBusError as e:
+            if e.type == ErrorType.INVALID_ARGS.value:
+                raise ValueError(e.text) from None
+            raise
+        return await deserialize_async(payload)
+
+    async def list_children(
+        self,
+        parent: Optional[Id] = None,
+        order: str = "default",
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> TaskPage:
+        try:
+            payload = await self._iface.call_list_children(
+                serialize(parent) if parent else "",
+                order,
+                offset,
+                -1 if limit is None else limit,
+            )
+        except DBusError as e:
+            if e.type == ErrorType.INVALID_ARGS.value:
+                raise ValueError(e.text) from None
+            raise
+        return await deserialize_async(payload)
+
+    async def task_id_at(self, index: int, order: str = "default") -> Id:
+        try:
+            return deserialize(await self._iface.call_task_id_at(order, index))
+        except DBusError as e:
+            if e.type == DBUS_ERROR_INDEX_OUT_OF_RANGE:
+                raise IndexError(e.text) from None
+            if e.type == ErrorType.INVALID_ARGS.value:
+                raise ValueError(e.text) from None
+            raise
+
+    async def resolve_id(self, prefix: str) -> Id:
+        try:
+            return deserialize(await self._iface.call_resolve_id(prefix))
+        except DBusError as e:
+            if e.type == DBUS_ERROR_UNKNOWN_ID:
+                raise UnknownIdError(e.text) from None
+            if e.type == DBUS_ERROR_AMBIGUOUS_ID:
+                raise AmbiguousIdError(e.text) from None
+            raise
+
+    async def search(self, query: str, limit: int = 20) -> list[tuple[Task, float]]:
+        results = json.loads(await self._iface.call_search(query, limit))
+        return [(Task.from_dict(r["task"]), r["score"]) for r in results]
+
+    async def undo(self) -> Optional[HistoryEntry]:
+        try:
+            return deserialize(await self._iface.call_undo())
+        except DBusError as e:
+            if e.type == DBUS_ERROR_HISTORY_CONFLICT:
+                raise RuntimeError(e.text) from None
+            raise
+
+    async def redo(self) -> Optional[HistoryEntry]:
+        try:
+            return deserialize(await self._iface.call_redo())
+        except DBusError as e:
+            if e.type == DBUS_ERROR_HISTORY_CONFLICT:
+                raise RuntimeError(e.text) from None
+            raise
+
+    async def history(self, limit: Optional[int] = None) -> list[HistoryEntry]:
+        return deserialize(await self._iface.call_get_history(limit or 0))
+
+    async def get_stats(self) -> TaskStats:
+        return deserialize(await self._iface.call_get_stats())
+
+    async def import_tasks(
+        self, records: Iterable[Record], chunk_size: int = 1000
+    ) -> int:
+        """
+        Import records as one operation; return the number of tasks imported.
+
+        Records are consumed and sent in chunks of `chunk_size`, and the daemon
+        commits them all at once. Nothing is imported if `records` raises.
+        """
+        records = iter(records)
+        try:
+            while chunk := list(islice(records, chunk_size)):
+                payload = json.dumps([record_to_dict(*record) for record in chunk])
+                await self._iface.call_import_chunk(payload)
+            return await self._iface.call_commit_import()
+        except BaseException:
+            with anyio.CancelScope(shield=True):
+                await self._iface.call_abort_import()
+            raise
+
+    async def export_tasks(
+        self, descriptions: bool = False, chunk_size: int = 1000
+    ) -> AsyncIterator[list[Record]]:
+        """Yield all tasks in default order, in chunks of `chunk_size` records."""
+        offset = 0
+        while True:
+            payload = await self._iface.call_export_page(
+                offset, chunk_size, descriptions
+            )
+            chunk = [
+                (Task.from_dict(data), data.get("description"))
+                for data in json.loads(payload)
+            ]
+            if not chunk:
+                return
+            yield chunk
+            offset += len(chunk)
+
+    async def get_scheduler_stats(self) -> dict:
+        return json.loads(await self._iface.call_get_scheduler_stats())
+
+    async def get_metrics(self) -> dict:
+        """Return a snapshot of the daemon's metrics registry."""
+        return json.loads(await self._iface.call_get_metrics())
+
+    async def start_profile(self, mode: str = "cprofile") -> None:
+        """Start profiling the daemon in `mode` ("cprofile" or "sample")."""
+        try:
+            await self._iface.call_start_profile(mode)
+        except DBusError as e:
+            if e.type == ErrorType.INVALID_ARGS.value:
+                raise ValueError(e.text) from None
+            if e.type == DBUS_ERROR_PROFILER:
+                raise RuntimeError(e.text) from None
+            raise
+
+    async def stop_profile(self) -> str:
+        """Stop profiling the daemon and return the path of the written profile."""
+        try:
+            return await self._iface.call_stop_profile()
+        except DBusError as e:
+            if e.type == DBUS_ERROR_PROFILER:
+                raise RuntimeError(e.text) from None
+            raise
+
+    async def get_memory(self) -> dict:
+        """Return the daemon's memory use, object counts and cache sizes."""
+        try:
+            return json.loads(await self._iface.call_get_memory())
+        except DBusError as e:
+            if e.type == DBUS_ERROR_TRACE:
+                raise RuntimeError(e.text) from None
+            raise
+
+    async def trace_memory(self, action: str) -> dict:
+        """
+        Start or stop tracing the daemon's allocations, or take a snapshot.
+
+        A snapshot returns the path of the written diff and its top sites.
+        """
+        try:
+            return json.loads(await self._iface.call_trace_memory(action))
+        except DBusError as e:
+            if e.type == ErrorType.INVALID_ARGS.value:
+                raise ValueError(e.text) from None
+            if e.type == DBUS_ERROR_TRACE:
+                raise RuntimeError(e.text) from None
+            raise
+
+
+def _spawn_daemon(command: Sequence[str]) -> None:
+    """Spawn the daemon detached from the client's session and stdio."""
+    subprocess.Popen(
+        list(command),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
@@ -4,143 +4,638 @@
 """
 D-Bus server implementation for the ReadySetDone application.
 Implements all IpcServer protocol methods and publishes signals on updates.
+
+Every method call is timed end to end, scheduled ones also while running, and
+signal broadcasts are timed and sized, in the daemon's metrics registry.
+Task lists and pages are serialized off the event loop when they are large.
+
+Bulk imports arrive in chunks that are staged per client (by unique bus name)
+until the client commits them as a single operation. Staged chunks are dropped
+if the client aborts or disconnects.
 """
 
+import functools
+import json
 import logging
-from typing import Any
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
 
+from dbus_next import (
+    DBusError,
+    ErrorType,
+    Message,
+    MessageType,
+    NameFlag,
+    RequestNameReply,
+)
 from dbus_next.aio import MessageBus
 from dbus_next.service import ServiceInterface, method, signal
 
-from rsd.api import deserialize, serialize
-from rsd.service import TaskService
+from rsd.api import (
+    AmbiguousIdError,
+    UnknownIdError,
+    deserialize,
+    serialize,
+    serialize_async,
+    task_to_dict,
+)
+from rsd.api.interchange import Record, record_to_dict
+from rsd.api.types import Task
+from rsd.ipc.scheduler import RequestKind, RequestScheduler, SchedulerBusyError
+from rsd.metrics import REGISTRY, SIZE_BUCKETS, MemoryDiagnostics, Profiler
+from rsd.service import HistoryConflictError, TaskService
 
-from .constants import DBUS_INTERFACE
+from .constants import (
+    DBUS_ERROR_AMBIGUOUS_ID,
+    DBUS_ERROR_BUSY,
+    DBUS_ERROR_HISTORY_CONFLICT,
+    DBUS_ERROR_INDEX_OUT_OF_RANGE,
+    DBUS_ERROR_PROFILER,
+    DBUS_ERROR_TRACE,
+    DBUS_ERROR_UNKNOWN_ID,
+    DBUS_INTERFACE,
+)
 
 logger = logging.getLogger(__name__)
 
+_DBUS = "org.freedesktop.DBus"
+
+# Unique bus name of the client whose call is being handled. Set by
+# DbusServer._on_message right before dbus-next dispatches the call; the
+# handler task inherits it through its copied context.
+_current_sender: ContextVar[str] = ContextVar("_current_sender", default="")
+
+_REQUEST_SECONDS = REGISTRY.histogram(
+    "rsd_ipc_request_seconds", "Time from receiving a method call to replying"
+)
+_HANDLER_SECONDS = REGISTRY.histogram(
+    "rsd_ipc_handler_seconds", "Time spent running a method call, without queueing"
+)
+_ERRORS = REGISTRY.counter("rsd_ipc_errors_total", "Method calls that failed")
+_BROADCAST_SECONDS = REGISTRY.histogram(
+    "rsd_broadcast_seconds", "Time to serialize and emit a TaskUpdated signal"
+)
+_BROADCAST_BYTES = REGISTRY.histogram(
+    "rsd_broadcast_bytes", "Payload size of each TaskUpdated signal", SIZE_BUCKETS
+)
+_SIGNALS = REGISTRY.counter("rsd_signals_total", "Signals emitted")
+# Clients are only seen once they call a method, so a client that just listens
+# to signals is not counted until it does
+_CLIENTS = REGISTRY.gauge(
+    "rsd_subscribers", "Connected clients that have made a method call"
+)
+_TASKS = REGISTRY.gauge("rsd_tasks", "Tasks in the store")
+_QUEUED = REGISTRY.gauge("rsd_scheduler_queued", "Requests waiting for a slot")
+_RUNNING = REGISTRY.gauge("rsd_scheduler_running", "Requests running")
+
+# Types always counted by GetMemory, whether or not they are the most common
+_MEMORY_TYPES = (
+    "rsd.api.types.Task",
+    "rsd.service.task_service.TaskSnapshot",
+    "rsd.service.task_service.TaskChange",
+    "rsd.service.history.Operation",
+    "rsd.api.short_ids._Node",
+)
+
+
+def _timed(fn):
+    """Time a D-Bus method handler end to end and count the calls that fail."""
+    request_seconds = _REQUEST_SECONDS.labels(method=fn.__name__)
+    errors = _ERRORS.labels(method=fn.__name__)
+
+    @functools.wraps(fn)
+    async def wrapper(self: "DbusServerInterface", *args):
+        with request_seconds.time():
+            try:
+                return await fn(self, *args)
+            except Exception:
+                errors.inc()
+                raise
+
+    return wrapper
+
+
+def _scheduled(kind: RequestKind):
+    """Run a timed D-Bus method handler through the interface's RequestScheduler."""
+
+    def decorator(fn):
+        handler_seconds = _HANDLER_SECONDS.labels(method=fn.__name__)
+
+        async def run(self: "DbusServerInterface", *args):
+            with handler_seconds.time():
+                return await fn(self, *args)
+
+        @_timed
+        @functools.wraps(fn)
+        async def wrapper(self: "DbusServerInterface", *args):
+            try:
+                return await self.scheduler.submit(
+                    kind, _current_sender.get(), lambda: run(self, *args)
+                )
+            except SchedulerBusyError as e:
+                logger.warning(str(e))
+                raise DBusError(DBUS_ERROR_BUSY, str(e)) from None
+
+        return wrapper
+
+    return decorator
+
 
 class DbusServerInterface(ServiceInterface):
-    def __init__(self, task_service: TaskService) -> None:
+    def __init__(
+        self,
+        task_service: TaskService,
+        scheduler: RequestScheduler,
+        profiler: Optional[Profiler] = None,
+        memory: Optional[MemoryDiagnostics] = None,
+    ) -> None:
         self.task_service = task_service
+        self.scheduler = scheduler
+        self.profiler = profiler
+        self.memory = memory
+        self._imports: dict[str, list[Record]] = {}  # client -> staged records
         super().__init__(".".join(DBUS_INTERFACE))
 
+    def forget_client(self, client: str) -> None:
+        """Drop the state kept for a client that left the bus."""
+        if self._imports.pop(client, None) is not None:
+            logger.info("Dropped unfinished import from %s", client)
+
     # ruff: noqa: F821
     @method()
+    @_scheduled("write")
     async def AddTask(self, payload: "s") -> "s":
         task: Any = deserialize(payload)
-        logger.debug(f"Received AddTask with payload: {task}")
-        await self.task_service.add_task(task)
+        logger.debug("Received AddTask with payload: %s", task)
+        try:
+            await self.task_service.add_task(task)
+        except ValueError as e:
+            raise DBusError(ErrorType.INVALID_ARGS, str(e)) from None
         await self._broadcast_task_update()
-        logger.info(f"Added task: {task.id} - {task.task}")
+        logger.info("Added task: %s - %s", task.id, task.task)
         return "ok"
 
     @method()
+    @_scheduled("write")
     async def DeleteTask(self, payload: "s") -> "s":
         task_id: Any = deserialize(payload)
-        logger.debug(f"Received DeleteTask for ID: {task_id}")
+        logger.debug("Received DeleteTask for ID: %s", task_id)
         await self.task_service.delete_task(task_id)
         await self._broadcast_task_update()
-        logger.info(f"Deleted task: {task_id}")
+        logger.info("Deleted task: %s", task_id)
         return "ok"
 
     @method()
+    @_scheduled("write")
     async def UpdateTask(self, payload: "s") -> "s":
         task: Any = deserialize(payload)
-        logger.debug(f"Received UpdateTask with payload: {task}")
-        await self.task_service.update_task(task)
+        logger.debug("Received UpdateTask with payload: %s", task)
+        try:
+            await self.task_service.update_task(task)
+        except ValueError as e:
+            raise DBusError(ErrorType.INVALID_ARGS, str(e)) from None
+        await self._broadcast_task_update()
+        logger.info("Updated task: %s", task.id)
+        return "ok"
+
+    @method()
+    @_scheduled("write")
+    async def SetParent(self, payload: "s", parent_payload: "s") -> "s":
+        task_id: Any = deserialize(payload)
+        parent: Any = deserialize(parent_payload)
+        logger.debug("Received SetParent for ID: %s, parent: %s", task_id, parent)
+        try:
+            await self.task_service.set_parent(task_id, parent)
+        except ValueError as e:
+            raise DBusError(ErrorType.INVALID_ARGS, str(e)) from None
         await self._broadcast_task_update()
-        logger.info(f"Updated task: {task.id}")
+        logger.info("Moved task: %s under %s", task_id, parent)
         return "ok"
 
     @method()
+    @_scheduled("write")
     async def MarkDone(self, payload: "s") -> "s":
         task_id: Any = deserialize(payload)
-        logger.debug(f"Received MarkDone for ID: {task_id}")
+        logger.debug("Received MarkDone for ID: %s", task_id)
         await self.task_service.mark_done(task_id)
         await self._broadcast_task_update()
-        logger.info(f"Marked task done: {task_id}")
+        logger.info("Marked task done: %s", task_id)
         return "ok"
 
     @method()
+    @_scheduled("write")
     async def MarkNotDone(self, payload: "s") -> "s":
         task_id: Any = deserialize(payload)
-        logger.debug(f"Received MarkNotDone for ID: {task_id}")
+        logger.debug("Received MarkNotDone for ID: %s", task_id)
         await self.task_service.mark_not_done(task_id)
         await self._broadcast_task_update()
-        logger.info(f"Marked task not done: {task_id}")
+        logger.info("Marked task not done: %s", task_id)
         return "ok"
 
     @method()
+    @_scheduled("write")
     async def Toggle(self, payload: "s") -> "s":
         task_id: Any = deserialize(payload)
-        logger.debug(f"Received Toggle for ID: {task_id}")
+        logger.debug("Received Toggle for ID: %s", task_id)
         await self.task_service.toggle_done(task_id)
         await self._broadcast_task_update()
-        logger.info(f"Toggled task: {task_id}")
+        logger.info("Toggled task: %s", task_id)
         return "ok"
 
     @method()
+    @_scheduled("write")
     async def Pin(self, payload: "s") -> "s":
         task_id: Any = deserialize(payload)
-        logger.debug(f"Received Pin for ID: {task_id}")
+        logger.debug("Received Pin for ID: %s", task_id)
         await self.task_service.pin_task(task_id)
         await self._broadcast_task_update()
-        logger.info(f"Pinned task: {task_id}")
+        logger.info("Pinned task: %s", task_id)
         return "ok"
 
     @method()
+    @_scheduled("write")
     async def Unpin(self, payload: "s") -> "s":
         task_id: Any = deserialize(payload)
-        logger.debug(f"Received Unpin for ID: {task_id}")
+        logger.debug("Received Unpin for ID: %s", task_id)
         await self.task_service.unpin_task(task_id)
         await self._broadcast_task_update()
-        logger.info(f"Unpinned task: {task_id}")
+        logger.info("Unpinned task: %s", task_id)
         return "ok"
 
     @method()
+    @_scheduled("write")
     async def SetDescription(self, task_id_payload: "s", desc: "s") -> "s":
         task_id: Any = deserialize(task_id_payload)
-        logger.debug(f"Received SetDescription for ID: {task_id}")
+        logger.debug("Received SetDescription for ID: %s", task_id)
         await self.task_service.set_description(task_id, desc)
-        logger.info(f"Set description for task: {task_id}")
+        logger.info("Set description for task: %s", task_id)
         return "ok"
 
     @method()
+    @_scheduled("read")
     async def GetDescription(self, payload: "s") -> "s":
         task_id: Any = deserialize(payload)
-        logger.debug(f"Received GetDescription for ID: {task_id}")
+        logger.debug("Received GetDescription for ID: %s", task_id)
         result: Any = await self.task_service.get_description(task_id)
         return result or ""
 
     @method()
+    @_scheduled("read")
     async def ListTasks(self) -> "s":
         tasks: Any = await self.task_service.list_tasks()
-        logger.debug(f"Received ListTasks call, returning {len(tasks)} tasks")
-        return serialize(tasks)
+        logger.debug("Received ListTasks call, returning %s tasks", len(tasks))
+        return await serialize_async(tasks)
+
+    @method()
+    @_scheduled("read")
+    async def ListPage(
+        self, order: "s", offset: "u", limit: "i", tag_filter: "s"
+    ) -> "s":
+        logger.debug(
+            "Received ListPage for %s order, offset=%r limit=%r tag_filter=%r",
+            order,
+            offset,
+            limit,
+            tag_filter,
+        )
+        try:
+            page: Any = await self.task_service.list_page(
+                order, offset, None if limit < 0 else limit, tag_filter or None
+            )
+        except ValueError as e:
+            raise DBusError(ErrorType.INVALID_ARGS, str(e)) from None
+        return await serialize_async(page)
+
+    @method()
+    @_scheduled("read")
+    async def ListChildren(
+        self, parent_payload: "s", order: "s", offset: "u", limit: "i"
+    ) -> "s":
+        parent: Any = deserialize(parent_payload)
+        logger.debug(
+            "Received ListChildren of %s in %s order, offset=%r limit=%r",
+            parent,
+            order,
+            offset,
+            limit,
+        )
+        try:
+            page: Any = await self.task_service.list_children(
+                parent, order, offset, None if limit < 0 else limit
+            )
+        except ValueError as e:
+            raise DBusError(ErrorType.INVALID_ARGS, str(e)) from None
+        return await serialize_async(page)
+
+    @method()
+    @_scheduled("read")
+    async def TaskIdAt(self, order: "s", index: "u") -> "s":
+        logger.debug("Received TaskIdAt for %s order, index=%r", order, index)
+        try:
+            task_id: Any = await self.task_service.task_id_at(index, order)
+        except ValueError as e:
+            raise DBusError(ErrorType.INVALID_ARGS, str(e)) from None
+        except IndexError as e:
+            raise DBusError(DBUS_ERROR_INDEX_OUT_OF_RANGE, str(e)) from None
+        return serialize(task_id)
+
+    @method()
+    @_scheduled("read")
+    async def ResolveId(self, prefix: "s") -> "s":
+        logger.debug("Received ResolveId for prefix: %s", prefix)
+        try:
+            task_id: Any = await self.task_service.resolve_id(prefix)
+        except UnknownIdError as e:
+            raise DBusError(DBUS_ERROR_UNKNOWN_ID, str(e)) from None
+        except AmbiguousIdError as e:
+            raise DBusError(DBUS_ERROR_AMBIGUOUS_ID, str(e)) from None
+        return serialize(task_id)
+
+    @method()
+    @_scheduled("read")
+    async def Search(self, query: "s", limit: "u") -> "s":
+        results = await self.task_service.search(query, limit)
+        logger.debug("Received Search for %r, returning %s tasks", query, len(results))
+        return json.dumps(
+            [{"task": task_to_dict(task), "score": score} for task, score in results]
+        )
+
+    @method()
+    @_scheduled("write")
+    async def Undo(self) -> "s":
+        logger.debug("Received Undo")
+        try:
+            entry: Any = await self.task_service.undo()
+        except HistoryConflictError as e:
+            raise DBusError(DBUS_ERROR_HISTORY_CONFLICT, str(e)) from None
+        if entry is not None:
+            await self._broadcast_task_update()
+            logger.info("Undid %s #%s", entry.label, entry.id)
+        return serialize(entry) if entry is not None else ""
+
+    @method()
+    @_scheduled("write")
+    async def Redo(self) -> "s":
+        logger.debug("Received Redo")
+        try:
+            entry: Any = await self.task_service.redo()
+        except HistoryConflictError as e:
+            raise DBusError(DBUS_ERROR_HISTORY_CONFLICT, str(e)) from None
+        if entry is not None:
+            await self._broadcast_task_update()
+            logger.info("Redid %s #%s", entry.label, entry.id)
+        return serialize(entry) if entry is not None else ""
+
+    @method()
+    @_scheduled("read")
+    async def GetHistory(self, limit: "u") -> "s":
+        entries: Any = await self.task_service.history_entries(limit or None)
+        logger.debug("Received GetHistory, returning %s entries", len(entries))
+        return serialize(entries)
+
+    @method()
+    @_scheduled("read")
+    async def GetStats(self) -> "s":
+        logger.debug("Received GetStats")
+        stats: Any = await self.task_service.get_stats()
+        return serialize(stats)
+
+    @method()
+    @_scheduled("write")
+    async def ImportChunk(self, payload: "s") -> "u":
+        try:
+            records = [
+                (Task.from_dict(data), data.get("description"))
+                for data in json.loads(payload)
+            ]
+        except (ValueError, TypeError, KeyError) as e:
+            raise DBusError(ErrorType.INVALID_ARGS, f"Invalid import: {e}") from None
+        staged = self._imports.setdefault(_current_sender.get(), [])
+        staged.extend(records)
+        logger.debug("Received ImportChunk of %s, %s staged", len(records), len(staged))
+        return len(staged)
+
+    @method()
+    @_scheduled("write")
+    async def CommitImport(self) -> "u":
+        records = self._imports.pop(_current_sender.get(), [])
+        logger.debug("Received CommitImport of %s tasks", len(records))
+        try:
+            count: Any = await self.task_service.import_tasks(records)
+        except ValueError as e:
+            raise DBusError(ErrorType.INVALID_ARGS, str(e)) from None
+        await self._broadcast_task_update()
+        logger.info("Imported %s tasks", count)
+        return count
+
+    @method()
+    @_scheduled("write")  # behind the client's chunks that are still queued
+    async def AbortImport(self) -> "u":
+        records = self._imports.pop(_current_sender.get(), [])
+        logger.debug("Received AbortImport, dropped %s tasks", len(records))
+        return len(records)
+
+    @method()
+    @_scheduled("read")
+    async def ExportPage(self, offset: "u", limit: "u", descriptions: "b") -> "s":
+        logger.debug(
+            "Received ExportPage, offset=%r limit=%r descriptions=%r",
+            offset,
+            limit,
+            descriptions,
+        )
+        records = await self.task_service.export_page(offset, limit, descriptions)
+        return json.dumps([record_to_dict(task, text) for task, text in records])
+
+    # Not scheduled, so they answer even while every slot is taken
+    @method()
+    @_timed
+    async def GetSchedulerStats(self) -> "s":
+        return json.dumps(self.scheduler.stats())
+
+    @method()
+    @_timed
+    async def GetMetrics(self) -> "s":
+        logger.debug("Received GetMetrics")
+        return json.dumps(REGISTRY.snapshot())
+
+    # Not scheduled, so a daemon stuck behind a slow request can be profiled
+    @method()
+    @_timed
+    async def StartProfile(self, mode: "s") -> "s":
+        logger.debug("Received StartProfile, mode=%r", mode)
+        if self.profiler is None:
+            raise DBusError(DBUS_ERROR_PROFILER, "Profiling is not available")
+        try:
+            self.profiler.start(mode)
+        except ValueError as e:
+            raise DBusError(ErrorType.INVALID_ARGS, str(e)) from None
+        except RuntimeError as e:
+            raise DBusError(DBUS_ERROR_PROFILER, str(e)) from None
+        return "ok"
+
+    @method()
+    @_timed
+    async def StopProfile(self) -> "s":
+        logger.debug("Received StopProfile")
+        if self.profiler is None:
+            raise DBusError(DBUS_ERROR_PROFILER, "Profiling is not available")
+        try:
+            return self.profiler.stop()
+        except (RuntimeError, OSError) as e:
+            raise DBusError(DBUS_ERROR_PROFILER, str(e)) from None
+
+    @method()
+    @_timed
+    async def GetMemory(self) -> "s":
+        logger.debug("Received GetMemory")
+        if self.memory is None:
+            raise DBusError(DBUS_ERROR_TRACE, "Memory diagnostics are not available")
+        caches = self.task_service.cache_sizes()
+        return json.dumps(self.memory.report(caches, _MEMORY_TYPES))
+
+    @method()
+    @_timed
+    async def TraceMemory(self, action: "s") -> "s":
+        logger.debug("Received TraceMemory, action=%r", action)
+        if self.memory is None:
+            raise DBusError(DBUS_ERROR_TRACE, "Memory diagnostics are not available")
+        try:
+            match action:
+                case "start":
+                    self.memory.start_trace()
+                    return "{}"
+                case "stop":
+                    self.memory.stop_trace()
+                    return "{}"
+                case "snapshot":
+                    return json.dumps(self.memory.snapshot())
+        except (RuntimeError, OSError) as e:
+            raise DBusError(DBUS_ERROR_TRACE, str(e)) from None
+        raise DBusError(ErrorType.INVALID_ARGS, f"Unknown trace action: {action!r}")
 
     @signal()
     def TaskUpdated(self, payload: str) -> "s":
         logger.debug("TaskUpdated signal emitted")
+        _SIGNALS.labels(signal="TaskUpdated").inc()
+        return payload
+
+    @signal()
+    def TaskDue(self, payload: str) -> "s":
+        logger.debug("TaskDue signal emitted")
+        _SIGNALS.labels(signal="TaskDue").inc()
+        return payload
+
+    @signal()
+    def TaskOverdue(self, payload: str) -> "s":
+        logger.debug("TaskOverdue signal emitted")
+        _SIGNALS.labels(signal="TaskOverdue").inc()
         return payload
 
     async def _broadcast_task_update(self) -> None:
         tasks: Any = await self.task_service.list_tasks()
-        logger.debug(f"Broadcasting TaskUpdated signal with {len(tasks)} tasks")
-        self.TaskUpdated(serialize(tasks))
+        logger.debug("Broadcasting TaskUpdated signal with %s tasks", len(tasks))
+        with _BROADCAST_SECONDS.time():
+            payload = await serialize_async(tasks)
+            self.TaskUpdated(payload)
+        _BROADCAST_BYTES.observe(len(payload))
 
 
 class DbusServer:
-    def __init__(self, task_service: TaskService) -> None:
-        self.interface: DbusServerInterface = DbusServerInterface(task_service)
+    def __init__(
+        self,
+        task_service: TaskService,
+        scheduler: Optional[RequestScheduler] = None,
+        profiler: Optional[Profiler] = None,
+        memory: Optional[MemoryDiagnostics] = None,
+    ) -> None:
+        self.interface: DbusServerInterface = DbusServerInterface(
+            task_service, scheduler or RequestScheduler(), profiler, memory
+        )
+        self._bus: MessageBus | None = None
+        self._last_activity: float = time.monotonic()
+        self._clients: set[str] = set()  # unique names of clients that called
+        REGISTRY.add_collector(self._collect_metrics)
+
+    def _collect_metrics(self) -> None:
+        _CLIENTS.set(len(self._clients))
+        _TASKS.set(len(self.interface.task_service.snapshot.tasks))
+        stats = self.interface.scheduler.stats()
+        for kind, depth in stats["queued"].items():
+            _QUEUED.labels(kind=kind).set(depth)
+        _RUNNING.set(stats["running"])
 
     async def start(self) -> None:
-        self._bus: MessageBus = await MessageBus().connect()
+        """
+        Export the interface and claim the bus name.
+
+        Claiming the name is the readiness signal for autostarting clients, so
+        everything the first request needs must be loaded before calling this.
+        """
+        self._bus = await MessageBus().connect()
         object_path: str = "/" + "/".join(DBUS_INTERFACE)
         self._bus.export(object_path, self.interface)
-        await self._bus.request_name(".".join(DBUS_INTERFACE))
+        self._bus.add_message_handler(self._on_message)
+        await self._bus.call(
+            Message(
+                destination=_DBUS,
+                path="/org/freedesktop/DBus",
+                interface=_DBUS,
+                member="AddMatch",
+                signature="s",
+                body=[f"type='signal',sender='{_DBUS}',member='NameOwnerChanged'"],
+            )
+        )
+
+        reply = await self._bus.request_name(
+            ".".join(DBUS_INTERFACE), NameFlag.DO_NOT_QUEUE
+        )
+        if reply not in (
+            RequestNameReply.PRIMARY_OWNER,
+            RequestNameReply.ALREADY_OWNER,
+        ):
+            self._bus.disconnect()
+            self._bus = None
+            name = ".".join(DBUS_INTERFACE)
+            raise RuntimeError(f"Bus name {name} is already owned by another daemon")
         logger.info("D-Bus server started")
 
+    def notify_due(self, tasks: list[Task]) -> None:
+        """Broadcast the tasks that just reached their due date."""
+        self.interface.TaskDue(serialize(tasks))
+
+    def notify_overdue(self, tasks: list[Task]) -> None:
+        """Broadcast the tasks whose due date has already passed."""
+        self.interface.TaskOverdue(serialize(tasks))
+
+    def idle_time(self) -> float:
+        """Return the number of seconds since the last incoming method call."""
+        return time.monotonic() - self._last_activity
+
+    def client_count(self) -> int:
+        """Return the number of clients that called a method and are still connected."""
+        return len(self._clients)
+
+    def _on_message(self, msg: Message) -> None:
+        """Observe every incoming message to track client activity and identity."""
+        if (
+            msg.message_type == MessageType.METHOD_CALL
+            and msg.interface == self.interface.name
+        ):
+            self._last_activity = time.monotonic()
+            _current_sender.set(msg.sender or "")
+            if msg.sender:
+                self._clients.add(msg.sender)
+        elif (
+            msg.message_type == MessageType.SIGNAL
+            and msg.member == "NameOwnerChanged"
+            and msg.sender == _DBUS
+            and not msg.body[2]
+        ):
+            self._clients.discard(msg.body[0])
+            self.interface.forget_client(msg.body[0])
+
     async def stop(self) -> None:
         if self._bus:
             self._bus.disconnect()
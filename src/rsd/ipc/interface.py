@@ -11,15 +11,17 @@ They mirror the public API from `api.task` so that either side can be
 plugged in easily, regardless of whether D-Bus, sockets, or another transport is used.
 """
 
-from typing import Awaitable, Callable, Protocol
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Protocol
 
-from rsd.api.types import Id, Task
+from rsd.api.interchange import Record
+from rsd.api.types import HistoryEntry, Id, Task, TaskPage, TaskStats
 
 
 class IpcClient(Protocol):
     async def add_task(self, task: Task) -> None: ...
     async def delete_task(self, task_id: Id) -> None: ...
     async def update_task(self, task: Task) -> None: ...
+    async def set_parent(self, task_id: Id, parent: Id | None) -> None: ...
     async def mark_done(self, task_id: Id) -> None: ...
     async def mark_not_done(self, task_id: Id) -> None: ...
     async def toggle(self, task_id: Id) -> None: ...
@@ -28,9 +30,48 @@ class IpcClient(Protocol):
     async def get_description(self, task_id: Id) -> str: ...
     async def set_description(self, task_id: Id, description: str) -> None: ...
     async def list_tasks(self) -> list[Task]: ...
+    async def list_page(
+        self,
+        order: str = "default",
+        offset: int = 0,
+        limit: int | None = None,
+        tag_filter: str | None = None,
+    ) -> TaskPage: ...
+    async def list_children(
+        self,
+        parent: Id | None = None,
+        order: str = "default",
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> TaskPage: ...
+    async def task_id_at(self, index: int, order: str = "default") -> Id: ...
+    async def resolve_id(self, prefix: str) -> Id: ...
+    async def search(self, query: str, limit: int = 20) -> list[tuple[Task, float]]: ...
+    async def undo(self) -> HistoryEntry | None: ...
+    async def redo(self) -> HistoryEntry | None: ...
+    async def history(self, limit: int | None = None) -> list[HistoryEntry]: ...
+    async def get_stats(self) -> TaskStats: ...
+    async def import_tasks(
+        self, records: Iterable[Record], chunk_size: int = 1000
+    ) -> int: ...
+    def export_tasks(
+        self, descriptions: bool = False, chunk_size: int = 1000
+    ) -> AsyncIterator[list[Record]]: ...
+    async def get_scheduler_stats(self) -> dict: ...
+    async def get_metrics(self) -> dict: ...
+    async def start_profile(self, mode: str = "cprofile") -> None: ...
+    async def stop_profile(self) -> str: ...
+    async def get_memory(self) -> dict: ...
+    async def trace_memory(self, action: str) -> dict: ...
 
     def on_task_updated(
-        self, handler: Callable[[list[Task]], Awaitable[None]]
+        self, handler: Callable[[list[Task]], Awaitable[None] | None]
+    ) -> None: ...
+    def on_task_due(
+        self, handler: Callable[[list[Task]], Awaitable[None] | None]
+    ) -> None: ...
+    def on_task_overdue(
+        self, handler: Callable[[list[Task]], Awaitable[None] | None]
     ) -> None: ...
 
 
@@ -38,3 +79,7 @@ class IpcServer(Protocol):
     def register(self, service: object) -> None: ...
     async def start(self) -> None: ...
     async def stop(self) -> None: ...
+    def idle_time(self) -> float: ...
+    def client_count(self) -> int: ...
+    def notify_due(self, tasks: list[Task]) -> None: ...
+    def notify_overdue(self, tasks: list[Task]) -> None: ...
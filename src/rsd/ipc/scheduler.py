@@ -0,0 +1,225 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Request scheduling and backpressure for the ReadySetDone daemon.
+
+Every incoming IPC call is admitted through a `RequestScheduler` before it runs:
+
+- Reads and writes wait in separate queues. Reads get priority, but after
+  `read_burst` consecutive reads a waiting write is let through so that writes
+  are never starved.
+- At most one write runs at a time, and at most `max_concurrent` requests run
+  in total.
+- Within each queue, clients are served round-robin, so one client flooding
+  the daemon cannot monopolize it.
+- Queues are bounded. When a queue (or a single client's share of it) is
+  full, `SchedulerBusyError` is raised instead of queueing more work.
+
+The time requests spend waiting for a slot is recorded per queue.
+"""
+
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Literal, TypeVar
+
+import anyio
+
+RequestKind = Literal["read", "write"]
+
+T = TypeVar("T")
+
+
+class SchedulerBusyError(RuntimeError):
+    """Raised when a request is rejected because the daemon is saturated."""
+
+
+@dataclass(eq=False)
+class _Pending:
+    kind: RequestKind
+    client: str
+    enqueued: float
+    granted: anyio.Event = field(default_factory=anyio.Event)
+
+
+class QueueWaitStats:
+    """Running queue-wait statistics over all requests and a recent window."""
+
+    def __init__(self, window: int = 1024) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def record(self, wait: float) -> None:
+        self.count += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+        self._recent.append(wait)
+
+    def snapshot(self) -> dict:
+        """Return the statistics in milliseconds; percentiles cover the window."""
+        recent = sorted(self._recent)
+
+        def pct(p: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(p * len(recent)))] * 1000
+
+        return {
+            "count": self.count,
+            "mean_ms": (self.total / self.count * 1000) if self.count else 0.0,
+            "max_ms": self.max * 1000,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+        }
+
+
+class RequestScheduler:
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        max_queue_depth: int = 256,
+        max_pending_per_client: int = 64,
+        read_burst: int = 8,
+    ) -> None:
+        """
+        Create a new RequestScheduler.
+
+        Args:
+            max_concurrent: Maximum number of requests running at once.
+            max_queue_depth: Maximum number of waiting requests per queue.
+            max_pending_per_client: Maximum number of waiting requests per client.
+            read_burst: Consecutive reads allowed ahead of a waiting write.
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue_depth = max_queue_depth
+        self.max_pending_per_client = max_pending_per_client
+        self.read_burst = read_burst
+
+        self._queues: dict[RequestKind, OrderedDict[str, deque[_Pending]]] = {
+            "read": OrderedDict(),
+            "write": OrderedDict(),
+        }
+        self._depth: Counter[RequestKind] = Counter()
+        self._pending_per_client: Counter[str] = Counter()
+        self._running = 0
+        self._writing = False
+        self._reads_in_a_row = 0
+        self.wait_stats: dict[RequestKind, QueueWaitStats] = {
+            "read": QueueWaitStats(),
+            "write": QueueWaitStats(),
+        }
+
+    async def submit(
+        self, kind: RequestKind, client: str, fn: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Run `fn` once the scheduler grants it a slot.
+
+        Raises:
+            SchedulerBusyError: If the queue or the client's share is full.
+        """
+        pending = self._enqueue(kind, client)
+        self._dispatch()
+        try:
+            await pending.granted.wait()
+        except BaseException:
+            if pending.granted.is_set():
+                self._release(kind)
+            else:
+                self._discard(pending)
+            raise
+
+        try:
+            return await fn()
+        finally:
+            self._release(kind)
+
+    def stats(self) -> dict:
+        """Return current queue depths and queue-wait statistics."""
+        return {
+            "running": self._running,
+            "queued": {kind: self._depth[kind] for kind in self._queues},
+            "clients": len(self._pending_per_client),
+            "wait": {kind: s.snapshot() for kind, s in self.wait_stats.items()},
+        }
+
+    def _enqueue(self, kind: RequestKind, client: str) -> _Pending:
+        if self._depth[kind] >= self.max_queue_depth:
+            raise SchedulerBusyError(
+                f"Daemon is busy: {kind} queue is full ({self.max_queue_depth})"
+            )
+        if self._pending_per_client[client] >= self.max_pending_per_client:
+            raise SchedulerBusyError(
+                f"Daemon is busy: too many pending requests from {client or 'client'}"
+            )
+
+        pending = _Pending(kind=kind, client=client, enqueued=time.monotonic())
+        self._queues[kind].setdefault(client, deque()).append(pending)
+        self._depth[kind] += 1
+        self._pending_per_client[client] += 1
+        return pending
+
+    def _dispatch(self) -> None:
+        """Grant slots to waiting requests while capacity is available."""
+        while self._running < self.max_concurrent:
+            kind = self._next_kind()
+            if kind is None:
+                return
+            pending = self._pop(kind)
+            self._running += 1
+            if kind == "write":
+                self._writing = True
+            self.wait_stats[kind].record(time.monotonic() - pending.enqueued)
+            pending.granted.set()
+
+    def _next_kind(self) -> RequestKind | None:
+        reads_waiting = self._depth["read"] > 0
+        write_ready = self._depth["write"] > 0 and not self._writing
+
+        if reads_waiting and (
+            not write_ready or self._reads_in_a_row < self.read_burst
+        ):
+            self._reads_in_a_row += 1
+            return "read"
+        if write_ready:
+            self._reads_in_a_row = 0
+            return "write"
+        return None
+
+    def _pop(self, kind: RequestKind) -> _Pending:
+        """Pop the next request of `kind`, rotating between clients."""
+        queues = self._queues[kind]
+        client, queue = next(iter(queues.items()))
+        pending = queue.popleft()
+        if queue:
+            queues.move_to_end(client)
+        else:
+            del queues[client]
+        self._forget(pending)
+        return pending
+
+    def _discard(self, pending: _Pending) -> None:
+        """Remove a request that was cancelled while waiting."""
+        queues = self._queues[pending.kind]
+        queue = queues.get(pending.client)
+        if queue is not None and pending in queue:
+            queue.remove(pending)
+            if not queue:
+                del queues[pending.client]
+            self._forget(pending)
+
+    def _forget(self, pending: _Pending) -> None:
+        self._depth[pending.kind] -= 1
+        self._pending_per_client[pending.client] -= 1
+        if not self._pending_per_client[pending.client]:
+            del self._pending_per_client[pending.client]
+
+    def _release(self, kind: RequestKind) -> None:
+        self._running -= 1
+        if kind == "write":
+            self._writing = False
+        self._dispatch()
@@ -5,27 +5,97 @@
 Logging abstraction for ReadySetDone.
 
 This module defines the logger factory and exposes the interface for use across the project.
-"""
 
-from typing import Literal
+With `background=True` (the daemon), records are only put on a queue by the
+logging call, and a `QueueListener` thread formats and writes them, so a slow
+terminal or disk never blocks the event loop. Records are queued as they are,
+with their arguments and exception info, so the handlers format them on that
+thread and rich tracebacks survive. `log_file` adds a rotating
+plain-text file sink, written by the same thread.
+"""
 
-from .plain_logger import setup_logger as setup_plain_logger
-from .rich_logger import setup_logger as setup_rich_logger
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Literal, Optional
 
 LogLevel = Literal["debug", "info", "warn", "error", "critical"]
 
+_listener: Optional[QueueListener] = None
+
+
+class _RecordQueueHandler(QueueHandler):
+    """Queue records unformatted, where the stock `prepare` would drop exc_info."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
 
 def setup_logger(
-    type: str = "plain", level: LogLevel = "info", color: bool = False
+    type: str = "plain",
+    level: LogLevel = "info",
+    color: bool = False,
+    log_file: Optional[str] = None,
+    max_bytes: int = 1024 * 1024,
+    backups: int = 3,
+    background: bool = False,
 ) -> None:
     """Return the appropriate logger implementation based on configuration."""
     match type.lower():
         case "plain":
-            return setup_plain_logger(color=color, level=level)
+            from .plain_logger import create_handler
         case "rich":
-            return setup_rich_logger(color=color, level=level)
+            from .rich_logger import create_handler
         case _:
             raise ValueError(f"Unknown logger type: {type!r}")
 
+    handlers = [create_handler(color=color)]
+    if log_file:
+        handlers.append(_file_handler(log_file, max_bytes, backups))
+
+    stop_logger()
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level.upper())
+    # Clear any existing handlers to ensure we control formatting
+    root_logger.handlers.clear()
+    if not background:
+        for handler in handlers:
+            root_logger.addHandler(handler)
+        return
+
+    global _listener
+    records: queue.SimpleQueue = queue.SimpleQueue()  # unbounded, never blocks
+    root_logger.addHandler(_RecordQueueHandler(records))
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logger() -> None:
+    """Write out queued records and stop the background thread, if any."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logger)
+
+
+def _file_handler(location: str, max_bytes: int, backups: int) -> logging.Handler:
+    """Create a rotating file handler; a directory gets an `rsdd.log` inside it."""
+    from .plain_logger import FORMAT
+
+    path = Path(location)
+    if path.is_dir():
+        path = path / "rsdd.log"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handler = RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+    )
+    handler.setFormatter(logging.Formatter(fmt=FORMAT, datefmt="%Y-%m-%d %H:%M:%S"))
+    return handler
+
 
-__all__ = ["setup_logger"]
+__all__ = ["setup_logger", "stop_logger"]
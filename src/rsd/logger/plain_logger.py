@@ -10,6 +10,8 @@ import logging
 
 from .utils import COLOR_MAP, LEVEL_MAP, Color
 
+FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
 
 class ColorFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
@@ -27,28 +29,18 @@ class ColorFormatter(logging.Formatter):
         return formatted
 
 
-def setup_logger(color: bool = False, level: str = "info") -> None:
+def create_handler(color: bool = False) -> logging.Handler:
     """
-    Configure the plain logger using Python's logging module.
+    Create the plain console handler.
 
     Args:
         color: Enable or disable ANSI color output
-        level: Log level as a string (e.g., 'debug', 'info').
     """
-    root_logger = logging.getLogger()
-    root_logger.setLevel(level.upper())
-
-    # Clear any existing handlers to ensure we control formatting
-    root_logger.handlers.clear()
-
     if color:
         formatter = ColorFormatter(datefmt="%Y-%m-%d %H:%M:%S")
     else:
-        formatter = logging.Formatter(
-            fmt="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
+        formatter = logging.Formatter(fmt=FORMAT, datefmt="%Y-%m-%d %H:%M:%S")
 
     handler = logging.StreamHandler()
     handler.setFormatter(formatter)
-    root_logger.addHandler(handler)
+    return handler
@@ -11,17 +11,13 @@ import logging
 from rich.logging import RichHandler
 
 
-def setup_logger(color: bool = False, level: str = "info") -> None:
+def create_handler(color: bool = False) -> logging.Handler:
     """
-    Configure the Rich logger.
+    Create the Rich console handler.
 
     Args:
         color: Whether to use colorized output.
-        level: Log level as a string (e.g., 'debug', 'info').
     """
-    logging.basicConfig(
-        level=level.upper(),
-        format="%(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=[RichHandler(rich_tracebacks=True, markup=color)],
-    )
+    handler = RichHandler(rich_tracebacks=True, markup=color)
+    handler.setFormatter(logging.Formatter("%(message)s", "%Y-%m-%d %H:%M:%S"))
+    return handler
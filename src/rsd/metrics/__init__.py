@@ -0,0 +1,42 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Metrics for ReadySetDone.
+
+The daemon records its metrics in `REGISTRY`: modules declare the counters,
+gauges and histograms they update, and the IPC server serves snapshots of
+them to clients. `Profiler` profiles the daemon on demand, and
+`MemoryDiagnostics` reports and traces its memory use.
+"""
+
+from .memory import MemoryDiagnostics
+from .profiler import PROFILE_MODES, Profiler
+from .registry import (
+    COUNT_BUCKETS,
+    LATENCY_BUCKETS,
+    REGISTRY,
+    SIZE_BUCKETS,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    prometheus_text,
+    quantile,
+)
+
+__all__ = [
+    "REGISTRY",
+    "MetricsRegistry",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "LATENCY_BUCKETS",
+    "SIZE_BUCKETS",
+    "COUNT_BUCKETS",
+    "prometheus_text",
+    "quantile",
+    "Profiler",
+    "PROFILE_MODES",
+    "MemoryDiagnostics",
+]
@@ -0,0 +1,156 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Memory diagnostics for the ReadySetDone daemon.
+
+`MemoryDiagnostics.report` tells what the daemon holds right now: its
+resident and peak memory, the number of live objects per type (from a walk
+over the objects the garbage collector tracks, so it is only done on demand)
+and the sizes of the caches the caller passes in.
+
+Allocation tracing with `tracemalloc` is started on demand, since it slows
+down every allocation while it runs. Each `snapshot` is compared with the
+previous one (or with the start of tracing), and the allocation sites that
+grew the most are written to a text file, so a leak shows up as the same
+sites growing snapshot after snapshot.
+"""
+
+import gc
+import linecache
+import logging
+import resource
+import sys
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+_TOP_TYPES = 15  # object types listed by count
+_TOP_SITES = 25  # allocation sites written per snapshot
+_SUMMARY_SITES = 5  # allocation sites returned to clients
+
+
+def rss_bytes() -> Optional[int]:
+    """Return the resident set size of this process, if the OS reports it."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def peak_rss_bytes() -> int:
+    """Return the peak resident set size of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # KiB on Linux
+
+
+def object_counts(
+    objects: Iterable[object], types: Iterable[str] = (), top: int = _TOP_TYPES
+) -> dict[str, int]:
+    """
+    Count `objects` by the qualified name of their type, e.g. `rsd.api.types.Task`.
+
+    Returns the `top` most common types, and the given `types` in any case.
+    """
+    counts: Counter[str] = Counter()
+    for cls, n in Counter(map(type, objects)).items():
+        counts[f"{cls.__module__}.{cls.__qualname__}"] += n
+    return {name: counts[name] for name in types} | dict(counts.most_common(top))
+
+
+class MemoryDiagnostics:
+    def __init__(self, directory: str, frames: int = 10) -> None:
+        self.directory = Path(directory)
+        self.frames = frames
+        self._previous: Optional[tracemalloc.Snapshot] = None
+
+    def report(self, caches: Mapping[str, int], types: Iterable[str] = ()) -> dict:
+        """
+        Return memory use, live object counts and the given cache sizes.
+
+        Objects are counted for the most common types and for `types`, given
+        by qualified name.
+        """
+        objects = gc.get_objects()
+        return {
+            "rss_bytes": rss_bytes(),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "gc_objects": len(objects),
+            "objects": object_counts(objects, types),
+            "caches": dict(caches),
+            "tracing": tracemalloc.is_tracing(),
+            "traced_bytes": tracemalloc.get_traced_memory()[0]
+            if tracemalloc.is_tracing()
+            else None,
+        }
+
+    def start_trace(self) -> None:
+        """Start tracing allocations; raises RuntimeError if already tracing."""
+        if tracemalloc.is_tracing():
+            raise RuntimeError("Allocations are already being traced")
+        tracemalloc.start(self.frames)
+        self._previous = _take_snapshot()
+        logger.info("Started tracing allocations")
+
+    def stop_trace(self) -> None:
+        """Stop tracing allocations and free the traces."""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("Allocations are not being traced")
+        tracemalloc.stop()
+        self._previous = None
+        logger.info("Stopped tracing allocations")
+
+    def snapshot(self) -> dict:
+        """
+        Diff a new snapshot against the previous one and write the top sites.
+
+        Returns the path of the written file and the sites that grew the most.
+        Raises RuntimeError if allocations are not being traced.
+        """
+        if not tracemalloc.is_tracing() or self._previous is None:
+            raise RuntimeError("Allocations are not being traced")
+        snapshot = _take_snapshot()
+        stats = snapshot.compare_to(self._previous, "traceback")
+        self._previous = snapshot
+        stats.sort(key=lambda stat: stat.size_diff, reverse=True)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"rsdd-{datetime.now():%Y%m%d-%H%M%S}-memory.txt"
+        total = sum(stat.size for stat in stats)
+        with path.open("w") as f:
+            f.write(f"Traced memory: {total} bytes\n")
+            f.write(f"Top {_TOP_SITES} allocation sites by growth:\n")
+            for rank, stat in enumerate(stats[:_TOP_SITES], 1):
+                f.write(
+                    f"\n#{rank}: {stat.size_diff:+} bytes ({stat.count_diff:+} "
+                    f"blocks), {stat.size} bytes in {stat.count} blocks\n"
+                )
+                for frame in stat.traceback.format(most_recent_first=True):
+                    f.write(f"{frame}\n")
+        linecache.clearcache()
+        logger.info("Wrote allocation snapshot to %s", path)
+        return {
+            "path": str(path),
+            "traced_bytes": total,
+            "top": [
+                {
+                    "site": str(stat.traceback[-1]),  # the most recent frame
+                    "size_diff": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                    "size": stat.size,
+                }
+                for stat in stats[:_SUMMARY_SITES]
+            ],
+        }
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    """Take a snapshot without tracemalloc's own allocations."""
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
@@ -0,0 +1,149 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+On-demand CPU profiling of the ReadySetDone daemon.
+
+A `Profiler` starts and stops profiling sessions while the daemon runs, so a
+slowdown can be profiled where it happens instead of being reproduced under
+a profiler after a restart. Nothing is hooked while no session runs.
+
+Two modes are supported:
+- `cprofile`: deterministic profiling with `cProfile` of the thread that
+  started the session (the event loop), written as a `.pstats` file for
+  `python -m pstats` or snakeviz.
+- `sample`: a background thread records the event loop thread's stack every
+  `interval` seconds, written as a `.folded` file of collapsed stacks for
+  flamegraph.pl or speedscope. Its overhead does not depend on how many
+  calls the daemon makes, so it suits long sessions under load.
+"""
+
+import cProfile
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sample")
+
+
+class Profiler:
+    def __init__(self, directory: str, interval: float = 0.005) -> None:
+        self.directory = Path(directory)
+        self.interval = interval
+        self._mode: Optional[str] = None
+        self._started: Optional[datetime] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_Sampler] = None
+
+    @property
+    def mode(self) -> Optional[str]:
+        """The mode of the running session, or None if none runs."""
+        return self._mode
+
+    def start(self, mode: str = "cprofile") -> None:
+        """
+        Start a session profiling the calling thread.
+
+        Raises ValueError for an unknown mode, and RuntimeError if a session
+        is already running or another profiler is active.
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profiling mode: {mode!r}")
+        if self._mode is not None:
+            raise RuntimeError(f"A {self._mode} profiling session is already running")
+        if mode == "cprofile":
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as e:  # another profiler holds the hooks
+                raise RuntimeError(f"Cannot start cProfile: {e}") from None
+            self._profile = profile
+        else:
+            self._sampler = _Sampler(threading.get_ident(), self.interval)
+            self._sampler.start()
+        self._mode = mode
+        self._started = datetime.now()
+        logger.info("Started %s profiling", mode)
+
+    def stop(self) -> str:
+        """
+        Stop the running session, write its output and return the file path.
+
+        Raises RuntimeError if no session is running.
+        """
+        if self._mode is None or self._started is None:
+            raise RuntimeError("No profiling session is running")
+        mode, started = self._mode, self._started
+        self._mode = self._started = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = f"rsdd-{started:%Y%m%d-%H%M%S}-{mode}"
+        if self._profile is not None:
+            profile, self._profile = self._profile, None
+            profile.disable()
+            path = self.directory / f"{stem}.pstats"
+            profile.dump_stats(path)
+        else:
+            assert self._sampler is not None
+            sampler, self._sampler = self._sampler, None
+            stacks = sampler.stop()
+            path = self.directory / f"{stem}.folded"
+            _write_folded(path, stacks)
+        seconds = (datetime.now() - started).total_seconds()
+        logger.info("Wrote %s profile of %.1fs to %s", mode, seconds, path)
+        return str(path)
+
+    def toggle(self, mode: str = "cprofile") -> Optional[str]:
+        """Stop the running session and return its path, or start one."""
+        if self._mode is not None:
+            return self.stop()
+        self.start(mode)
+        return None
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, thread_id: int, interval: float) -> None:
+        super().__init__(name="rsd-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            self.stacks[_stack(frame)] += 1
+            del frame
+
+    def stop(self) -> Counter[tuple[str, ...]]:
+        self._stopped.set()
+        self.join()
+        return self.stacks
+
+
+def _stack(frame: Optional[FrameType]) -> tuple[str, ...]:
+    """Return the stack of a frame, outermost call first."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        names.append(f"{code.co_qualname} ({filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.reverse()
+    return tuple(names)
+
+
+def _write_folded(path: Path, stacks: Counter[tuple[str, ...]]) -> None:
+    """Write stacks in the collapsed format: `outer;...;inner count` per line."""
+    with path.open("w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{';'.join(stack)} {count}\n")
@@ -0,0 +1,276 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+In-process metrics for the ReadySetDone daemon.
+
+A `MetricsRegistry` holds named counters, gauges and histograms, each with
+optional labels (e.g. the IPC method). Recording a value is a dictionary
+lookup and an addition, cheap enough to wrap every request. Histograms use
+fixed buckets, so they take constant memory however many values they record,
+and percentiles are estimated from the buckets.
+
+`snapshot` returns every metric in a JSON-compatible form, which is what the
+daemon serves to clients, and `prometheus_text` renders a snapshot in the
+Prometheus text exposition format.
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Sequence
+
+# Upper bounds of the histogram buckets, in seconds for latencies
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = tuple(float(4**n) for n in range(2, 14))  # 16 B .. 64 MiB
+COUNT_BUCKETS = (1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0, 128.0, 256.0, 1024.0, 65536.0)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class _CounterValue:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class _GaugeValue(_CounterValue):
+    __slots__ = ()
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last bucket is unbounded
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the time spent in the `with` block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self._children: dict[Labels, object] = {}
+
+    def labels(self, **labels: str):
+        """Return the value recorded under the given label values."""
+        key = tuple(sorted(labels.items()))
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_value()
+        return child
+
+    def _unlabelled(self):
+        child = self._children.get(())
+        if child is None:
+            child = self._children[()] = self._new_value()
+        return child
+
+    def _new_value(self):
+        raise NotImplementedError
+
+    def _samples(self) -> list[dict]:
+        return [
+            {"labels": dict(key), "value": child.value}
+            for key, child in self._children.items()
+        ]
+
+    def snapshot(self) -> dict:
+        return {"type": self.type, "help": self.help, "samples": self._samples()}
+
+
+class Counter(_Metric):
+    """A value that only goes up, e.g. a number of requests or bytes."""
+
+    type = "counter"
+
+    def _new_value(self) -> _CounterValue:
+        return _CounterValue()
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled().inc(amount)
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, e.g. a number of connected clients."""
+
+    type = "gauge"
+
+    def _new_value(self) -> _GaugeValue:
+        return _GaugeValue()
+
+    def set(self, value: float) -> None:
+        self._unlabelled().set(value)
+
+
+class Histogram(_Metric):
+    """The distribution of observed values, e.g. latencies, in fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        self.buckets = tuple(buckets)
+        super().__init__(name, help)
+
+    def _new_value(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled().observe(value)
+
+    def time(self):
+        """Observe the time spent in the `with` block, in seconds."""
+        return self._unlabelled().time()
+
+    def _samples(self) -> list[dict]:
+        return [
+            {"labels": dict(key), "counts": list(child.counts), "sum": child.sum}
+            for key, child in self._children.items()
+        ]
+
+    def snapshot(self) -> dict:
+        return {**super().snapshot(), "buckets": list(self.buckets)}
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._register(Counter(name, help))
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        return self._register(Gauge(name, help))
+
+    def histogram(
+        self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Call `collector` before each snapshot, e.g. to refresh gauges."""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict[str, dict]:
+        """Return every metric and its samples in a JSON-compatible form."""
+        for collector in self._collectors:
+            collector()
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric):
+                raise ValueError(f"Metric {metric.name} is already a {existing.type}")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+
+REGISTRY = MetricsRegistry()  # the daemon's metrics
+
+
+def quantile(
+    buckets: Sequence[float], counts: Sequence[int], q: float
+) -> Optional[float]:
+    """
+    Estimate the `q`-quantile of a histogram sample, or None if it is empty.
+
+    Values are assumed to be spread evenly within each bucket; values in the
+    unbounded last bucket are reported as its lower bound.
+    """
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(counts):
+        if count and seen + count >= rank:
+            if index == len(buckets):
+                return buckets[-1]
+            lower = buckets[index - 1] if index else 0.0
+            return lower + (buckets[index] - lower) * (rank - seen) / count
+        seen += count
+    return buckets[-1]
+
+
+def prometheus_text(snapshot: dict[str, dict]) -> str:
+    """Render a registry snapshot in the Prometheus text exposition format."""
+    lines = []
+    for name, metric in snapshot.items():
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for sample in metric["samples"]:
+            labels = sample["labels"]
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_labels(labels)} {_number(sample['value'])}")
+                continue
+            cumulative = 0
+            bounds = [*map(_number, metric["buckets"]), "+Inf"]
+            for bound, count in zip(bounds, sample["counts"]):
+                cumulative += count
+                bucket_labels = _labels({**labels, "le": bound})
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(sample['sum'])}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
@@ -6,8 +6,24 @@ This module exposes all core service logic for ReadySetDone.
 
 Currently available:
 - TaskService: High-level API for task and description operations.
+- DueScheduler: Reports tasks as they reach their due date.
+- TagIndex: Tag -> task IDs index answering tag filters.
+- TaskTree: Subtask index with cached subtree progress.
+- HistoryConflictError: Raised when an undo/redo no longer applies.
 """
 
-from .task_service import TaskService
+from .due_scheduler import DueScheduler
+from .history import HistoryConflictError
+from .tag_index import TagIndex
+from .task_service import TaskChange, TaskService, TaskSnapshot
+from .task_tree import TaskTree
 
-__all__ = ["TaskService"]
+__all__ = [
+    "TaskService",
+    "TaskSnapshot",
+    "TaskChange",
+    "DueScheduler",
+    "TagIndex",
+    "TaskTree",
+    "HistoryConflictError",
+]
@@ -0,0 +1,189 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Due-date scheduler for the ReadySetDone daemon.
+
+Open tasks with a due date are kept in an indexed min-heap ordered by due date.
+The scheduler sleeps until the earliest deadline, reports every task that has
+come due, and sleeps again, so it costs nothing between deadlines however many
+tasks have a due date. Committed changes move, add or drop a single heap entry
+in O(log n) and wake the scheduler only when the earliest deadline changes.
+
+Deadlines that passed while the daemon was not running, or that are set in the
+past, are reported as overdue instead of due.
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import anyio
+
+from rsd.api.types import Task
+
+from .task_service import TaskChange, TaskService, TaskSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on one sleep, so deadlines are still met after the wall clock
+# jumps (e.g. on resume from suspend, which the monotonic clock does not see).
+_MAX_SLEEP = 60.0
+
+DueHandler = Callable[[List[Task]], None]
+
+
+def _local(due: datetime) -> datetime:
+    """Return `due` as a naive local time, comparable with `datetime.now()`."""
+    return due.astimezone().replace(tzinfo=None) if due.tzinfo else due
+
+
+class _DueHeap:
+    """A binary min-heap of (due, task ID) that can update or remove any entry."""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, str]] = []
+        self._positions: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def peek(self) -> Optional[tuple[datetime, str]]:
+        return self._heap[0] if self._heap else None
+
+    def set(self, task_id: str, due: datetime) -> None:
+        """Add an entry, or move an existing one to its new due date."""
+        position = self._positions.get(task_id)
+        if position is None:
+            self._heap.append((due, task_id))
+            self._positions[task_id] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+        elif self._heap[position][0] != due:
+            self._heap[position] = (due, task_id)
+            self._sift_up(position)
+            self._sift_down(self._positions[task_id])
+
+    def remove(self, task_id: str) -> None:
+        position = self._positions.pop(task_id, None)
+        if position is None:
+            return
+        last = self._heap.pop()
+        if position < len(self._heap):
+            self._heap[position] = last
+            self._positions[last[1]] = position
+            self._sift_up(position)
+            self._sift_down(self._positions[last[1]])
+
+    def pop(self) -> tuple[datetime, str]:
+        entry = self._heap[0]
+        self.remove(entry[1])
+        return entry
+
+    def _swap(self, i: int, j: int) -> None:
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._positions[heap[i][1]] = i
+        self._positions[heap[j][1]] = j
+
+    def _sift_up(self, i: int) -> None:
+        while i > 0:
+            parent = (i - 1) // 2
+            if self._heap[i] >= self._heap[parent]:
+                return
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int) -> None:
+        size = len(self._heap)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < size and self._heap[child] < self._heap[smallest]:
+                    smallest = child
+            if smallest == i:
+                return
+            self._swap(i, smallest)
+            i = smallest
+
+
+class DueScheduler:
+    def __init__(
+        self,
+        task_service: TaskService,
+        on_due: DueHandler,
+        on_overdue: DueHandler,
+    ) -> None:
+        """
+        Create a scheduler for the tasks of `task_service`.
+
+        Args:
+            task_service: Service whose tasks are watched.
+            on_due: Called with the tasks that reached their due date.
+            on_overdue: Called with the tasks whose due date had already passed
+                when they were loaded or given that date.
+        """
+        self.task_service = task_service
+        self.on_due = on_due
+        self.on_overdue = on_overdue
+        self._heap = _DueHeap()
+        self._wake = anyio.Event()
+        task_service.add_listener(self._on_commit)
+
+    def next_deadline(self) -> Optional[datetime]:
+        """Return the earliest due date still to be reported, if any."""
+        head = self._heap.peek()
+        return head[0] if head is not None else None
+
+    async def run(self) -> None:
+        """Report due tasks as their deadlines arrive, until cancelled."""
+        now = datetime.now()
+        overdue = []
+        for task in self.task_service.snapshot.tasks.values():
+            if task.due is not None and not task.done:
+                if _local(task.due) <= now:
+                    overdue.append(task)
+                else:
+                    self._heap.set(task.id, _local(task.due))
+        logger.debug("Watching %s due dates, %s overdue", len(self._heap), len(overdue))
+        if overdue:
+            self.on_overdue(overdue)
+
+        while True:
+            self._fire(datetime.now())
+            self._wake = anyio.Event()
+            delay = _MAX_SLEEP
+            if (head := self._heap.peek()) is not None:
+                delay = min(delay, (head[0] - datetime.now()).total_seconds())
+            with anyio.move_on_after(max(delay, 0)):
+                await self._wake.wait()
+
+    def _fire(self, now: datetime) -> None:
+        tasks = self.task_service.snapshot.tasks
+        due = []
+        while (head := self._heap.peek()) is not None and head[0] <= now:
+            _, task_id = self._heap.pop()
+            if task_id in tasks:
+                due.append(tasks[task_id])
+        if due:
+            logger.info("%s tasks are due", len(due))
+            self.on_due(due)
+
+    def _on_commit(self, snapshot: TaskSnapshot, changes: List[TaskChange]) -> None:
+        head = self._heap.peek()
+        now = datetime.now()
+        overdue = []
+        for change in changes:
+            task = change.after
+            if task is None or task.done or task.due is None:
+                self._heap.remove((change.after or change.before).id)
+            elif _local(task.due) <= now:
+                self._heap.remove(task.id)
+                before = change.before
+                if before is None or before.due != task.due or before.done:
+                    overdue.append(task)
+            else:
+                self._heap.set(task.id, _local(task.due))
+        if overdue:
+            self.on_overdue(overdue)
+        if self._heap.peek() != head:
+            self._wake.set()
@@ -0,0 +1,212 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Undo/redo history for the ReadySetDone daemon.
+
+Every committed operation is recorded as the `(before, after)` pair of each
+task it changed, where None stands for a task that did not exist. Tasks are
+never mutated in place, so a change only references the task objects
+before and after it, which are shared with the snapshots that hold them: an
+operation costs memory in proportion to the tasks it touched, not to the store.
+Undoing an operation writes back the `before` side of its changes, redoing it
+the `after` side, after checking that those tasks are still in the state the
+operation left them in (or found them in, for redo).
+
+The history is bounded to `depth` operations, and is saved when the daemon
+stops so it survives idle shutdowns and restarts.
+"""
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional
+
+from rsd.api.serialize import task_to_dict
+from rsd.api.types import HistoryEntry, Task
+
+from .store import HistoryStore
+
+logger = logging.getLogger(__name__)
+
+_FORMAT_VERSION = 1
+_SUMMARY_NAMES = 3  # task names listed per operation
+
+Change = tuple[Optional[Task], Optional[Task]]  # (before, after)
+
+
+class HistoryConflictError(RuntimeError):
+    """The tasks an operation changed have been changed again since."""
+
+
+@dataclass(frozen=True)
+class Operation:
+    """A committed operation and its net change to each task it touched."""
+
+    id: int
+    label: str
+    time: datetime
+    changes: tuple[Change, ...]
+
+    def entry(self, undone: bool = False) -> HistoryEntry:
+        """Summarize the operation for clients."""
+        names = dict.fromkeys(
+            (after or before).task for before, after in islice(self.changes, 64)
+        )
+        return HistoryEntry(
+            id=self.id,
+            label=self.label,
+            time=self.time,
+            tasks=list(islice(names, _SUMMARY_NAMES)),
+            count=len(self.changes),
+            undone=undone,
+        )
+
+
+class History:
+    def __init__(self, path: str, depth: int = 100) -> None:
+        self.store = HistoryStore(path)
+        self.depth = depth
+        self._undo: deque[Operation] = deque(maxlen=depth)
+        self._redo: list[Operation] = []
+        self._next_id = 1
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._undo) + len(self._redo)
+
+    def record(self, label: str, changes: Iterable[Change]) -> None:
+        """
+        Record a new operation from the changes it made, in order.
+
+        Only the first `before` and last `after` of each task are kept. This
+        discards everything that could be redone.
+        """
+        net: dict[str, Change] = {}
+        for before, after in changes:
+            task_id = (after or before).id
+            net[task_id] = (net[task_id][0] if task_id in net else before, after)
+        self._undo.append(
+            Operation(self._next_id, label, datetime.now(), tuple(net.values()))
+        )
+        self._next_id += 1
+        self._redo.clear()
+        self._dirty = True
+
+    def last(self) -> Optional[Operation]:
+        """Return the operation `undo` would revert, if any."""
+        return self._undo[-1] if self._undo else None
+
+    def last_undone(self) -> Optional[Operation]:
+        """Return the operation `redo` would re-apply, if any."""
+        return self._redo[-1] if self._redo else None
+
+    def undo(self) -> Optional[Operation]:
+        """Move the last operation to the redo stack and return it."""
+        if not self._undo:
+            return None
+        operation = self._undo.pop()
+        self._redo.append(operation)
+        self._dirty = True
+        return operation
+
+    def redo(self) -> Optional[Operation]:
+        """Move the last undone operation back to the undo stack and return it."""
+        if not self._redo:
+            return None
+        operation = self._redo.pop()
+        self._undo.append(operation)
+        self._dirty = True
+        return operation
+
+    def discard(self, operation: Operation) -> None:
+        """Forget an operation that can no longer be undone or redone."""
+        if operation in self._undo:
+            self._undo.remove(operation)
+        if operation in self._redo:
+            self._redo.remove(operation)
+        self._dirty = True
+
+    def checkpoint(self) -> Any:
+        """Return a token that `restore` rolls the history back to."""
+        return list(self._undo), list(self._redo), self._next_id
+
+    def restore(self, checkpoint: Any) -> None:
+        undo, self._redo, self._next_id = checkpoint
+        self._undo = deque(undo, maxlen=self.depth)
+
+    def entries(self, limit: Optional[int] = None) -> list[HistoryEntry]:
+        """
+        Summarize recent operations, newest first.
+
+        Undone operations, which `redo` would re-apply, come first.
+        """
+        return [
+            operation.entry(undone)
+            for operation, undone in islice(self._newest_first(), limit)
+        ]
+
+    def _newest_first(self) -> Iterator[tuple[Operation, bool]]:
+        for operation in self._redo:
+            yield operation, True
+        for operation in reversed(self._undo):
+            yield operation, False
+
+    async def load(self) -> None:
+        """Load the saved history, or start empty if it is missing or stale."""
+        data = await self.store.load()
+        if data.get("version") != _FORMAT_VERSION:
+            return
+        self._undo = deque(map(_load_operation, data["undo"]), maxlen=self.depth)
+        self._redo = [_load_operation(op) for op in data["redo"]]
+        self._next_id = data["next_id"]
+        logger.debug(
+            "Loaded %s undo and %s redo steps", len(self._undo), len(self._redo)
+        )
+
+    async def save(self) -> None:
+        """Persist the history if it changed since it was loaded or saved."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        await self.store.save(
+            {
+                "version": _FORMAT_VERSION,
+                "next_id": self._next_id,
+                "undo": [_dump_operation(op) for op in self._undo],
+                "redo": [_dump_operation(op) for op in self._redo],
+            }
+        )
+
+
+def _dump_task(task: Optional[Task]) -> Optional[dict]:
+    return task_to_dict(task) if task is not None else None
+
+
+def _load_task(data: Optional[dict]) -> Optional[Task]:
+    return Task.from_dict(data) if data is not None else None
+
+
+def _dump_operation(operation: Operation) -> dict:
+    return {
+        "id": operation.id,
+        "label": operation.label,
+        "time": operation.time.isoformat(),
+        "changes": [
+            [_dump_task(before), _dump_task(after)]
+            for before, after in operation.changes
+        ],
+    }
+
+
+def _load_operation(data: dict) -> Operation:
+    return Operation(
+        id=data["id"],
+        label=data["label"],
+        time=datetime.fromisoformat(data["time"]),
+        changes=tuple(
+            (_load_task(before), _load_task(after)) for before, after in data["changes"]
+        ),
+    )
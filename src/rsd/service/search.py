@@ -0,0 +1,251 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Incremental full-text search over task names and descriptions.
+
+`SearchIndex` is an inverted index: every token maps to the tasks containing
+it, with a weight per task that favours names over descriptions. The vocabulary
+is also kept as a sorted list, so a query token matches every indexed token it
+is a prefix of through two bisections. Query cost therefore depends on the
+number of matching tokens and tasks, not on the size of the store.
+
+The index is updated in place as tasks and descriptions change, and its
+per-task term counts are persisted, so startup only re-indexes what changed
+since the last save instead of re-reading every description. Saving only
+collects references to the per-task entries on the event loop (each entry's
+term counts are replaced, never changed in place); a large index is encoded in
+a worker thread and the file is replaced atomically.
+"""
+
+import heapq
+import logging
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Iterable, Mapping, Optional, Sequence
+
+import anyio
+
+from rsd.api.types import Task
+
+from .store import SearchIndexStore
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+")
+_FORMAT_VERSION = 2
+_NAME_WEIGHT = 3.0  # a token in the name counts this many description tokens
+_PREFIX_FACTOR = 0.5  # score multiplier for prefix-only matches
+_SAVE_INTERVAL = 2.0  # minimum seconds between two saves
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN.findall(text.casefold())
+
+
+class SearchIndex:
+    def __init__(self, path: str) -> None:
+        self.store = SearchIndexStore(path)
+        # Task ID -> indexed task name, description term counts and file mtime
+        self._names: dict[str, str] = {}
+        self._name_terms: dict[str, dict[str, int]] = {}
+        self._description_terms: dict[str, dict[str, int]] = {}
+        self._description_mtimes: dict[str, int] = {}
+        # Token -> Task ID -> weight, and the sorted vocabulary for prefixes
+        self._postings: dict[str, dict[str, float]] = {}
+        self._vocabulary: list[str] = []
+        self._dirty = anyio.Event()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def term_count(self) -> int:
+        """Return the number of distinct terms in the index."""
+        return len(self._postings)
+
+    async def load(self) -> None:
+        """Load the persisted index, or start empty if it is missing or stale."""
+        data = await self.store.load()
+        if data.get("version") != _FORMAT_VERSION:
+            return
+        for doc in data["tasks"]:
+            task_id = doc["id"]
+            self._names[task_id] = doc["name"]
+            self._name_terms[task_id] = doc["name_terms"]
+            self._description_terms[task_id] = doc["description_terms"]
+            self._description_mtimes[task_id] = doc["description_mtime"]
+            self._post(task_id, keep_sorted=False)
+        self._vocabulary = sorted(self._postings)
+        self._dirty = anyio.Event()
+        logger.debug("Loaded search index with %s tasks", len(self._names))
+
+    async def save(self) -> None:
+        """Persist the index if it changed since the last save."""
+        if not self._dirty.is_set():
+            return
+        self._dirty = anyio.Event()
+        await self.store.save(
+            {
+                "version": _FORMAT_VERSION,
+                "tasks": [
+                    {
+                        "id": task_id,
+                        "name": name,
+                        "name_terms": self._name_terms[task_id],
+                        "description_terms": self._description_terms[task_id],
+                        "description_mtime": self._description_mtimes[task_id],
+                    }
+                    for task_id, name in self._names.items()
+                ],
+            }
+        )
+
+    async def autosave(self) -> None:
+        """Save the index whenever it changes, at most every few seconds."""
+        while True:
+            await self._dirty.wait()
+            try:
+                await self.save()
+            except OSError:
+                logger.exception("Failed to save the search index, retrying later")
+                self._dirty.set()
+            await anyio.sleep(_SAVE_INTERVAL)
+
+    def reconcile(
+        self, tasks: Iterable[Task], description_mtimes: Mapping[str, int]
+    ) -> list[str]:
+        """
+        Bring the loaded index in line with the current tasks.
+
+        Drops tasks that no longer exist and re-indexes changed names. Returns
+        the IDs whose description changed on disk since it was indexed; the
+        caller passes their new text to `index_description`.
+        """
+        tasks = {task.id: task for task in tasks}
+        for task_id in [t for t in self._names if t not in tasks]:
+            self.remove(task_id)
+
+        self.index_names(
+            [task for task in tasks.values() if self._names.get(task.id) != task.task]
+        )
+        stale = []
+        for task in tasks.values():
+            mtime = description_mtimes.get(task.id, 0)
+            if self._description_mtimes.get(task.id, 0) != mtime:
+                stale.append(task.id)
+        return stale
+
+    def index_name(self, task: Task) -> None:
+        """Index (or re-index) a task's name."""
+        self.index_names([task])
+
+    def index_names(self, tasks: Sequence[Task]) -> None:
+        """
+        Index (or re-index) the names of several tasks.
+
+        A large batch leaves the vocabulary unsorted while posting and sorts it
+        once at the end, instead of inserting every new token in place.
+        """
+        keep_sorted = len(tasks) * 8 <= len(self._vocabulary)
+        for task in tasks:
+            self._unpost(task.id, keep_sorted)
+            self._names[task.id] = task.task
+            self._name_terms[task.id] = dict(Counter(tokenize(task.task)))
+            self._description_terms.setdefault(task.id, {})
+            self._description_mtimes.setdefault(task.id, 0)
+            self._post(task.id, keep_sorted)
+        if not keep_sorted:
+            self._vocabulary = sorted(self._postings)
+
+    def index_description(self, task_id: str, description: str, mtime: int) -> None:
+        """Index (or re-index) the description of an indexed task."""
+        if task_id not in self._names:
+            return
+        self._unpost(task_id)
+        self._description_terms[task_id] = dict(Counter(tokenize(description)))
+        self._description_mtimes[task_id] = mtime
+        self._post(task_id)
+
+    def remove(self, task_id: str) -> None:
+        """Drop a task from the index."""
+        if task_id not in self._names:
+            return
+        self._unpost(task_id)
+        del self._names[task_id]
+        del self._name_terms[task_id]
+        del self._description_terms[task_id]
+        del self._description_mtimes[task_id]
+        self._dirty.set()
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[str, float]]:
+        """
+        Return up to `limit` `(task_id, score)` pairs matching every query token.
+
+        Each query token matches indexed tokens it is a prefix of; exact matches
+        score higher, and rarer tokens weigh more than common ones.
+        """
+        terms = tokenize(query)
+        if not terms or limit <= 0:
+            return []
+
+        total = max(len(self._names), 1)
+        scores: Optional[dict[str, float]] = None
+        # Start from the most selective term to keep the candidate set small
+        for term_scores in sorted(
+            (self._match(term, total) for term in dict.fromkeys(terms)), key=len
+        ):
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    task_id: score + term_scores[task_id]
+                    for task_id, score in scores.items()
+                    if task_id in term_scores
+                }
+            if not scores:
+                return []
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def _match(self, term: str, total: int) -> dict[str, float]:
+        """Score every task containing a token that starts with `term`."""
+        scores: dict[str, float] = {}
+        start = bisect_left(self._vocabulary, term)
+        end = bisect_left(self._vocabulary, term + "\U0010ffff", lo=start)
+        for token in self._vocabulary[start:end]:
+            postings = self._postings[token]
+            factor = math.log(1 + total / len(postings))
+            if token != term:
+                factor *= _PREFIX_FACTOR
+            for task_id, weight in postings.items():
+                scores[task_id] = max(scores.get(task_id, 0.0), weight * factor)
+        return scores
+
+    def _post(self, task_id: str, keep_sorted: bool = True) -> None:
+        weights: Counter[str] = Counter()
+        for token, count in self._name_terms[task_id].items():
+            weights[token] += _NAME_WEIGHT * count
+        for token, count in self._description_terms[task_id].items():
+            weights[token] += count
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                if keep_sorted:
+                    insort(self._vocabulary, token)
+            postings[task_id] = weight
+        self._dirty.set()
+
+    def _unpost(self, task_id: str, keep_sorted: bool = True) -> None:
+        tokens = set(self._name_terms.get(task_id, ()))
+        tokens.update(self._description_terms.get(task_id, ()))
+        for token in tokens:
+            postings = self._postings[token]
+            postings.pop(task_id, None)
+            if not postings:
+                del self._postings[token]
+                if keep_sorted:
+                    del self._vocabulary[bisect_left(self._vocabulary, token)]
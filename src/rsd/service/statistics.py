@@ -0,0 +1,192 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Task statistics for the ReadySetDone daemon.
+
+The counters (open, done, pinned, ...) are computed once when the store is
+loaded, then adjusted from each committed change in O(1) per changed task, so
+reading them costs the same however many tasks there are. Open tasks with a
+due date are counted per due day, and per due time within the day, so counting
+the overdue ones adds up the past days and only looks at the times of today.
+
+Completions are also counted per day and per hour as they are committed.
+These histograms cannot be recovered from the tasks, so `autosave` saves them
+in the background when they change, at most every few seconds, and the
+service saves them when it stops. Reopening a task takes its completion back
+off the current day and hour.
+"""
+
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+import anyio
+
+from rsd.api.types import Task, TaskStats
+
+from .store import StatsStore
+
+logger = logging.getLogger(__name__)
+
+_FORMAT_VERSION = 1
+_DAYS = 90  # days of completions kept
+_HOURS = 48  # hours of completions kept
+_DAY_FORMAT = "%Y-%m-%d"
+_HOUR_FORMAT = "%Y-%m-%dT%H"
+_SAVE_INTERVAL = 10.0  # minimum seconds between two saves
+
+
+def _completion(before: Optional[Task], after: Optional[Task]) -> int:
+    """Return 1 if a change completes a task, -1 if it reopens one, else 0."""
+    if before is None or after is None:
+        return 0
+    if before.done != after.done:
+        return 1 if after.done else -1
+    if after.recurrence and before.completed != after.completed:
+        # A recurring task records its last completion, and undo restores it
+        if before.completed is None:
+            return 1
+        if after.completed is None:
+            return -1
+        return 1 if after.completed.timestamp() > before.completed.timestamp() else -1
+    return 0
+
+
+def _bucket_keys(now: datetime) -> tuple[tuple[str, str], tuple[str, str]]:
+    """Return the (current, oldest kept) day and hour histogram keys."""
+    return (
+        (
+            now.strftime(_DAY_FORMAT),
+            (now - timedelta(days=_DAYS - 1)).strftime(_DAY_FORMAT),
+        ),
+        (
+            now.strftime(_HOUR_FORMAT),
+            (now - timedelta(hours=_HOURS - 1)).strftime(_HOUR_FORMAT),
+        ),
+    )
+
+
+class Statistics:
+    def __init__(self, path: str) -> None:
+        self.store = StatsStore(path)
+        self._dirty = anyio.Event()
+        self._counts: Counter[str] = Counter()
+        # Open tasks with a due date, per local due day, and per due timestamp
+        self._due_days: Counter[date] = Counter()
+        self._due_times: dict[date, Counter[float]] = {}
+        self._daily: dict[str, int] = {}
+        self._hourly: dict[str, int] = {}
+
+    def reset(self, tasks: Iterable[Task]) -> None:
+        """Recount everything from the full task list."""
+        self._counts.clear()
+        self._due_days.clear()
+        self._due_times.clear()
+        for task in tasks:
+            self._count(task, 1)
+
+    def update(
+        self, before: Optional[Task], after: Optional[Task], now: datetime
+    ) -> None:
+        """Account for a task changing from `before` to `after` (None if absent)."""
+        if before is not None:
+            self._count(before, -1)
+        if after is not None:
+            self._count(after, 1)
+        if delta := _completion(before, after):
+            self._record(now, delta)
+
+    def stats(self, now: datetime) -> TaskStats:
+        """Return the current statistics."""
+        (_, day), (_, hour) = _bucket_keys(now)
+        counts = self._counts
+        return TaskStats(
+            total=counts["total"],
+            open=counts["open"],
+            done=counts["done"],
+            pinned=counts["pinned"],
+            recurring=counts["recurring"],
+            due=counts["due"],
+            overdue=self._overdue(now),
+            subtasks=counts["subtasks"],
+            completed_daily={k: n for k, n in self._daily.items() if k >= day},
+            completed_hourly={k: n for k, n in self._hourly.items() if k >= hour},
+        )
+
+    def _count(self, task: Task, sign: int) -> None:
+        counts = self._counts
+        counts["total"] += sign
+        counts["done" if task.done else "open"] += sign
+        if task.pinned:
+            counts["pinned"] += sign
+        if task.recurrence:
+            counts["recurring"] += sign
+        if task.parent:
+            counts["subtasks"] += sign
+        if task.due is not None and not task.done:
+            counts["due"] += sign
+            due = task.due.timestamp()  # naive times are local
+            day = datetime.fromtimestamp(due).date()
+            times = self._due_times.setdefault(day, Counter())
+            times[due] += sign
+            if not times[due]:
+                del times[due]
+            self._due_days[day] += sign
+            if not self._due_days[day]:
+                del self._due_days[day]
+                del self._due_times[day]
+
+    def _overdue(self, now: datetime) -> int:
+        """Count the open tasks due at or before `now`."""
+        timestamp = now.timestamp()
+        today = datetime.fromtimestamp(timestamp).date()
+        overdue = sum(n for day, n in self._due_days.items() if day < today)
+        times = self._due_times.get(today, {})
+        return overdue + sum(n for due, n in times.items() if due <= timestamp)
+
+    def _record(self, now: datetime, delta: int) -> None:
+        keys = _bucket_keys(now)
+        for buckets, (key, oldest) in zip((self._daily, self._hourly), keys):
+            count = buckets.get(key, 0) + delta
+            if count > 0:
+                buckets[key] = count
+            else:
+                buckets.pop(key, None)
+            for old in [k for k in buckets if k < oldest]:
+                del buckets[old]
+        self._dirty.set()
+
+    async def load(self) -> None:
+        """Load the saved completion histograms, if any."""
+        data = await self.store.load()
+        if data.get("version") != _FORMAT_VERSION:
+            return
+        self._daily = dict(sorted(data["daily"].items()))
+        self._hourly = dict(sorted(data["hourly"].items()))
+        logger.debug("Loaded completions for %s days", len(self._daily))
+
+    async def save(self) -> None:
+        """Persist the completion histograms if they changed."""
+        if not self._dirty.is_set():
+            return
+        self._dirty = anyio.Event()
+        await self.store.save(
+            {
+                "version": _FORMAT_VERSION,
+                "daily": self._daily,
+                "hourly": self._hourly,
+            }
+        )
+
+    async def autosave(self) -> None:
+        """Save the histograms whenever they change, at most every few seconds."""
+        while True:
+            await self._dirty.wait()
+            try:
+                await self.save()
+            except OSError:
+                logger.exception("Failed to save task statistics, retrying later")
+                self._dirty.set()
+            await anyio.sleep(_SAVE_INTERVAL)
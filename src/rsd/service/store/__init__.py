@@ -7,9 +7,21 @@ This module exposes the storage layer for ReadySetDone.
 Includes:
 - TaskStore: JSON-based store for task metadata.
 - DescriptionStore: Markdown-based store for task descriptions.
+- SearchIndexStore: JSON-based store for the persisted search index.
+- HistoryStore: JSON-based store for the undo/redo history.
+- StatsStore: JSON-based store for task completion statistics.
 """
 
 from rsd.service.store.description_store import DescriptionStore
+from rsd.service.store.history_store import HistoryStore
+from rsd.service.store.search_index_store import SearchIndexStore
+from rsd.service.store.stats_store import StatsStore
 from rsd.service.store.task_store import TaskStore
 
-__all__ = ["TaskStore", "DescriptionStore"]
+__all__ = [
+    "TaskStore",
+    "DescriptionStore",
+    "SearchIndexStore",
+    "HistoryStore",
+    "StatsStore",
+]
@@ -5,8 +5,11 @@
 Handles the loading and saving of task descriptions in Markdown format using anyio and file locking.
 """
 
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Mapping, Optional
+
+import anyio
 
 from rsd.fs.locked_file import LockedFile
 
@@ -31,3 +34,36 @@ class DescriptionStore:
         """Save the task description to a Markdown file."""
         description_file = self._get_description_file(task_id)
         await description_file.write(description)
+
+    async def save_descriptions(self, descriptions: Mapping[str, str]) -> None:
+        """
+        Save many descriptions at once, from a single worker thread.
+
+        Each file is replaced atomically, so a crash midway leaves every
+        description either old or new, never truncated.
+        """
+
+        def write_all() -> None:
+            for task_id, description in descriptions.items():
+                path = self.folderpath / f"{task_id}.md"
+                temp = path.with_name(f".{path.name}.tmp")
+                temp.write_text(description)
+                os.replace(temp, path)
+
+        await anyio.to_thread.run_sync(write_all)
+
+    def modified_times(self) -> dict[str, int]:
+        """Return the modification time (ns) of every description, by task ID."""
+        with os.scandir(self.folderpath) as entries:
+            return {
+                entry.name.removesuffix(".md"): entry.stat().st_mtime_ns
+                for entry in entries
+                if entry.name.endswith(".md")
+            }
+
+    def modified_time(self, task_id: str) -> int:
+        """Return the modification time (ns) of a description, or 0 if it has none."""
+        try:
+            return (self.folderpath / f"{task_id}.md").stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
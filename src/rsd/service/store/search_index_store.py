@@ -0,0 +1,45 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Handles the loading and saving of the persisted search index in JSON format.
+
+An index of many tasks is encoded in a worker thread (see `rsd.api.offload`),
+and the file is replaced atomically, so a crash while saving leaves the
+previous index intact rather than a truncated one that must be rebuilt.
+"""
+
+import json
+import os
+
+import anyio
+from anyio import Path
+
+from rsd.api.offload import OFFLOAD_MIN_TASKS, dumps_chunked, offload
+from rsd.fs.locked_file import LockedFile
+
+
+class SearchIndexStore:
+    def __init__(self, filepath: str = "search_index.json"):
+        self.filepath = Path(filepath)
+        self.locked_file = LockedFile(self.filepath)
+
+    async def load(self) -> dict:
+        """Load the index data, or an empty dict if it is missing or corrupt."""
+        try:
+            data = await self.locked_file.read()
+            return json.loads(data) if data.strip() else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    async def save(self, data: dict) -> None:
+        """Replace the index file with `data`, whose "tasks" is a list."""
+        if len(data["tasks"]) >= OFFLOAD_MIN_TASKS:
+            text = await offload(dumps_chunked, data)
+        else:
+            text = dumps_chunked(data)
+        temp = self.filepath.with_name(f".{self.filepath.name}.tmp")
+        async with self.locked_file.lock:
+            await self.filepath.parent.mkdir(parents=True, exist_ok=True)
+            await temp.write_text(text)
+            await anyio.to_thread.run_sync(os.replace, temp, self.filepath)
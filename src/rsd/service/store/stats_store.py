@@ -0,0 +1,30 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Handles the loading and saving of the task statistics in JSON format.
+"""
+
+import json
+
+from anyio import Path
+
+from rsd.fs.locked_file import LockedFile
+
+
+class StatsStore:
+    def __init__(self, filepath: str = "stats.json"):
+        self.filepath = Path(filepath)
+        self.locked_file = LockedFile(self.filepath)
+
+    async def load(self) -> dict:
+        """Load the statistics data, or an empty dict if it is missing or corrupt."""
+        try:
+            data = await self.locked_file.read()
+            return json.loads(data) if data.strip() else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    async def save(self, data: dict) -> None:
+        """Replace the contents of the statistics file."""
+        await self.locked_file.write(json.dumps(data, separators=(",", ":")))
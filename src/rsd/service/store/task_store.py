@@ -3,15 +3,41 @@
 
 """
 Handles the loading and saving of task metadata in JSON format using anyio and file locking.
+
+Large stores are encoded and decoded in a worker thread (see `rsd.api.offload`),
+so that the event loop keeps running while they are.
 """
 
 import json
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 from anyio import Path
 
+from rsd.api.offload import (
+    OFFLOAD_MIN_BYTES,
+    OFFLOAD_MIN_TASKS,
+    dumps_chunked,
+    offload,
+)
 from rsd.api.types import Task
 from rsd.fs.locked_file import LockedFile
+from rsd.metrics import REGISTRY, SIZE_BUCKETS
+
+_READ_SECONDS = REGISTRY.histogram(
+    "rsd_store_read_seconds", "Time spent reading the task store file"
+)
+_DECODE_SECONDS = REGISTRY.histogram(
+    "rsd_store_decode_seconds", "Time spent decoding the task store JSON"
+)
+_ENCODE_SECONDS = REGISTRY.histogram(
+    "rsd_store_encode_seconds", "Time spent encoding the task store JSON"
+)
+_WRITE_SECONDS = REGISTRY.histogram(
+    "rsd_store_write_seconds", "Time spent writing the task store file"
+)
+_WRITE_BYTES = REGISTRY.histogram(
+    "rsd_store_write_bytes", "Size of each task store write", SIZE_BUCKETS
+)
 
 
 class TaskStore:
@@ -22,10 +48,14 @@ class TaskStore:
     async def load_all(self) -> List[Task]:
         """Load all tasks from the JSON file."""
         try:
-            tasks_data = await self.locked_file.read()
+            with _READ_SECONDS.time():
+                tasks_data = await self.locked_file.read()
             if not tasks_data.strip():  # empty file → treat as empty list
                 return []
-            return [Task(**task) for task in json.loads(tasks_data)]
+            with _DECODE_SECONDS.time():
+                if len(tasks_data) >= OFFLOAD_MIN_BYTES:
+                    return await offload(_decode, tasks_data)
+                return _decode(tasks_data)
         except FileNotFoundError:
             return []
 
@@ -47,14 +77,30 @@ class TaskStore:
         else:
             tasks.append(task)
 
-        await self.locked_file.write(
-            json.dumps([t.__dict__ for t in tasks], default=str, indent=4)
-        )
+        await self.save_all(tasks)
 
     async def delete(self, task_id: str) -> None:
         """Delete a task by ID."""
         tasks = await self.load_all()
         tasks = [task for task in tasks if task.id != task_id]
-        await self.locked_file.write(
-            json.dumps([t.__dict__ for t in tasks], default=str, indent=4)
-        )
+        await self.save_all(tasks)
+
+    async def save_all(self, tasks: Iterable[Task]) -> None:
+        """Replace the contents of the JSON file with the given tasks."""
+        tasks = list(tasks)  # the caller may change its collection meanwhile
+        with _ENCODE_SECONDS.time():
+            if len(tasks) >= OFFLOAD_MIN_TASKS:
+                data = await offload(_encode, tasks)
+            else:
+                data = _encode(tasks)
+        with _WRITE_SECONDS.time():
+            await self.locked_file.write(data)
+        _WRITE_BYTES.observe(len(data))
+
+
+def _decode(data: str) -> List[Task]:
+    return [Task.from_dict(task) for task in json.loads(data)]
+
+
+def _encode(tasks: List[Task]) -> str:
+    return dumps_chunked([t.__dict__ for t in tasks], default=str, indent=4)
@@ -0,0 +1,51 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Tag index for the ReadySetDone daemon.
+
+Maps every tag to the set of IDs of the tasks carrying it, so tag filters are
+answered with set operations over the matching tasks instead of a scan over
+all of them. The index is kept up to date from committed changes.
+"""
+
+from typing import AbstractSet, Iterable
+
+from rsd.api.tag_filter import TagFilter, select
+from rsd.api.types import Task
+
+
+class TagIndex:
+    def __init__(self, tasks: Iterable[Task] = ()) -> None:
+        self._tasks_by_tag: dict[str, set[str]] = {}
+        for task in tasks:
+            self._add(task.id, task.tags)
+
+    def __len__(self) -> int:
+        return len(self._tasks_by_tag)
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of tasks carrying each tag."""
+        return {tag: len(ids) for tag, ids in self._tasks_by_tag.items()}
+
+    def select(self, expr: TagFilter, universe: AbstractSet[str]) -> set[str]:
+        """Return the IDs in `universe` (all task IDs) matched by `expr`."""
+        return select(expr, self._tasks_by_tag, universe)
+
+    def update(self, task_id: str, before: Iterable[str], after: Iterable[str]) -> None:
+        """Move a task from its `before` tags to its `after` tags."""
+        before, after = set(before), set(after)
+        self._remove(task_id, before - after)
+        self._add(task_id, after - before)
+
+    def _add(self, task_id: str, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._tasks_by_tag.setdefault(tag, set()).add(task_id)
+
+    def _remove(self, task_id: str, tags: Iterable[str]) -> None:
+        for tag in tags:
+            ids = self._tasks_by_tag.get(tag)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del self._tasks_by_tag[tag]
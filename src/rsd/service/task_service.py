@@ -4,95 +4,810 @@
 """
 TaskService implements the ReadySetDoneAPI.
 This is where task business logic lives: validation, mutation, loading, etc.
+
+All mutations go through a single writer task (`TaskService.run`) that owns
+the task state. Callers submit commands to an ordered queue; the writer applies
+them, persists the result once per batch, and publishes a new immutable
+`TaskSnapshot`. Readers use the current snapshot without taking any lock, and
+writes are linearizable: a mutation returns only after it has been persisted
+and is visible to every subsequent read.
+
+Task names and descriptions are also kept in a full-text `SearchIndex`, which
+is updated from committed changes and saved in the background, and task IDs in
+a `ShortIdTrie` that resolves short ID prefixes, and tags in a `TagIndex`. Each
+sort order is kept as a `SortedTasks` view, updated per change, that serves
+index lookups and pages, optionally filtered by tags.
+
+Subtasks name their parent task. A `TaskTree` indexes the children of every
+task and caches subtree progress, so listing a task's subtasks and their
+progress costs O(subtasks), and completing or deleting a task cascades to its
+subtasks by walking the index instead of scanning all tasks.
+
+Bulk imports are applied as a single command, so however many tasks they add,
+the store is written once and listeners see a single commit.
+
+Task counts and completion histograms are kept up to date from committed
+changes in `Statistics`, so reading them never scans the tasks.
+
+Each user-facing mutation is recorded in an undo/redo `History` as the changes
+it committed; `undo` and `redo` are themselves commands that write back the
+recorded task states.
 """
 
+import logging
+from dataclasses import dataclass, replace
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+import anyio
+from anyio.abc import TaskStatus
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+
+from rsd.api.interchange import Record
+from rsd.api.recurrence import next_due, parse_recurrence
+from rsd.api.short_ids import ShortIdTrie
+from rsd.api.sorting import SORT_KEYS, SortedTasks
+from rsd.api.tag_filter import parse_tag_filter
+from rsd.api.types import HistoryEntry, Id, Task, TaskPage, TaskStats
+from rsd.metrics import COUNT_BUCKETS, REGISTRY
+
+from .history import History, HistoryConflictError, Operation
+from .search import SearchIndex
+from .statistics import Statistics
+from .store import DescriptionStore, TaskStore
+from .tag_index import TagIndex
+from .task_tree import TaskTree
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_COMMIT_SECONDS = REGISTRY.histogram(
+    "rsd_commit_seconds", "Time to apply, persist and publish a batch of commands"
+)
+_BATCH_SIZE = REGISTRY.histogram(
+    "rsd_commit_batch_size", "Number of commands committed together", COUNT_BUCKETS
+)
+_CHANGES = REGISTRY.counter("rsd_task_changes_total", "Committed task changes")
+
+
+@dataclass(frozen=True)
+class TaskSnapshot:
+    """An immutable view of all tasks at a given version."""
+
+    version: int
+    tasks: Mapping[str, Task]  # Task ID -> Task, in store order
+
+
+@dataclass(frozen=True)
+class TaskChange:
+    """A single committed change; `before`/`after` are None for adds/deletes."""
+
+    before: Optional[Task]
+    after: Optional[Task]
+
+
+CommitListener = Callable[[TaskSnapshot, List[TaskChange]], None]
+
+
+class _Transaction:
+    """Mutable working copy of the task state used by the writer for one batch."""
+
+    def __init__(self, tasks: Mapping[str, Task], tree: TaskTree) -> None:
+        self.tasks: dict[str, Task] = dict(tasks)
+        self.changes: list[TaskChange] = []
+        self._tree = tree  # as of the last commit
+        self._adopted: dict[str, set[str]] = {}  # parent ID -> children moved in
+
+    def get(self, task_id: str) -> Optional[Task]:
+        return self.tasks.get(task_id)
+
+    def put(self, task: Task) -> None:
+        before = self.tasks.get(task.id)
+        if task.parent is not None and (before is None or before.parent != task.parent):
+            self._adopted.setdefault(task.parent, set()).add(task.id)
+        self.changes.append(TaskChange(before, task))
+        self.tasks[task.id] = task
+
+    def delete(self, task_id: str) -> None:
+        before = self.tasks.pop(task_id, None)
+        if before is not None:
+            self.changes.append(TaskChange(before, None))
+
+    def set(self, task_id: str, task: Optional[Task]) -> None:
+        """Put `task`, or delete the task if it is None."""
+        if task is None:
+            self.delete(task_id)
+        else:
+            self.put(task)
+
+    def children(self, task_id: str) -> list[str]:
+        """Return the IDs of a task's children, including changes in this batch."""
+        candidates = self._tree.children(task_id) | self._adopted.get(task_id, set())
+        return [
+            child
+            for child in candidates
+            if (task := self.tasks.get(child)) is not None and task.parent == task_id
+        ]
+
+    def descendants(self, task_id: str) -> list[str]:
+        """Return the IDs of a task's subtasks at any depth, parents first."""
+        found: list[str] = []
+        seen = {task_id}  # guards against cycles in a hand-edited store
+        stack = [task_id]
+        while stack:
+            children = [c for c in self.children(stack.pop()) if c not in seen]
+            seen.update(children)
+            found.extend(children)
+            stack.extend(children)
+        return found
+
+    def check_parent(self, task_id: str, parent: Optional[str]) -> None:
+        """Raise ValueError unless `parent` exists and is not within the task."""
+        if parent is None:
+            return
+        if parent not in self.tasks:
+            raise ValueError(f"Unknown parent task: {parent}")
+        ancestor: Optional[str] = parent
+        for _ in range(len(self.tasks)):
+            if ancestor == task_id:
+                raise ValueError("A task cannot be a subtask of itself or its subtasks")
+            node = self.tasks.get(ancestor) if ancestor is not None else None
+            if node is None:
+                return
+            ancestor = node.parent
+
+    def rollback_to(self, mark: int) -> None:
+        """Revert every change recorded after `mark`."""
+        for change in reversed(self.changes[mark:]):
+            key = (change.after or change.before).id
+            if change.before is None:
+                self.tasks.pop(key, None)
+            else:
+                self.tasks[key] = change.before
+        del self.changes[mark:]
+
+
+@dataclass(eq=False)
+class _Command:
+    apply: Callable[[_Transaction], Any]
+    done: anyio.Event
+    label: Optional[str] = None  # recorded in the history under this name
+    result: Any = None
+    error: Optional[BaseException] = None
 
-from rsd.api.types import Id, Task
 
-from .store import TaskStore
+def _completed(task: Task) -> Task:
+    """
+    Return `task` once completed.
+
+    A recurring task is never marked done: it moves on to its next occurrence,
+    and `completed` records when the last one was completed.
+    """
+    if task.recurrence:
+        now = datetime.now(task.due.tzinfo if task.due else None)
+        due = next_due(task.due or now, task.recurrence, now)
+        return replace(task, due=due, completed=now)
+    return replace(task, done=True, completed=task.completed or task.created)
+
+
+def _added(task: Task) -> Task:
+    """
+    Return `task` as it is stored when added.
+
+    A recurring task is validated and starts open. Unless given a date, its
+    first occurrence is due one interval from now, not now, which would make
+    it overdue as soon as it is added.
+    """
+    if task.recurrence:
+        step = parse_recurrence(task.recurrence)
+        return replace(task, done=False, due=task.due or datetime.now() + step)
+    return task
+
+
+def _final_states(changes: List[TaskChange]) -> dict[str, Optional[Task]]:
+    """Return the last state of every task in `changes`, None if deleted."""
+    return {(c.after or c.before).id: c.after for c in changes}
 
 
 class TaskService:
-    def __init__(self, task_store_path: Path):
+    def __init__(
+        self,
+        task_store_path: Path,
+        description_store_path: Optional[Path] = None,
+        search_index_path: Optional[Path] = None,
+        sort_orders: Iterable[str] = ("default",),
+        max_batch: int = 256,
+        history_path: Optional[Path] = None,
+        history_depth: int = 100,
+        stats_path: Optional[Path] = None,
+    ):
         """
         Create a new TaskService.
 
         Args:
             task_store_path (Path): Path to the task store JSON file
+            description_store_path (Path): Folder holding Markdown descriptions
+            search_index_path (Path): Path to the persisted search index
+            sort_orders (Iterable[str]): Orders from `SORT_KEYS` to keep sorted
+                views for from startup; others are built on first use
+            max_batch (int): Maximum number of commands persisted together
+            history_path (Path): Path to the saved undo/redo history
+            history_depth (int): Number of operations that can be undone
+            stats_path (Path): Path to the saved completion statistics
         """
         self.store = TaskStore(task_store_path)
+        self.descriptions = DescriptionStore(
+            description_store_path or Path(task_store_path).parent / "descriptions"
+        )
+        self.search_index = SearchIndex(
+            search_index_path or Path(task_store_path).parent / "search_index.json"
+        )
+        self.history = History(
+            history_path or Path(task_store_path).parent / "history.json",
+            history_depth,
+        )
+        self.stats = Statistics(
+            stats_path or Path(task_store_path).parent / "stats.json"
+        )
+        self.max_batch = max_batch
+        self.snapshot = TaskSnapshot(version=0, tasks=MappingProxyType({}))
+        self.short_ids = ShortIdTrie()
+        unknown = set(sort_orders) - SORT_KEYS.keys()
+        if unknown:
+            raise ValueError(f"Unknown sort orders: {', '.join(sorted(unknown))}")
+        self.sort_orders = ["default", *(o for o in sort_orders if o != "default")]
+        self.views: dict[str, SortedTasks] = {}
+        self.tags = TagIndex()
+        self.tree = TaskTree()
+        self._listeners: list[CommitListener] = []
+        self._send: MemoryObjectSendStream[_Command]
+        self._receive: MemoryObjectReceiveStream[_Command]
+        self._send, self._receive = anyio.create_memory_object_stream(float("inf"))
+        self._stopped = anyio.Event()
+        self.add_listener(self._update_search_index)
+        self.add_listener(self._update_short_ids)
+        self.add_listener(self._update_views)
+        self.add_listener(self._update_tags)
+        self.add_listener(self._update_tree)
+        self.add_listener(self._update_stats)
+
+    def add_listener(self, listener: CommitListener) -> None:
+        """Call `listener` with the new snapshot and its changes after each commit."""
+        self._listeners.append(listener)
+
+    async def run(self, *, task_status: TaskStatus = anyio.TASK_STATUS_IGNORED) -> None:
+        """
+        Load the store and process commands until `aclose` is called.
+
+        Signals `task_status` once the store is loaded, so the service is ready
+        to serve requests as soon as `TaskGroup.start` returns.
+        """
+        tasks = await self.store.load_all()
+        self.snapshot = TaskSnapshot(
+            version=0, tasks=MappingProxyType({t.id: t for t in tasks})
+        )
+        self.short_ids = ShortIdTrie(t.id for t in tasks)
+        self.views = {o: SortedTasks(tasks, SORT_KEYS[o]) for o in self.sort_orders}
+        self.tags = TagIndex(tasks)
+        self.tree = TaskTree(tasks)
+        self.stats.reset(tasks)
+        logger.debug("Loaded %s tasks", len(tasks))
+        await self._load_search_index(tasks)
+        await self.history.load()
+        await self.stats.load()
+        task_status.started()
+
+        try:
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(self.search_index.autosave)
+                tg.start_soon(self.stats.autosave)
+                async with self._receive:
+                    async for command in self._receive:
+                        batch = [command]
+                        while len(batch) < self.max_batch:
+                            try:
+                                batch.append(self._receive.receive_nowait())
+                            except (anyio.WouldBlock, anyio.EndOfStream):
+                                break
+                        with _COMMIT_SECONDS.time():
+                            await self._commit(batch)
+                        _BATCH_SIZE.observe(len(batch))
+                tg.cancel_scope.cancel()
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self.search_index.save()
+                await self.history.save()
+                await self.stats.save()
+            self._stopped.set()
+
+    async def aclose(self) -> None:
+        """Stop accepting commands and wait until the writer has drained its queue."""
+        await self._send.aclose()
+        await self._stopped.wait()
+
+    async def _load_search_index(self, tasks: List[Task]) -> None:
+        """Load the persisted search index and re-index what changed since."""
+        await self.search_index.load()
+        mtimes = await anyio.to_thread.run_sync(self.descriptions.modified_times)
+        stale = self.search_index.reconcile(tasks, mtimes)
+        for task_id in stale:
+            description = await self.descriptions.load_description(task_id)
+            self.search_index.index_description(
+                task_id, description or "", mtimes.get(task_id, 0)
+            )
+        logger.debug(
+            "Search index ready with %d tasks, %d descriptions re-indexed",
+            len(self.search_index),
+            len(stale),
+        )
+
+    def _update_search_index(
+        self, snapshot: TaskSnapshot, changes: List[TaskChange]
+    ) -> None:
+        renamed: dict[str, Task] = {}
+        for change in changes:
+            if change.after is None:
+                renamed.pop(change.before.id, None)
+                self.search_index.remove(change.before.id)
+            elif change.before is None or change.before.task != change.after.task:
+                renamed[change.after.id] = change.after
+        self.search_index.index_names(list(renamed.values()))
+
+    def _update_short_ids(
+        self, snapshot: TaskSnapshot, changes: List[TaskChange]
+    ) -> None:
+        for change in changes:
+            if change.after is None:
+                self.short_ids.remove(change.before.id)
+            elif change.before is None:
+                self.short_ids.add(change.after.id)
+
+    def _update_views(self, snapshot: TaskSnapshot, changes: List[TaskChange]) -> None:
+        final = _final_states(changes)
+        upserts = [task for task in final.values() if task is not None]
+        removals = [task_id for task_id, task in final.items() if task is None]
+        for view in self.views.values():
+            view.update(upserts, removals)
+
+    def _update_tags(self, snapshot: TaskSnapshot, changes: List[TaskChange]) -> None:
+        for change in changes:
+            before = change.before.tags if change.before else []
+            after = change.after.tags if change.after else []
+            if before != after:
+                self.tags.update((change.after or change.before).id, before, after)
+
+    def _update_tree(self, snapshot: TaskSnapshot, changes: List[TaskChange]) -> None:
+        for change in changes:
+            self.tree.update(
+                (change.after or change.before).id, change.before, change.after
+            )
+
+    def _update_stats(self, snapshot: TaskSnapshot, changes: List[TaskChange]) -> None:
+        now = datetime.now()
+        for change in changes:
+            self.stats.update(change.before, change.after, now)
+
+    def _view(self, order: str) -> SortedTasks:
+        """Return the sorted view for `order`, building it on first use."""
+        view = self.views.get(order)
+        if view is None:
+            if order not in SORT_KEYS:
+                raise ValueError(f"Unknown sort order: {order}")
+            view = SortedTasks(self.snapshot.tasks.values(), SORT_KEYS[order])
+            self.views[order] = view
+        return view
+
+    async def _commit(self, batch: list[_Command]) -> None:
+        tx = _Transaction(self.snapshot.tasks, self.tree)
+        checkpoint = self.history.checkpoint()
+        for command in batch:
+            mark = len(tx.changes)
+            try:
+                command.result = command.apply(tx)
+            except Exception as e:
+                tx.rollback_to(mark)
+                command.error = e
+            else:
+                if command.label and len(tx.changes) > mark:
+                    self.history.record(
+                        command.label, ((c.before, c.after) for c in tx.changes[mark:])
+                    )
+
+        try:
+            if tx.changes:
+                await self.store.save_all(tx.tasks.values())
+                self.snapshot = TaskSnapshot(
+                    version=self.snapshot.version + 1,
+                    tasks=MappingProxyType(tx.tasks),
+                )
+                _CHANGES.inc(len(tx.changes))
+                # The changes are committed now: a failing listener must not
+                # report them as failed to the clients that made them
+                for listener in self._listeners:
+                    try:
+                        listener(self.snapshot, tx.changes)
+                    except Exception:
+                        logger.exception("Commit listener %r failed", listener)
+        except Exception as e:
+            logger.exception("Failed to commit task changes")
+            self.history.restore(checkpoint)
+            for command in batch:
+                command.error = command.error or e
+        finally:
+            for command in batch:
+                command.done.set()
+
+    async def _submit(
+        self, apply: Callable[[_Transaction], T], label: Optional[str] = None
+    ) -> T:
+        """
+        Queue a mutation for the writer and wait until it is committed.
+
+        With a `label`, the mutation is recorded in the history and can be undone.
+        """
+        command = _Command(apply=apply, done=anyio.Event(), label=label)
+        await self._send.send(command)
+        await command.done.wait()
+        if command.error is not None:
+            raise command.error
+        return command.result
 
     async def list_tasks(self) -> List[Task]:
         """Get a list of all tasks."""
-        return await self.store.load_all()
+        return list(self.snapshot.tasks.values())
+
+    async def list_page(
+        self,
+        order: str = "default",
+        offset: int = 0,
+        limit: Optional[int] = None,
+        tag_filter: Optional[str] = None,
+    ) -> TaskPage:
+        """
+        Get `limit` tasks after skipping `offset`, in the given sort order.
+
+        With a `tag_filter` expression (see `rsd.api.tag_filter`), only matching
+        tasks are listed. Raises ValueError for an invalid order or filter.
+        """
+        view = self._view(order)
+        if tag_filter:
+            expr = parse_tag_filter(tag_filter)
+            ids = self.tags.select(expr, self.snapshot.tasks.keys())
+            tasks, total = view.subset(ids, offset, limit), len(ids)
+        else:
+            tasks, total = view.page(offset, limit), len(view)
+        return self._page(tasks, total, offset)
+
+    async def list_children(
+        self,
+        parent: Optional[Id] = None,
+        order: str = "default",
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> TaskPage:
+        """
+        Get a page of the subtasks of `parent`, or of the top-level tasks if None.
+
+        Only direct children are listed; their own subtasks show in `progress`.
+        Raises ValueError for an invalid order.
+        """
+        view = self._view(order)
+        ids = self.tree.children(parent.id if parent else None)
+        return self._page(view.subset(ids, offset, limit), len(ids), offset)
+
+    def _page(self, tasks: List[Task], total: int, offset: int) -> TaskPage:
+        """Build a page, with the short IDs and subtask progress of its tasks."""
+        progress = {}
+        for task in tasks:
+            done, count = self.tree.progress(task.id)
+            if count:
+                progress[task.id] = (done, count)
+        return TaskPage(
+            tasks=tasks,
+            total=total,
+            offset=offset,
+            short_ids={t.id: self.short_ids.short_id(t.id) for t in tasks},
+            progress=progress,
+        )
+
+    async def task_id_at(self, index: int, order: str = "default") -> Id:
+        """Get the ID of the task at a 1-based list index in the given order."""
+        view = self._view(order)
+        if not (1 <= index <= len(view)):
+            raise IndexError(f"Index {index} is out of range (1..{len(view)})")
+        return Id(view[index - 1].id)
 
     async def get_task(self, task_id: Id) -> Optional[Task]:
         """Get a single task by ID."""
-        return await self.store.load(task_id.id)
+        return self.snapshot.tasks.get(task_id.id)
+
+    async def resolve_id(self, prefix: str) -> Id:
+        """
+        Resolve a short ID (any unique prefix of a task ID) to the full ID.
+
+        Raises:
+            UnknownIdError: No task ID starts with `prefix`.
+            AmbiguousIdError: Several task IDs start with `prefix`.
+        """
+        return Id(self.short_ids.resolve(prefix))
 
     async def add_task(self, task: Task) -> None:
-        """Add a new task."""
-        await self.store.save(task)
+        """
+        Add a new task. A recurring task's first occurrence defaults to one
+        interval from now.
+
+        Raises ValueError if the task's parent does not exist.
+        """
+        task = _added(task)
+
+        def apply(tx: _Transaction) -> None:
+            tx.check_parent(task.id, task.parent)
+            tx.put(task)
+
+        await self._submit(apply, label="add")
+
+    async def import_tasks(self, records: Sequence[Record]) -> int:
+        """
+        Add (or replace, by ID) many tasks as one operation; return their count.
+
+        The tasks are committed together, so the store is written once. Their
+        descriptions, if any, are saved afterwards. Raises ValueError, importing
+        nothing, if a task's parent is neither imported nor already there.
+        """
+        tasks = [_added(task) for task, _ in records]
+
+        def apply(tx: _Transaction) -> None:
+            for task in tasks:
+                tx.put(task)
+            for task in tasks:
+                tx.check_parent(task.id, task.parent)
+
+        await self._submit(apply, label="import")
+        descriptions = {task.id: text for task, text in records if text is not None}
+        if descriptions:
+            await self.descriptions.save_descriptions(descriptions)
+            for task_id, text in descriptions.items():
+                self.search_index.index_description(
+                    task_id, text, self.descriptions.modified_time(task_id)
+                )
+        logger.debug(
+            "Imported %s tasks, %s descriptions", len(tasks), len(descriptions)
+        )
+        return len(tasks)
+
+    async def export_page(
+        self, offset: int = 0, limit: Optional[int] = None, descriptions: bool = False
+    ) -> List[Record]:
+        """
+        Get `limit` tasks after skipping `offset` in default order, for export.
+
+        With `descriptions`, each task comes with its description, if it has one.
+        """
+        records: List[Record] = []
+        for task in self._view("default").page(offset, limit):
+            text = None
+            if descriptions and self.descriptions.modified_time(task.id):
+                text = await self.descriptions.load_description(task.id)
+            records.append((task, text or None))
+        return records
 
     async def update_task(self, task: Task) -> None:
-        """Update an existing task."""
-        await self.store.save(task)
+        """Update an existing task. Raises ValueError for an invalid parent."""
+
+        def apply(tx: _Transaction) -> None:
+            before = tx.get(task.id)
+            if before is None or before.parent != task.parent:
+                tx.check_parent(task.id, task.parent)
+            tx.put(task)
+
+        await self._submit(apply, label="update")
+
+    async def set_parent(self, task_id: Id, parent: Optional[Id]) -> None:
+        """
+        Make a task a subtask of `parent`, or a top-level task if None.
+
+        Raises ValueError if `parent` does not exist or is the task itself or
+        one of its subtasks.
+        """
+
+        def apply(tx: _Transaction) -> None:
+            task = tx.get(task_id.id)
+            new_parent = parent.id if parent else None
+            if task and task.parent != new_parent:
+                tx.check_parent(task.id, new_parent)
+                tx.put(replace(task, parent=new_parent))
+
+        await self._submit(apply, label="move")
 
     async def delete_task(self, task_id: Id) -> None:
-        """Delete a task by ID."""
-        await self.store.delete(task_id.id)
+        """Delete a task by ID, with all of its subtasks."""
+
+        def apply(tx: _Transaction) -> None:
+            for child in reversed(tx.descendants(task_id.id)):
+                tx.delete(child)
+            tx.delete(task_id.id)
+
+        await self._submit(apply, label="delete")
 
     async def mark_done(self, task_id: Id) -> None:
-        """Mark a task as done."""
-        task = await self.get_task(task_id)
-        if task and not task.done:
-            task.done = True
-            task.completed = task.completed or task.created
-            await self.update_task(task)
+        """
+        Mark a task as done, or move a recurring task to its next occurrence.
+
+        Marking a task done also completes its open subtasks.
+        """
+
+        def apply(tx: _Transaction) -> None:
+            task = tx.get(task_id.id)
+            if task and not task.done:
+                self._complete(tx, task)
+
+        await self._submit(apply, label="done")
 
     async def mark_not_done(self, task_id: Id) -> None:
         """Mark a task as not done."""
-        task = await self.get_task(task_id)
-        if task and task.done:
-            task.done = False
-            task.completed = None
-            await self.update_task(task)
+
+        def apply(tx: _Transaction) -> None:
+            task = tx.get(task_id.id)
+            if task and task.done:
+                tx.put(replace(task, done=False, completed=None))
+
+        await self._submit(apply, label="not-done")
 
     async def toggle_done(self, task_id: Id) -> None:
         """Toggle the task's done state."""
-        task = await self.get_task(task_id)
-        if task:
-            task.done = not task.done
-            task.completed = task.completed or task.created if task.done else None
-            await self.update_task(task)
+
+        def apply(tx: _Transaction) -> None:
+            task = tx.get(task_id.id)
+            if task and task.done:
+                tx.put(replace(task, done=False, completed=None))
+            elif task:
+                self._complete(tx, task)
+
+        await self._submit(apply, label="toggle")
+
+    @staticmethod
+    def _complete(tx: _Transaction, task: Task) -> None:
+        """Complete a task, and its open subtasks if that marks it done."""
+        completed = _completed(task)
+        tx.put(completed)
+        if not completed.done:
+            return  # a recurring task moved on; its subtasks stay as they are
+        for child_id in tx.descendants(task.id):
+            child = tx.tasks[child_id]
+            if not child.done:
+                tx.put(_completed(child))
 
     async def pin_task(self, task_id: Id) -> None:
         """Pin a task."""
-        task = await self.get_task(task_id)
-        if task and not task.pinned:
-            task.pinned = True
-            await self.update_task(task)
+
+        def apply(tx: _Transaction) -> None:
+            task = tx.get(task_id.id)
+            if task and not task.pinned:
+                tx.put(replace(task, pinned=True))
+
+        await self._submit(apply, label="pin")
 
     async def unpin_task(self, task_id: Id) -> None:
         """Unpin a task."""
-        task = await self.get_task(task_id)
-        if task and task.pinned:
-            task.pinned = False
-            await self.update_task(task)
+
+        def apply(tx: _Transaction) -> None:
+            task = tx.get(task_id.id)
+            if task and task.pinned:
+                tx.put(replace(task, pinned=False))
+
+        await self._submit(apply, label="unpin")
 
     async def rename_task(self, task_id: Id, new_name: str) -> None:
         """Rename a task."""
-        task = await self.get_task(task_id)
-        if task:
-            task.task = new_name
-            await self.update_task(task)
+
+        def apply(tx: _Transaction) -> None:
+            task = tx.get(task_id.id)
+            if task:
+                tx.put(replace(task, task=new_name))
+
+        await self._submit(apply, label="rename")
+
+    async def undo(self) -> Optional[HistoryEntry]:
+        """
+        Revert the last operation in the history; return it, or None if there is
+        nothing to undo.
+
+        Raises:
+            HistoryConflictError: The tasks it changed were changed again since
+                (e.g. by editing the store while the daemon was stopped). The
+                operation is then dropped from the history.
+        """
+
+        def apply(tx: _Transaction) -> Optional[HistoryEntry]:
+            operation = self.history.last()
+            if operation is None:
+                return None
+            self._rewind(tx, operation, undo=True)
+            self.history.undo()
+            return operation.entry(undone=True)
+
+        return await self._submit(apply)
+
+    async def redo(self) -> Optional[HistoryEntry]:
+        """
+        Re-apply the last undone operation; return it, or None if there is none.
+
+        Raises:
+            HistoryConflictError: As for `undo`.
+        """
+
+        def apply(tx: _Transaction) -> Optional[HistoryEntry]:
+            operation = self.history.last_undone()
+            if operation is None:
+                return None
+            self._rewind(tx, operation, undo=False)
+            self.history.redo()
+            return operation.entry()
+
+        return await self._submit(apply)
+
+    def _rewind(self, tx: _Transaction, operation: Operation, undo: bool) -> None:
+        """Write back one side of an operation's changes, if the other still holds."""
+        for before, after in operation.changes:
+            current, expected = tx.get((after or before).id), after if undo else before
+            if current != expected:
+                self.history.discard(operation)
+                raise HistoryConflictError(
+                    f"Cannot {'undo' if undo else 'redo'} {operation.label} "
+                    f"#{operation.id}: {(after or before).task!r} has changed since"
+                )
+        for before, after in operation.changes:
+            tx.set((after or before).id, before if undo else after)
+
+    async def get_stats(self) -> TaskStats:
+        """Get task counts and recent completions, without scanning the tasks."""
+        return self.stats.stats(datetime.now())
+
+    def cache_sizes(self) -> dict[str, int]:
+        """Return the number of entries in each in-memory structure."""
+        return {
+            "tasks": len(self.snapshot.tasks),
+            "short_ids": len(self.short_ids),
+            **{f"views.{order}": len(view) for order, view in self.views.items()},
+            "search_index.tasks": len(self.search_index),
+            "search_index.terms": self.search_index.term_count(),
+            "tags": len(self.tags),
+            "tree.nodes": len(self.tree),
+            "history.operations": len(self.history),
+        }
+
+    async def history_entries(self, limit: Optional[int] = None) -> List[HistoryEntry]:
+        """Summarize recent operations, newest first, undone ones included."""
+        return self.history.entries(limit)
 
     async def get_description(self, task_id: Id) -> Optional[str]:
         """Get the description for a task."""
-        return await self.store.load_description(task_id.id)
+        return await self.descriptions.load_description(task_id.id)
 
     async def set_description(self, task_id: Id, description: str) -> None:
         """Set the description for a task."""
-        await self.store.save_description(task_id.id, description)
+        await self.descriptions.save_description(task_id.id, description)
+        self.search_index.index_description(
+            task_id.id, description, self.descriptions.modified_time(task_id.id)
+        )
+
+    async def search(self, query: str, limit: int = 20) -> List[tuple[Task, float]]:
+        """Return up to `limit` tasks matching `query`, best match first."""
+        tasks = self.snapshot.tasks
+        return [
+            (tasks[task_id], score)
+            for task_id, score in self.search_index.search(query, limit)
+            if task_id in tasks
+        ]
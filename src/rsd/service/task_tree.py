@@ -0,0 +1,100 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Subtask tree for the ReadySetDone daemon.
+
+Indexes every task under its parent (top-level tasks under None), and caches
+for every task with subtasks how many open and done tasks its subtree holds.
+A committed change only adjusts the counts along the changed task's path to
+the root, so it costs O(depth), and a task's children or its "3/7 done"
+progress are looked up in O(1), however large the tree is.
+
+A task may name a parent that is not there (yet), e.g. while an undo puts a
+deleted subtree back child first. It is indexed under that ID anyway, and
+counted towards its parent once the parent is added.
+"""
+
+from typing import AbstractSet, Iterable, Optional
+
+from rsd.api.types import Task
+
+
+class TaskTree:
+    def __init__(self, tasks: Iterable[Task] = ()) -> None:
+        self._nodes: dict[str, tuple[Optional[str], bool]] = {}  # (parent, done)
+        self._children: dict[Optional[str], set[str]] = {None: set()}
+        self._counts: dict[str, list[int]] = {}  # [open, done] below a task
+        for task in tasks:
+            self.update(task.id, None, task)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def children(self, task_id: Optional[str]) -> AbstractSet[str]:
+        """Return the IDs of a task's children, or of top-level tasks for None."""
+        return self._children.get(task_id, frozenset())
+
+    def progress(self, task_id: str) -> tuple[int, int]:
+        """Return how many of a task's subtasks, at any depth, are done and exist."""
+        open_, done = self._counts.get(task_id, (0, 0))
+        return done, open_ + done
+
+    def update(
+        self, task_id: str, before: Optional[Task], after: Optional[Task]
+    ) -> None:
+        """Move a task from its `before` state to its `after` state (None if absent)."""
+        if (
+            before is not None
+            and after is not None
+            and before.parent == after.parent
+            and before.done == after.done
+        ):
+            return
+        if before is not None:
+            self._adjust(task_id, before.parent, before.done, -1)
+            siblings = self._children.get(before.parent)
+            if siblings is not None:
+                siblings.discard(task_id)
+                if not siblings and before.parent is not None:
+                    del self._children[before.parent]
+            del self._nodes[task_id]
+            if after is None:
+                self._counts.pop(task_id, None)
+        if after is not None:
+            if before is None:
+                self._count_children(task_id)
+            self._nodes[task_id] = (after.parent, after.done)
+            self._children.setdefault(after.parent, set()).add(task_id)
+            self._adjust(task_id, after.parent, after.done, 1)
+
+    def _count_children(self, task_id: str) -> None:
+        """Compute the counts of a task whose children were added before it."""
+        counts = [0, 0]
+        for child in self._children.get(task_id, ()):
+            child_open, child_done = self._counts.get(child, (0, 0))
+            done = self._nodes[child][1]
+            counts[0] += child_open + (not done)
+            counts[1] += child_done + done
+        if counts != [0, 0]:
+            self._counts[task_id] = counts
+
+    def _adjust(
+        self, task_id: str, parent: Optional[str], done: bool, sign: int
+    ) -> None:
+        """Add (or, with a negative sign, remove) a subtree to its ancestors' counts."""
+        open_, done_below = self._counts.get(task_id, (0, 0))
+        delta_open = sign * (open_ + (not done))
+        delta_done = sign * (done_below + done)
+        ancestor = parent
+        # Bounded walk, so a cycle in a hand-edited store cannot hang the daemon
+        for _ in range(len(self._nodes)):
+            node = self._nodes.get(ancestor) if ancestor is not None else None
+            if node is None:
+                return
+            counts = self._counts.setdefault(ancestor, [0, 0])
+            counts[0] += delta_open
+            counts[1] += delta_done
+            if counts == [0, 0]:
+                del self._counts[ancestor]
+            ancestor = node[0]
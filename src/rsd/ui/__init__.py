@@ -3,17 +3,21 @@
 
 """
 Factory module for selecting and initializing the appropriate UI backend.
+
+Backends are imported on demand, so only the selected one is ever loaded.
 """
 
-from .cli.cli import CliUI
-from .tui.tui import TuiUI
 from .ui import UI
 
 
 def get_ui(mode: str = "cli", ui_type: str = "plain"):
     if mode == "cli":
+        from .cli.cli import CliUI
+
         return CliUI(ui_type)
     elif mode == "tui":
+        from .tui.tui import TuiUI
+
         return TuiUI(ui_type)
     raise ValueError(f"Unknown mode: {mode}")
 
@@ -7,14 +7,19 @@ CLI subset interface and dispatcher for ReadySetDone.
 
 from rsd.ui.ui import UI
 
-from .plain_cli import PlainCli
-from .rich_cli import RichCli
-
 
 class CliUI:
     def __new__(cls, ui_type: str = "plain") -> UI:
         if ui_type == "plain":
+            from .plain_cli import PlainCli
+
             return PlainCli()
         elif ui_type == "rich":
+            from .rich_cli import RichCli
+
             return RichCli()
+        elif ui_type in ("jsonl", "tsv", "ids"):
+            from .format_cli import FormatCli
+
+            return FormatCli(ui_type)
         raise ValueError(f"Unknown CLI UI type: {ui_type}")
@@ -0,0 +1,158 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+"""
+Machine-readable CLI renderers for ReadySetDone.
+
+Each format writes exactly one line per task, in the order served by the
+daemon, straight to stdout in buffered chunks. Nothing here imports Rich, so piping
+`rsd list` into other tools costs little more than the serialization itself.
+
+Formats:
+- jsonl: one JSON object per task, in the API's serialized form
+- tsv:   index, id, done, pinned, created, due, task (tabs and newlines in
+         the task name are replaced by spaces)
+- ids:   one task ID per line
+
+History entries are written as JSON objects (jsonl), as id, time, label,
+count, undone and task names (tsv), or as operation numbers (ids).
+
+Statistics are written as one JSON object (jsonl), or as one name and value
+per line followed by one "completed_daily"/"completed_hourly", bucket and
+count line per histogram bucket (tsv).
+
+Metrics and memory reports are written as one JSON object (jsonl), as served
+by the daemon.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from rsd.api.serialize import history_entry_to_dict, stats_to_dict, task_to_dict
+from rsd.api.types import HistoryEntry, Task, TaskPage, TaskStats
+from rsd.ui.ui import UI
+
+_CHUNK_SIZE = 512  # lines joined per write
+
+
+def _jsonl(index: int, task: Task) -> str:
+    return json.dumps(task_to_dict(task), ensure_ascii=False) + "\n"
+
+
+def _tsv(index: int, task: Task) -> str:
+    def dt(val: Optional[datetime]) -> str:
+        return val.isoformat() if isinstance(val, datetime) else ""
+
+    name = task.task.replace("\t", " ").replace("\n", " ")
+    return (
+        f"{index}\t{task.id}\t{int(task.done)}\t{int(task.pinned)}\t"
+        f"{dt(task.created)}\t{dt(task.due)}\t{name}\n"
+    )
+
+
+def _ids(index: int, task: Task) -> str:
+    return task.id + "\n"
+
+
+FORMATTERS: dict[str, Callable[[int, Task], str]] = {
+    "jsonl": _jsonl,
+    "tsv": _tsv,
+    "ids": _ids,
+}
+
+
+def write_lines(lines: Iterable[str]) -> None:
+    """Write lines to stdout in chunks, stopping quietly if the reader goes away."""
+    out = sys.stdout
+    chunk: list[str] = []
+    try:
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) >= _CHUNK_SIZE:
+                out.write("".join(chunk))
+                chunk.clear()
+        out.write("".join(chunk))
+        out.flush()
+    except BrokenPipeError:
+        # The reader (e.g. `head`) exited early. Point stdout at /dev/null so
+        # the interpreter does not fail again while flushing it on exit.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, out.fileno())
+
+
+class FormatCli(UI):
+    def __init__(self, fmt: str):
+        if fmt not in FORMATTERS:
+            raise ValueError(f"Unknown output format: {fmt}")
+        self.format = fmt
+
+    def render(
+        self,
+        page: TaskPage,
+        color: bool = False,
+        metadata: bool = False,
+        pager: bool = False,
+    ) -> None:
+        """Write one line per task in the selected format."""
+        formatter = FORMATTERS[self.format]
+        write_lines(
+            formatter(index, task)
+            for index, task in enumerate(page.tasks, start=page.offset + 1)
+        )
+
+    def render_search(
+        self, results: list[tuple[Task, float]], color: bool = False
+    ) -> None:
+        """Write one line per result, best match first; the index is the rank."""
+        formatter = FORMATTERS[self.format]
+        write_lines(
+            formatter(rank, task) for rank, (task, _) in enumerate(results, start=1)
+        )
+
+    def render_history(self, entries: list[HistoryEntry], color: bool = False) -> None:
+        """Write one line per operation, newest first."""
+
+        def line(entry: HistoryEntry) -> str:
+            if self.format == "jsonl":
+                return json.dumps(history_entry_to_dict(entry), ensure_ascii=False)
+            if self.format == "ids":
+                return str(entry.id)
+            names = "; ".join(entry.tasks).replace("\t", " ").replace("\n", " ")
+            return (
+                f"{entry.id}\t{entry.time.isoformat()}\t{entry.label}\t"
+                f"{entry.count}\t{int(entry.undone)}\t{names}"
+            )
+
+        write_lines(line(entry) + "\n" for entry in entries)
+
+    def render_stats(self, stats: TaskStats, color: bool = False) -> None:
+        """Write task counts and completion histograms."""
+        data = stats_to_dict(stats)
+        if self.format == "jsonl":
+            write_lines([json.dumps(data) + "\n"])
+            return
+        histograms = {
+            name: data.pop(name) for name in ("completed_daily", "completed_hourly")
+        }
+        write_lines(
+            [f"{name}\t{value}\n" for name, value in data.items()]
+            + [
+                f"{name}\t{bucket}\t{count}\n"
+                for name, buckets in histograms.items()
+                for bucket, count in buckets.items()
+            ]
+        )
+
+    def render_metrics(self, snapshot: dict[str, dict], color: bool = False) -> None:
+        """Write the daemon's metrics snapshot as one JSON object."""
+        write_lines([json.dumps(snapshot) + "\n"])
+
+    def render_memory(self, report: dict, color: bool = False) -> None:
+        """Write the daemon's memory report as one JSON object."""
+        write_lines([json.dumps(report) + "\n"])
+
+    def render_description(self, description: str) -> None:
+        write_lines([description or ""])
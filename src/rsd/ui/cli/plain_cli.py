@@ -5,10 +5,96 @@
 Plain CLI renderer for ReadySetDone.
 """
 
-from rsd.ui.ui import UI
+from datetime import datetime
+
+from rsd.api.types import HistoryEntry, Task, TaskPage, TaskStats
+from rsd.ui.ui import (
+    UI,
+    daily_completions,
+    history_summary,
+    memory_rows,
+    metric_rows,
+    progress_suffix,
+    status_mark,
+    tag_suffix,
+)
+
+from .format_cli import write_lines
 
 
 class PlainCli(UI):
-    def render(self, data):
-        for item in data:
-            print(f"- {item}")
+    def render(
+        self,
+        page: TaskPage,
+        color: bool = False,
+        metadata: bool = False,
+        pager: bool = False,
+    ) -> None:
+        """Render a page of tasks as plain text, one line per task."""
+        width = len(str(page.offset + len(page.tasks)))
+
+        def line(index: int, task: Task) -> str:
+            created = (
+                f"  ({task.created:%b %d %Y %H:%M})"
+                if metadata and isinstance(task.created, datetime)
+                else ""
+            )
+            return (
+                f"{index:>{width}} {status_mark(task)} "
+                f"{task.task}{progress_suffix(page.progress.get(task.id))}"
+                f"{tag_suffix(task)}{created}\n"
+            )
+
+        write_lines(
+            line(index, task)
+            for index, task in enumerate(page.tasks, start=page.offset + 1)
+        )
+
+    def render_search(
+        self, results: list[tuple[Task, float]], color: bool = False
+    ) -> None:
+        """Render search results as plain text, best match first."""
+        width = len(str(len(results)))
+        write_lines(
+            f"{rank:>{width}} {status_mark(task)} {task.task}\n"
+            for rank, (task, _) in enumerate(results, start=1)
+        )
+
+    def render_history(self, entries: list[HistoryEntry], color: bool = False) -> None:
+        """Render recent operations as plain text, newest first."""
+        write_lines(
+            f"#{entry.id} {entry.time:%b %d %H:%M} {history_summary(entry)}"
+            f"{' (undone)' if entry.undone else ''}\n"
+            for entry in entries
+        )
+
+    def render_stats(self, stats: TaskStats, color: bool = False) -> None:
+        """Render task counts, then completions per day for the last week."""
+        counts = [
+            ("open", stats.open),
+            ("done", stats.done),
+            ("total", stats.total),
+            ("due", stats.due),
+            ("overdue", stats.overdue),
+            ("pinned", stats.pinned),
+            ("recurring", stats.recurring),
+            ("subtasks", stats.subtasks),
+        ]
+        write_lines(
+            [f"{name}: {value}\n" for name, value in counts]
+            + [
+                f"completed {day.isoformat()}: {count}\n"
+                for day, count in daily_completions(stats, 7)
+            ]
+        )
+
+    def render_metrics(self, snapshot: dict[str, dict], color: bool = False) -> None:
+        """Render the daemon's metrics as plain text, one per line."""
+        write_lines(f"{key} {value}\n" for key, value in metric_rows(snapshot))
+
+    def render_memory(self, report: dict, color: bool = False) -> None:
+        """Render the daemon's memory report as plain text, one value per line."""
+        write_lines(f"{key} {value}\n" for key, value in memory_rows(report))
+
+    def render_description(self, description: str) -> None:
+        write_lines([description or ""])
@@ -3,65 +3,265 @@
 
 """
 Rich CLI renderer for ReadySetDone.
+
+Tasks are rendered as a stream of chunks of pre-laid-out lines, so the first rows
+appear right away and memory stays bounded however long the list is. Column
+widths are computed from a bounded sample of the rows. When stdout is a
+terminal, output is piped through a pager (`$PAGER`, or `less` which exits
+immediately when everything fits on one screen).
 """
 
+import os
+import shlex
+import subprocess
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import islice
+from typing import Iterator
 
+from rich.cells import cell_len
 from rich.console import Console
-from rich.table import Table
 from rich.text import Text
 
-from rsd import __version__
-from rsd.api.sorting import default_sort_key, sort_tasks
-from rsd.api.types import Task
-from rsd.ui.ui import UI
+import rsd
+from rsd.api.types import HistoryEntry, Task, TaskPage, TaskStats
+from rsd.ui.ui import (
+    UI,
+    daily_completions,
+    history_summary,
+    memory_rows,
+    metric_rows,
+    progress_suffix,
+    status_mark,
+    tag_suffix,
+)
+
+_SAMPLE_SIZE = 200  # rows used to compute column widths
+_CHUNK_SIZE = 64  # rows rendered per chunk
+_CREATED_FORMAT = "%b %d %Y %H:%M"
+_DEFAULT_PAGER = "less -FRX"
+_STATS_DAYS = 14  # days shown in the completion chart
+_BARS = " ▁▂▃▄▅▆▇█"
 
 
 class RichCli(UI):
     def __init__(self):
         self.console = Console()
+        self.version = rsd.__version__
+
+    def render(
+        self,
+        page: TaskPage,
+        color: bool,
+        metadata: bool = False,
+        pager: bool = True,
+    ):
+        """
+        Render a page of tasks using Rich formatting.
+
+        Args:
+            page: Tasks to render, already sorted by the daemon.
+            color: Whether to style the output.
+            metadata: Whether to show the creation date column.
+            pager: Whether to page the output when stdout is a terminal.
+        """
 
-    def render(self, tasks: list[Task], color: bool, metadata: bool = False):
-        """Render a list of tasks using Rich formatting."""
-        sorted_tasks = sort_tasks(tasks, key=default_sort_key)
+        with self._output(pager and self.console.is_terminal, color) as console:
+            try:
+                # Header: Title + version
+                header = Text.assemble(
+                    ("ReadySetDone ", "bold" if color else ""),
+                    (f"v{self.version}", "dim" if color else ""),
+                )
+                console.print(header, justify="left")
+                console.print("\n")
+                self._render_rows(console, page, color, metadata)
+                console.print("\n")
+            except BrokenPipeError:
+                pass  # the pager was closed before all rows were written
 
-        # Header: Title + version
-        header = Text.assemble(
-            ("ReadySetDone ", "bold" if color else ""),
-            (f"v{__version__}", "dim" if color else ""),
+    def _render_rows(
+        self,
+        console: Console,
+        page: TaskPage,
+        color: bool,
+        metadata: bool,
+    ) -> None:
+        """
+        Render rows chunk by chunk as pre-laid-out lines.
+
+        Column widths come from a sample of the rows, so each row is formatted
+        on its own instead of laying out one table over every row.
+        """
+        tasks, ids, progress = page.tasks, page.short_ids, page.progress
+        index_width = len(str(page.offset + len(tasks)))
+        id_width = max((len(ids.get(task.id, "")) for task in tasks), default=0)
+        created_width = len(datetime.min.strftime(_CREATED_FORMAT))
+        # index, short ID, checkbox and the gaps around them
+        prefix_width = index_width + id_width + 4
+        suffix_width = created_width + 1 if metadata else 0
+        sample_width = max(
+            (
+                cell_len(task.task)
+                + cell_len(tag_suffix(task))
+                + cell_len(progress_suffix(progress.get(task.id)))
+                for task in islice(tasks, _SAMPLE_SIZE)
+            ),
+            default=0,
+        )
+        task_width = max(
+            1, min(sample_width, console.width - prefix_width - suffix_width)
         )
-        self.console.print(header, justify="left")
+        dim = "dim" if color else ""
+
+        rows = enumerate(tasks, start=page.offset + 1)
+        while chunk := list(islice(rows, _CHUNK_SIZE)):
+            lines = Text()
+            for index, task in chunk:
+                name = Text(task.task, style="bold" if color and task.pinned else "")
+                if task.id in progress:
+                    name.append(progress_suffix(progress[task.id]), style=dim)
+                if task.tags:
+                    name.append(tag_suffix(task), style=dim)
+                wrapped = (
+                    name.wrap(console, task_width)
+                    if name.cell_len > task_width
+                    else [name]
+                )
+
+                lines.append(str(index).rjust(index_width), style=dim)
+                lines.append(" ")
+                lines.append(
+                    ids.get(task.id, "").ljust(id_width), style="cyan" if color else ""
+                )
+                lines.append(f" {status_mark(task)} ")
+                for n, part in enumerate(wrapped):
+                    if n:
+                        lines.append("\n" + " " * prefix_width)
+                    lines.append_text(part)
+                    if metadata and n == 0:
+                        lines.append(" " * (task_width - part.cell_len + 1))
+                        lines.append(_created(task).rjust(created_width), style=dim)
+                lines.append("\n")
+            console.print(lines, end="", overflow="ignore", crop=False)
 
-        table = Table.grid(padding=(0, 1))
-        table.add_column(
-            "#", style="dim" if color else "", justify="right", no_wrap=True
+    def render_search(self, results: list[tuple[Task, float]], color: bool) -> None:
+        """Render search results, best match first, with their relevance score."""
+        if not results:
+            self.console.print("No matching tasks", style="dim" if color else "")
+            return
+        dim = "dim" if color else ""
+        width = len(str(len(results)))
+        lines = Text()
+        for rank, (task, score) in enumerate(results, start=1):
+            lines.append(str(rank).rjust(width), style=dim)
+            lines.append(f" {status_mark(task)} ")
+            lines.append(task.task, style="bold" if color and task.pinned else "")
+            lines.append(f"  {score:.2f}\n", style=dim)
+        self.console.print(lines, end="")
+
+    def render_history(self, entries: list[HistoryEntry], color: bool) -> None:
+        """Render recent operations, newest first; undone ones are dimmed."""
+        if not entries:
+            self.console.print("Nothing to undo", style="dim" if color else "")
+            return
+        dim = "dim" if color else ""
+        width = max(len(str(entry.id)) for entry in entries) + 1
+        lines = Text()
+        for entry in entries:
+            style = dim if entry.undone else ""
+            lines.append(f"#{entry.id}".rjust(width), style=dim)
+            lines.append(f" {entry.time:%b %d %H:%M} ", style=dim)
+            lines.append(history_summary(entry), style=style)
+            lines.append(" (undone)\n" if entry.undone else "\n", style=dim)
+        self.console.print(lines, end="")
+
+    def render_stats(self, stats: TaskStats, color: bool) -> None:
+        """Render task counts and a chart of completions over the last two weeks."""
+        dim = "dim" if color else ""
+        days = daily_completions(stats, _STATS_DAYS)
+        rows = [
+            ("Open", f"{stats.open}", f"of {stats.total}"),
+            ("Done", f"{stats.done}", ""),
+            ("Due", f"{stats.due}", f"{stats.overdue} overdue"),
+            ("Pinned", f"{stats.pinned}", ""),
+            ("Recurring", f"{stats.recurring}", ""),
+            ("Subtasks", f"{stats.subtasks}", ""),
+            (
+                "Completed",
+                f"{days[-1][1]}",
+                f"today, {sum(n for _, n in days[-7:])} in 7 days",
+            ),
+        ]
+        value_width = max(len(value) for _, value, _ in rows)
+        lines = Text()
+        for label, value, note in rows:
+            lines.append(f"{label:<10} ", style=dim)
+            lines.append(value.rjust(value_width), style="bold" if color else "")
+            lines.append(f" {note}\n" if note else "\n", style=dim)
+
+        peak = max((n for _, n in days), default=0)
+        # Any completion shows as at least the lowest bar
+        chart = "".join(
+            _BARS[-(-n * (len(_BARS) - 1) // peak)] if peak else " " for _, n in days
         )
-        table.add_column(" ", justify="center", no_wrap=True)
-        table.add_column("Task")
+        lines.append(f"Last {_STATS_DAYS}d".ljust(11), style=dim)
+        lines.append(chart, style="green" if color else "")
+        lines.append(f" max {peak}/day\n", style=dim)
+        self.console.print(lines, end="")
 
-        if metadata:
-            table.add_column(
-                "Created", style="dim" if color else "", justify="right", no_wrap=True
-            )
+    def render_metrics(self, snapshot: dict[str, dict], color: bool) -> None:
+        """Render the daemon's metrics, one per line, with histograms summarized."""
+        self._render_pairs(metric_rows(snapshot), color)
 
-        for index, task in enumerate(sorted_tasks, start=1):
-            name = Text(task.task)
-            if color and task.pinned:
-                name.stylize("bold")
+    def render_memory(self, report: dict, color: bool) -> None:
+        """Render the daemon's memory use, object counts and cache sizes."""
+        self._render_pairs(memory_rows(report), color)
 
-            checkbox = "✔" if task.done else ""
-            created = (
-                task.created.strftime("%b %d %Y %H:%M")
-                if isinstance(task.created, datetime)
-                else ""
+    def _render_pairs(self, rows: list[tuple[str, str]], color: bool) -> None:
+        width = max((cell_len(key) for key, _ in rows), default=0)
+        lines = Text()
+        for key, value in rows:
+            lines.append(key.ljust(width + 1), style="cyan" if color else "")
+            lines.append(f"{value}\n")
+        self.console.print(lines, end="", soft_wrap=True)
+
+    @contextmanager
+    def _output(self, paged: bool, color: bool) -> Iterator[Console]:
+        """Yield the console to render to, piping it through a pager if asked."""
+        if not paged:
+            yield self.console
+            return
+
+        command = shlex.split(os.getenv("PAGER") or _DEFAULT_PAGER)
+        try:
+            pager = subprocess.Popen(command, stdin=subprocess.PIPE, text=True)
+        except OSError:
+            yield self.console
+            return
+
+        try:
+            yield Console(
+                file=pager.stdin,
+                force_terminal=color,
+                color_system=self.console.color_system if color else None,
+                width=self.console.width,
             )
+        finally:
+            try:
+                pager.stdin.close()
+            except BrokenPipeError:
+                pass
+            pager.wait()
+
+    def render_description(self, description: str) -> None:
+        """Render a task's Markdown description."""
+        from rich.markdown import Markdown
 
-            row = [str(index), checkbox, name]
-            if metadata:
-                row.append(created)
+        self.console.print(Markdown(description or "_No description_"))
 
-            table.add_row(*row)
 
-        self.console.print("\n")
-        self.console.print(table)
-        self.console.print("\n")
+def _created(task: Task) -> str:
+    if isinstance(task.created, datetime):
+        return task.created.strftime(_CREATED_FORMAT)
+    return ""
@@ -3,12 +3,292 @@
 
 """
 Textual TUI renderer for ReadySetDone.
+
+The task list is virtualized: `TaskListView` draws rows on demand through
+Textual's line API, so only the visible rows are ever rendered, however many
+tasks there are. Tasks are held in a `SortedTasks` view ordered by
+`default_sort_key`; `TaskUpdated` signals are diffed into it and only the rows
+from the first changed position down are repainted. Descriptions for the rows
+around the viewport are prefetched in the background into a bounded LRU cache.
 """
 
-from rsd.ui.ui import UI
+from collections import OrderedDict
+from functools import partial
+from typing import Optional
+
+from rich.segment import Segment
+from rich.style import Style
+from textual.app import App, ComposeResult
+from textual.binding import Binding
+from textual.containers import Horizontal
+from textual.geometry import Region, Size
+from textual.message import Message
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.widgets import Footer, Input, Markdown
+
+from rsd.api.sorting import SortedTasks
+from rsd.api.types import Id, Task
+from rsd.ipc import IpcClient
+from rsd.ui.ui import status_mark, tag_suffix
+
+_DESCRIPTION_CACHE_SIZE = 512  # descriptions kept in memory
+_PREFETCH_MARGIN = 20  # rows above and below the viewport to prefetch
+
+_DIM = Style(dim=True)
+_PINNED = Style(bold=True)
+_CURSOR = Style(reverse=True)
+
+
+class TaskListView(ScrollView, can_focus=True):
+    """A virtualized, keyboard-driven list of tasks."""
+
+    BINDINGS = [
+        Binding("up,k", "cursor(-1)", "Up", show=False),
+        Binding("down,j", "cursor(1)", "Down", show=False),
+        Binding("pageup", "page(-1)", "Page up", show=False),
+        Binding("pagedown", "page(1)", "Page down", show=False),
+        Binding("home,g", "first", "First", show=False),
+        Binding("end,G", "last", "Last", show=False),
+    ]
+
+    cursor = reactive(0, repaint=False)
+
+    class Highlighted(Message):
+        """Posted when the task under the cursor changes."""
+
+        def __init__(self, task: Optional[Task]) -> None:
+            super().__init__()
+            self.task = task
+
+    class Scrolled(Message):
+        """Posted when the visible range of rows changes."""
+
+        def __init__(self, start: int, end: int) -> None:
+            super().__init__()
+            self.start = start
+            self.end = end
+
+    def __init__(self, model: SortedTasks, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.model = model
+
+    @property
+    def visible_range(self) -> tuple[int, int]:
+        start = int(self.scroll_offset.y)
+        return start, min(
+            len(self.model), start + self.scrollable_content_region.height
+        )
+
+    @property
+    def current(self) -> Optional[Task]:
+        return self.model[self.cursor] if self.cursor < len(self.model) else None
+
+    def on_mount(self) -> None:
+        self.virtual_size = Size(0, len(self.model))
+        self.post_message(self.Highlighted(self.current))
+
+    def on_resize(self) -> None:
+        self.post_message(self.Scrolled(*self.visible_range))
+
+    def render_line(self, y: int) -> Strip:
+        width = self.scrollable_content_region.width
+        row = int(self.scroll_offset.y) + y
+        if row >= len(self.model):
+            return Strip.blank(width, self.rich_style)
+
+        task = self.model[row]
+        index_width = len(str(len(self.model)))
+        segments = [
+            Segment(str(row + 1).rjust(index_width), _DIM),
+            Segment(f" {status_mark(task)} "),
+            Segment(task.task, _PINNED if task.pinned else None),
+            Segment(tag_suffix(task), _DIM),
+        ]
+        strip = Strip(segments).crop_extend(0, width, self.rich_style)
+        if row == self.cursor:
+            strip = strip.apply_style(_CURSOR)
+        return strip
+
+    def tasks_changed(self, first: Optional[int]) -> None:
+        """Repaint after the model changed from position `first` onwards."""
+        if first is None:
+            return
+        self.virtual_size = Size(0, len(self.model))
+        previous = self.current
+        self.cursor = min(self.cursor, max(len(self.model) - 1, 0))
+        start, end = self.visible_range
+        if first < end:
+            top = max(first, start)
+            self.refresh_lines(top, end - top + 1)
+        if self.current is not previous:
+            self.post_message(self.Highlighted(self.current))
+
+    def watch_cursor(self, old: int, new: int) -> None:
+        self.refresh_lines(old)
+        self.refresh_lines(new)
+        self.scroll_to_region(Region(0, new, 1, 1), animate=False)
+        self.post_message(self.Highlighted(self.current))
+
+    def watch_scroll_y(self, old: float, new: float) -> None:
+        super().watch_scroll_y(old, new)
+        if int(old) != int(new):
+            self.post_message(self.Scrolled(*self.visible_range))
+
+    def action_cursor(self, delta: int) -> None:
+        self._move_to(self.cursor + delta)
+
+    def action_page(self, direction: int) -> None:
+        self._move_to(self.cursor + direction * self.scrollable_content_region.height)
+
+    def action_first(self) -> None:
+        self._move_to(0)
+
+    def action_last(self) -> None:
+        self._move_to(len(self.model) - 1)
+
+    def _move_to(self, row: int) -> None:
+        self.cursor = max(0, min(row, len(self.model) - 1))
+
+
+class ReadySetDoneApp(App):
+    """Task list with a description panel, kept live by daemon signals."""
+
+    TITLE = "ReadySetDone"
+    CSS = """
+    TaskListView { width: 2fr; }
+    #description { width: 1fr; border-left: solid $panel; padding: 0 1; }
+    #new-task { dock: bottom; display: none; }
+    #new-task.visible { display: block; }
+    """
+    BINDINGS = [
+        Binding("space", "toggle", "Toggle done"),
+        Binding("p", "pin", "Pin/unpin"),
+        Binding("x", "delete", "Delete"),
+        Binding("a", "add", "Add"),
+        Binding("escape", "cancel", "Cancel", show=False),
+        Binding("q", "quit", "Quit"),
+    ]
+
+    def __init__(self, ipc: IpcClient, tasks: list[Task]) -> None:
+        super().__init__()
+        self.ipc = ipc
+        self.model = SortedTasks(tasks)
+        self.descriptions: OrderedDict[str, str] = OrderedDict()
+
+    def compose(self) -> ComposeResult:
+        with Horizontal():
+            yield TaskListView(self.model)
+            yield Markdown(id="description")
+        yield Input(placeholder="New task", id="new-task")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        self.ipc.on_task_updated(self._on_task_updated)
+        self.ipc.on_task_due(self._on_task_due)
+        self.query_one(TaskListView).focus()
+
+    def _on_task_updated(self, tasks: list[Task]) -> None:
+        self.query_one(TaskListView).tasks_changed(self.model.sync(tasks))
+
+    def _on_task_due(self, tasks: list[Task]) -> None:
+        for task in tasks[:3]:
+            self.notify(task.task, title="Due now")
+        if len(tasks) > 3:
+            self.notify(f"and {len(tasks) - 3} more tasks", title="Due now")
+
+    @property
+    def _current(self) -> Optional[Task]:
+        return self.query_one(TaskListView).current
+
+    # Descriptions
+
+    def _cached_description(self, task_id: str) -> Optional[str]:
+        description = self.descriptions.get(task_id)
+        if description is not None:
+            self.descriptions.move_to_end(task_id)
+        return description
+
+    async def _load_description(self, task_id: str) -> str:
+        description = self._cached_description(task_id)
+        if description is None:
+            description = await self.ipc.get_description(Id(task_id)) or ""
+            self.descriptions[task_id] = description
+            if len(self.descriptions) > _DESCRIPTION_CACHE_SIZE:
+                self.descriptions.popitem(last=False)
+        return description
+
+    async def _show_description(self, task: Task) -> None:
+        description = await self._load_description(task.id)
+        if self._current is task:
+            await self.query_one("#description", Markdown).update(
+                description or "_No description_"
+            )
+
+    async def _prefetch(self, start: int, end: int) -> None:
+        start = max(0, start - _PREFETCH_MARGIN)
+        end = min(len(self.model), end + _PREFETCH_MARGIN)
+        for task in self.model.page(start, end - start):
+            if task.id not in self.descriptions:
+                await self._load_description(task.id)
+
+    def on_task_list_view_highlighted(self, message: TaskListView.Highlighted) -> None:
+        if message.task is None:
+            self.query_one("#description", Markdown).update("")
+            return
+        self.run_worker(
+            partial(self._show_description, message.task),
+            group="description",
+            exclusive=True,
+        )
+
+    def on_task_list_view_scrolled(self, message: TaskListView.Scrolled) -> None:
+        self.run_worker(
+            partial(self._prefetch, message.start, message.end),
+            group="prefetch",
+            exclusive=True,
+        )
+
+    # Actions
+
+    async def action_toggle(self) -> None:
+        if task := self._current:
+            await self.ipc.toggle(Id(task.id))
+
+    async def action_pin(self) -> None:
+        if task := self._current:
+            if task.pinned:
+                await self.ipc.unpin(Id(task.id))
+            else:
+                await self.ipc.pin(Id(task.id))
+
+    async def action_delete(self) -> None:
+        if task := self._current:
+            await self.ipc.delete_task(Id(task.id))
+
+    def action_add(self) -> None:
+        new_task = self.query_one("#new-task", Input)
+        new_task.add_class("visible")
+        new_task.focus()
+
+    def action_cancel(self) -> None:
+        new_task = self.query_one("#new-task", Input)
+        new_task.value = ""
+        new_task.remove_class("visible")
+        self.query_one(TaskListView).focus()
+
+    async def on_input_submitted(self, event: Input.Submitted) -> None:
+        name = event.value.strip()
+        self.action_cancel()
+        if name:
+            await self.ipc.add_task(Task.new(name))
+
 
+class TextualTui:
+    """The interactive TUI: driven by `run`, not by the CLI backends' `render`."""
 
-class TextualTui(UI):
-    def render(self, data):
-        # Placeholder for real TUI app
-        print("Launching TUI...")
+    async def run(self, ipc: IpcClient) -> None:
+        """Run the TUI against a started IPC client until the user quits."""
+        app = ReadySetDoneApp(ipc, await ipc.list_tasks())
+        await app.run_async()
@@ -5,12 +5,21 @@
 TUI subset interface and dispatcher for ReadySetDone.
 """
 
-from .textual_tui import TextualTui
-from rsd.ui.ui import UI
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .textual_tui import TextualTui
 
 
 class TuiUI:
-    def __new__(cls, ui_type: str = "textual") -> UI:
+    def __new__(cls, ui_type: str = "textual") -> "TextualTui":
         if ui_type == "textual":
+            try:
+                from .textual_tui import TextualTui
+            except ModuleNotFoundError as e:
+                raise RuntimeError(
+                    "The TUI needs Textual: pip install 'readysetdone[tui]'"
+                ) from e
+
             return TextualTui()
         raise ValueError(f"Unknown TUI UI type: {ui_type}")
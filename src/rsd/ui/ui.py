@@ -6,7 +6,10 @@ UI interface for both CLI and TUI modes in ReadySetDone.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any
+from datetime import date, timedelta
+from typing import Any, Optional
+
+from rsd.api.types import HistoryEntry, Task, TaskStats
 
 
 class UI(ABC):
@@ -14,3 +17,92 @@ class UI(ABC):
     def render(self, data: Any) -> None:
         """Render UI output based on the data provided."""
         pass
+
+
+def status_mark(task: Task) -> str:
+    """Return the one-character status shown before a task: done, repeating or open."""
+    if task.done:
+        return "✔"
+    return "↻" if task.recurrence else " "
+
+
+def history_summary(entry: HistoryEntry) -> str:
+    """Describe an operation, e.g. 'delete "Buy milk"' or 'import "a" and 9 more'."""
+    names = ", ".join(f'"{name}"' for name in entry.tasks)
+    more = entry.count - len(entry.tasks)
+    return f"{entry.label} {names}" + (f" and {more} more" if more > 0 else "")
+
+
+def metric_rows(snapshot: dict[str, dict]) -> list[tuple[str, str]]:
+    """
+    Flatten a metrics snapshot into (name{labels}, value) rows.
+
+    Histograms are summarized by count, mean and estimated percentiles.
+    Empty histograms and labelled counters that are still zero are skipped.
+    """
+    from rsd.metrics import quantile
+
+    def fmt(name: str, value: float) -> str:
+        if name.endswith("_seconds"):
+            return f"{value * 1000:.2f}ms"
+        if name.endswith("_bytes"):
+            return f"{value / 1024:.1f}KiB"
+        return f"{value:g}"
+
+    rows = []
+    for name, metric in snapshot.items():
+        for sample in metric["samples"]:
+            labels = ",".join(f"{k}={v}" for k, v in sample["labels"].items())
+            key = f"{name}{{{labels}}}" if labels else name
+            if metric["type"] == "counter" and labels and not sample["value"]:
+                continue
+            if metric["type"] != "histogram":
+                rows.append((key, f"{sample['value']:g}"))
+                continue
+            count = sum(sample["counts"])
+            if not count:
+                continue
+            percentiles = " ".join(
+                f"p{int(q * 100)}="
+                f"{fmt(name, quantile(metric['buckets'], sample['counts'], q))}"
+                for q in (0.5, 0.95, 0.99)
+            )
+            mean = fmt(name, sample["sum"] / count)
+            rows.append((key, f"n={count} mean={mean} {percentiles}"))
+    return rows
+
+
+def memory_rows(report: dict) -> list[tuple[str, str]]:
+    """Flatten a memory report into (name, value) rows, sizes in MiB."""
+
+    def mib(size: Optional[int]) -> str:
+        return "n/a" if size is None else f"{size / 2**20:.1f} MiB"
+
+    rows = [
+        ("rss", mib(report["rss_bytes"])),
+        ("peak_rss", mib(report["peak_rss_bytes"])),
+        ("tracing", mib(report["traced_bytes"]) if report["tracing"] else "off"),
+        ("gc_objects", str(report["gc_objects"])),
+    ]
+    rows += [(f"objects.{name}", str(n)) for name, n in report["objects"].items()]
+    rows += [(f"caches.{name}", str(n)) for name, n in report["caches"].items()]
+    return rows
+
+
+def progress_suffix(progress: Optional[tuple[int, int]]) -> str:
+    """Return the subtask progress shown after a task's name, e.g. " [3/7]"."""
+    return f" [{progress[0]}/{progress[1]}]" if progress else ""
+
+
+def daily_completions(stats: TaskStats, days: int) -> list[tuple[date, int]]:
+    """Return the completions on each of the last `days` days, oldest first."""
+    today = date.today()
+    return [
+        (day, stats.completed_daily.get(day.isoformat(), 0))
+        for day in (today - timedelta(days=n) for n in reversed(range(days)))
+    ]
+
+
+def tag_suffix(task: Task) -> str:
+    """Return the tags shown after a task's name, e.g. " +work +urgent"."""
+    return "".join(f" +{tag}" for tag in task.tags)
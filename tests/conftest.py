@@ -0,0 +1,9 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
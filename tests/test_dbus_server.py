@@ -0,0 +1,54 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+import pytest
+from dbus_next import DBusError
+
+from rsd.ipc import RequestScheduler
+from rsd.ipc.dbus.dbus_server import _ERRORS, _REQUEST_SECONDS, DbusServerInterface
+
+pytestmark = pytest.mark.anyio
+
+
+def exported_methods() -> dict:
+    return {
+        name: member.__dict__["__DBUS_METHOD"]
+        for name, member in vars(DbusServerInterface).items()
+        if "__DBUS_METHOD" in getattr(member, "__dict__", {})
+    }
+
+
+def calls(method: str) -> int:
+    (sample,) = [
+        s
+        for s in _REQUEST_SECONDS.snapshot()["samples"]
+        if s["labels"] == {"method": method}
+    ]
+    return sum(sample["counts"])
+
+
+def failures(method: str) -> float:
+    (sample,) = [
+        s for s in _ERRORS.snapshot()["samples"] if s["labels"] == {"method": method}
+    ]
+    return sample["value"]
+
+
+def test_every_method_is_timed():
+    methods = {s["labels"]["method"] for s in _REQUEST_SECONDS.snapshot()["samples"]}
+    assert set(exported_methods()) <= methods
+
+
+async def test_unscheduled_methods_are_timed_and_counted_when_they_fail():
+    interface = DbusServerInterface(None, RequestScheduler())  # type: ignore[arg-type]
+    methods = exported_methods()
+
+    before = calls("GetSchedulerStats")
+    await methods["GetSchedulerStats"].fn(interface)
+    assert calls("GetSchedulerStats") == before + 1
+
+    before, failed = calls("StartProfile"), failures("StartProfile")
+    with pytest.raises(DBusError):
+        await methods["StartProfile"].fn(interface, "cpu")
+    assert calls("StartProfile") == before + 1
+    assert failures("StartProfile") == failed + 1
@@ -0,0 +1,130 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+import random
+from contextlib import asynccontextmanager
+from dataclasses import replace
+
+import anyio
+import pytest
+
+from rsd.api.types import Id, Task
+from rsd.service import HistoryConflictError, TaskService
+from rsd.service.history import History
+from rsd.service.store import TaskStore
+
+pytestmark = pytest.mark.anyio
+
+
+@asynccontextmanager
+async def running_service(directory):
+    service = TaskService(directory / "tasks.json")
+    async with anyio.create_task_group() as tg:
+        await tg.start(service.run)
+        yield service
+        await service.aclose()
+
+
+@pytest.fixture
+async def service(tmp_path):
+    """A running TaskService over an empty store."""
+    async with running_service(tmp_path) as service:
+        yield service
+
+
+def state(service) -> dict[str, Task]:
+    return dict(service.snapshot.tasks)
+
+
+def test_record_keeps_the_net_change_of_each_task(tmp_path):
+    history = History(tmp_path / "history.json")
+    first = Task.new("first")
+    renamed = replace(first, task="renamed")
+    history.record("edit", [(None, first), (first, renamed)])
+    (operation,) = history.entries()
+    assert operation.label == "edit" and operation.count == 1
+    assert history.last().changes == ((None, renamed),)
+
+
+def test_history_is_bounded_and_a_new_operation_clears_redo(tmp_path):
+    history = History(tmp_path / "history.json", depth=3)
+    for i in range(5):
+        history.record(f"op{i}", [(None, Task.new(str(i)))])
+    assert [e.label for e in history.entries()] == ["op4", "op3", "op2"]
+    history.undo()
+    assert history.last_undone().label == "op4"
+    history.record("op5", [(None, Task.new("5"))])
+    assert history.last_undone() is None
+    assert history.redo() is None
+
+
+async def test_history_survives_a_save_and_load(tmp_path):
+    history = History(tmp_path / "history.json")
+    history.record("add", [(None, Task.new("a"))])
+    history.record("add", [(None, Task.new("b"))])
+    history.undo()
+    await history.save()
+
+    loaded = History(tmp_path / "history.json")
+    await loaded.load()
+    assert loaded.entries() == history.entries()
+    assert loaded.last().changes == history.last().changes
+    assert loaded.last_undone().changes == history.last_undone().changes
+
+
+async def test_undo_and_redo_walk_back_and_forth_through_states(service):
+    rng = random.Random(7)
+    states = [state(service)]
+    for step in range(40):
+        tasks = list(service.snapshot.tasks.values())
+        action = rng.random()
+        if action < 0.4 or not tasks:
+            parent = rng.choice([None, *tasks])
+            new = Task.new(f"task {step}")
+            await service.add_task(replace(new, parent=parent and parent.id))
+        elif action < 0.6:
+            await service.delete_task(Id(rng.choice(tasks).id))
+        elif action < 0.8:
+            await service.toggle_done(Id(rng.choice(tasks).id))
+        else:
+            await service.rename_task(Id(rng.choice(tasks).id), f"renamed {step}")
+        if state(service) != states[-1]:
+            states.append(state(service))
+
+    for expected in reversed(states[:-1]):
+        assert await service.undo() is not None
+        assert state(service) == expected
+    assert await service.undo() is None
+    for expected in states[1:]:
+        assert await service.redo() is not None
+        assert state(service) == expected
+    assert await service.redo() is None
+
+
+async def test_undo_restores_a_deleted_subtree(service):
+    parent, child = Task.new("parent"), Task.new("child")
+    await service.add_task(parent)
+    await service.add_task(replace(child, parent=parent.id))
+    await service.mark_done(Id(child.id))
+    await service.delete_task(Id(parent.id))
+    assert not service.snapshot.tasks
+
+    entry = await service.undo()
+    assert entry.label == "delete" and entry.count == 2
+    assert service.tree.children(parent.id) == {child.id}
+    assert service.tree.progress(parent.id) == (1, 1)
+
+
+async def test_undo_of_a_task_changed_since_is_a_conflict(tmp_path):
+    task = Task.new("task")
+    async with running_service(tmp_path) as service:
+        await service.add_task(task)
+        await service.rename_task(Id(task.id), "renamed")
+    # Edit the store while the daemon is stopped
+    await TaskStore(tmp_path / "tasks.json").save_all([replace(task, task="edited")])
+
+    async with running_service(tmp_path) as service:
+        with pytest.raises(HistoryConflictError):
+            await service.undo()
+        assert service.snapshot.tasks[task.id].task == "edited"
+        assert [entry.label for entry in await service.history_entries()] == ["add"]
@@ -0,0 +1,135 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+import io
+import random
+import uuid
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pytest
+
+from rsd.api.interchange import (
+    RecordWriter,
+    guess_format,
+    read_records,
+    record_from_dict,
+)
+from rsd.api.types import Task
+
+
+def random_records(count: int) -> list[tuple[Task, str | None]]:
+    rng = random.Random(9)
+    start = datetime(2025, 3, 1, 9, 30, 15, 123456)
+    records = []
+    for i in range(count):
+        created = start + timedelta(hours=rng.randrange(1000), seconds=i)
+        done = rng.random() < 0.4
+        task = Task(
+            id=str(uuid.UUID(int=rng.getrandbits(128))),
+            task=rng.choice(["Buy milk", "Call, maybe later", 'Say "hi"', "Ünïcode"]),
+            done=done,
+            created=created,
+            completed=created + timedelta(days=1) if done else None,
+            due=start + timedelta(days=rng.randrange(30))
+            if rng.random() < 0.5
+            else None,
+            pinned=rng.random() < 0.2,
+            recurrence=rng.choice([None, None, "daily", "weekly"]),
+            tags=rng.sample(["work", "home", "x-ray"], rng.randint(0, 2)),
+            parent=records[rng.randrange(len(records))][0].id
+            if records and rng.random() < 0.3
+            else None,
+        )
+        description = rng.choice([None, "Some *Markdown*\n\n- with, commas"])
+        records.append((task, description))
+    return records
+
+
+def round_trip(records, fmt: str, descriptions: bool = True):
+    out = io.StringIO()
+    RecordWriter(out, fmt, descriptions=descriptions).write(records)
+    return list(read_records(io.StringIO(out.getvalue()), fmt))
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+def test_round_trip_keeps_every_field(fmt):
+    records = random_records(100)
+    assert round_trip(records, fmt) == records
+
+
+def test_descriptions_are_only_written_on_request():
+    records = random_records(20)
+    assert round_trip(records, "jsonl", descriptions=False) == [
+        (task, None) for task, _ in records
+    ]
+
+
+def test_todo_txt_round_trip_keeps_dates_to_the_day_and_due_to_the_minute():
+    def day(value):
+        return value and datetime.combine(value.date(), datetime.min.time())
+
+    def minute(value):
+        return value and value.replace(second=0, microsecond=0)
+
+    records = random_records(100)
+    expected = [
+        (
+            replace(
+                task,
+                created=day(task.created),
+                completed=day(task.completed),
+                due=minute(task.due),
+            ),
+            None,
+        )
+        for task, _ in records
+    ]
+    assert round_trip(records, "todo.txt") == expected
+
+
+def test_todo_txt_lines():
+    ((task, description),) = read_records(
+        ["x 2025-01-02 2025-01-01 Water plants +Home due:2025-01-05 rec:+weekly\n"],
+        "todo.txt",
+    )
+    assert task.task == "Water plants" and task.done
+    assert task.completed == datetime(2025, 1, 2)
+    assert task.created == datetime(2025, 1, 1)
+    assert task.due == datetime(2025, 1, 5)
+    assert task.tags == ["home"] and task.recurrence == "weekly"
+    assert description is None
+
+
+def test_record_from_dict_fills_in_defaults():
+    task, description = record_from_dict({"task": "Plain", "tags": "a b a"})
+    assert uuid.UUID(task.id)
+    assert task.created is not None and task.tags == ["a", "b"]
+    assert description is None
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"task": " "},
+        {"task": "x", "id": "not-a-uuid"},
+        {"task": "x", "done": "maybe"},
+        {"task": "x", "recurrence": "sometimes"},
+        {"task": "x", "tags": ["bad tag("]},
+    ],
+)
+def test_record_from_dict_rejects_invalid_fields(data):
+    with pytest.raises(ValueError):
+        record_from_dict(data)
+
+
+def test_errors_name_the_line():
+    lines = ['{"task": "ok"}\n', "\n", '{"task": ""}\n']
+    with pytest.raises(ValueError, match="Line 3"):
+        list(read_records(lines, "jsonl"))
+
+
+def test_guess_format():
+    assert guess_format("tasks.CSV") == "csv"
+    assert guess_format("todo.txt") == "todo.txt"
+    assert guess_format("export.jsonl") == "jsonl"
@@ -0,0 +1,35 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+import logging
+import threading
+
+from rsd.logger import plain_logger, setup_logger, stop_logger
+
+
+class Capture(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[tuple[logging.LogRecord, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record, threading.current_thread().name))
+
+
+def test_background_records_reach_the_handlers_with_their_exception(monkeypatch):
+    capture = Capture()
+    monkeypatch.setattr(plain_logger, "create_handler", lambda color: capture)
+    setup_logger(background=True)
+    try:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("rsd.test").exception("Failed %s", "here")
+    finally:
+        stop_logger()
+        logging.getLogger().handlers.clear()
+
+    ((record, thread),) = capture.records
+    assert thread != threading.current_thread().name
+    assert record.msg == "Failed %s" and record.args == ("here",)
+    assert record.exc_info is not None and isinstance(record.exc_info[1], ValueError)
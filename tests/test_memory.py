@@ -0,0 +1,24 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+from rsd.metrics.memory import MemoryDiagnostics, object_counts
+
+
+def make_class(module: str) -> type:
+    return type("Node", (), {"__module__": module})
+
+
+def test_types_with_the_same_name_are_counted_apart():
+    first, second = make_class("pkg.first"), make_class("pkg.second")
+    objects = [first(), first(), first(), second(), second(), 1]
+    counts = object_counts(objects, ["pkg.missing.Node"], top=2)
+    assert counts == {"pkg.missing.Node": 0, "pkg.first.Node": 3, "pkg.second.Node": 2}
+
+
+def test_report_counts_the_requested_types(tmp_path):
+    report = MemoryDiagnostics(str(tmp_path)).report(
+        {"tasks": 3}, ["rsd.metrics.memory.MemoryDiagnostics"]
+    )
+    assert report["objects"]["rsd.metrics.memory.MemoryDiagnostics"] >= 1
+    assert report["gc_objects"] >= sum(report["objects"].values())
+    assert report["caches"] == {"tasks": 3}
@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+from datetime import datetime, timedelta
+
+import anyio
+import pytest
+
+from rsd.api.recurrence import next_due, parse_recurrence
+from rsd.api.types import Id, Task
+from rsd.service import TaskService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def service(tmp_path):
+    service = TaskService(tmp_path / "tasks.json", stats_path=tmp_path / "stats.json")
+    async with anyio.create_task_group() as tg:
+        await tg.start(service.run)
+        yield service
+        await service.aclose()
+
+
+def recurring(rule: str, due=None) -> Task:
+    task = Task.new(f"every {rule}")
+    task.recurrence, task.due = rule, due
+    return task
+
+
+@pytest.mark.parametrize(
+    "rule, step",
+    [
+        ("daily", timedelta(days=1)),
+        ("weekly", timedelta(weeks=1)),
+        ("12h", timedelta(hours=12)),
+        ("3w", timedelta(weeks=3)),
+    ],
+)
+def test_parse_recurrence(rule, step):
+    assert parse_recurrence(rule) == step
+
+
+@pytest.mark.parametrize("rule", ["", "hourly", "0d", "2m", "d", "-1d"])
+def test_parse_recurrence_rejects_invalid_rules(rule):
+    with pytest.raises(ValueError):
+        parse_recurrence(rule)
+
+
+def test_next_due_skips_missed_occurrences_and_keeps_the_time():
+    due = datetime(2025, 1, 1, 9)
+    assert next_due(due, "daily", datetime(2024, 12, 1)) == datetime(2025, 1, 2, 9)
+    assert next_due(due, "daily", due) == datetime(2025, 1, 2, 9)
+    assert next_due(due, "2d", datetime(2025, 1, 6, 8)) == datetime(2025, 1, 7, 9)
+
+
+async def test_first_occurrence_defaults_to_one_interval_from_now(service):
+    task = recurring("2d")
+    before = datetime.now()
+    await service.add_task(task)
+    stored = service.snapshot.tasks[task.id]
+    assert (
+        before + timedelta(days=2) <= stored.due <= datetime.now() + timedelta(days=2)
+    )
+    stats = await service.get_stats()
+    assert (stats.due, stats.overdue) == (1, 0)
+
+
+async def test_completing_moves_to_the_next_occurrence(service):
+    due = datetime.now() + timedelta(hours=1)
+    task = recurring("daily", due)
+    await service.add_task(task)
+
+    await service.mark_done(Id(task.id))
+    stored = service.snapshot.tasks[task.id]
+    assert not stored.done and stored.due == due + timedelta(days=1)
+    assert stored.completed is not None
+
+    await service.toggle_done(Id(task.id))
+    stored = service.snapshot.tasks[task.id]
+    assert not stored.done and stored.due == due + timedelta(days=2)
+    assert sum((await service.get_stats()).completed_daily.values()) == 2
+
+
+async def test_completing_an_overdue_occurrence_skips_the_missed_ones(service):
+    due = datetime.now().replace(microsecond=0) - timedelta(days=3, hours=1)
+    task = recurring("daily", due)
+    await service.add_task(task)
+    await service.mark_done(Id(task.id))
+    assert service.snapshot.tasks[task.id].due == due + timedelta(days=4)
@@ -0,0 +1,58 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+from datetime import datetime
+
+import anyio
+import pytest
+
+from rsd.cmd.rsdd import idle_handler
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeServer:
+    def __init__(self, clients: int) -> None:
+        self.clients = clients
+
+    def idle_time(self) -> float:
+        return 1.0
+
+    def client_count(self) -> int:
+        return self.clients
+
+
+class FakeDueScheduler:
+    def __init__(self, deadline) -> None:
+        self.deadline = deadline
+
+    def next_deadline(self):
+        return self.deadline
+
+
+async def stops(server, due_scheduler) -> bool:
+    stop_event = anyio.Event()
+    with anyio.move_on_after(0.2):
+        await idle_handler(server, due_scheduler, 0.05, stop_event)
+    return stop_event.is_set()
+
+
+async def test_idle_daemon_stops():
+    assert await stops(FakeServer(0), FakeDueScheduler(None))
+
+
+async def test_idle_daemon_stays_up_for_clients_and_due_dates():
+    assert not await stops(FakeServer(1), FakeDueScheduler(None))
+    assert not await stops(FakeServer(0), FakeDueScheduler(datetime(2030, 1, 1)))
+
+
+async def test_idle_daemon_stops_once_the_last_client_leaves():
+    server = FakeServer(1)
+    stop_event = anyio.Event()
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(idle_handler, server, FakeDueScheduler(None), 0.05, stop_event)
+        await anyio.sleep(0.1)
+        assert not stop_event.is_set()
+        server.clients = 0
+        with anyio.fail_after(1):
+            await stop_event.wait()
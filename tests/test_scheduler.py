@@ -0,0 +1,134 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+import anyio
+import pytest
+
+from rsd.ipc.scheduler import RequestScheduler, SchedulerBusyError
+
+pytestmark = pytest.mark.anyio
+
+
+async def wait_until(condition) -> None:
+    with anyio.fail_after(1):
+        while not condition():
+            await anyio.sleep(0)
+
+
+class Harness:
+    """Submits requests one at a time, so they are queued in a known order."""
+
+    def __init__(self, scheduler: RequestScheduler, tg) -> None:
+        self.scheduler = scheduler
+        self.tg = tg
+        self.log: list[str] = []
+        self.gate = anyio.Event()
+
+    async def block(self) -> None:
+        """Take the only slot with a write until `gate` is set."""
+        self.tg.start_soon(self.scheduler.submit, "write", "blocker", self.gate.wait)
+        await wait_until(lambda: self.scheduler.stats()["running"] == 1)
+
+    async def queue(self, kind: str, client: str, label: str) -> None:
+        queued = self.scheduler.stats()["queued"][kind]
+
+        async def run() -> None:
+            self.log.append(label)
+            await anyio.sleep(0)
+
+        self.tg.start_soon(self.scheduler.submit, kind, client, run)
+        await wait_until(lambda: self.scheduler.stats()["queued"][kind] > queued)
+
+
+async def test_reads_go_first_but_a_write_gets_through_after_each_burst():
+    scheduler = RequestScheduler(max_concurrent=1, read_burst=3)
+    async with anyio.create_task_group() as tg:
+        harness = Harness(scheduler, tg)
+        await harness.block()
+        for i in range(2):
+            await harness.queue("write", f"w{i}", "W")
+        for i in range(8):
+            await harness.queue("read", f"r{i}", "R")
+        harness.gate.set()
+    assert "".join(harness.log) == "RRRWRRRWRR"
+
+
+async def test_clients_are_served_round_robin_within_a_queue():
+    scheduler = RequestScheduler(max_concurrent=1)
+    async with anyio.create_task_group() as tg:
+        harness = Harness(scheduler, tg)
+        await harness.block()
+        for i in range(4):
+            await harness.queue("read", "a", f"a{i}")
+        for i in range(2):
+            await harness.queue("read", "b", f"b{i}")
+        await harness.queue("read", "c", "c0")
+        harness.gate.set()
+    assert harness.log == ["a0", "b0", "c0", "a1", "b1", "a2", "a3"]
+
+
+async def test_one_write_runs_at_a_time_alongside_concurrent_reads():
+    scheduler = RequestScheduler(max_concurrent=4)
+    running = {"read": 0, "write": 0}
+    peak = {"read": 0, "write": 0, "total": 0}
+
+    async def request(kind: str) -> None:
+        running[kind] += 1
+        peak[kind] = max(peak[kind], running[kind])
+        peak["total"] = max(peak["total"], sum(running.values()))
+        await anyio.sleep(0.001)
+        running[kind] -= 1
+
+    async with anyio.create_task_group() as tg:
+        for i in range(40):
+            kind = "write" if i % 3 == 0 else "read"
+            tg.start_soon(
+                scheduler.submit, kind, f"client{i % 5}", lambda k=kind: request(k)
+            )
+    assert peak["write"] == 1
+    assert peak["read"] > 1
+    assert peak["total"] <= 4
+    assert scheduler.stats()["running"] == 0
+    assert scheduler.stats()["wait"]["write"]["count"] == 14
+
+
+async def test_full_queues_reply_busy():
+    scheduler = RequestScheduler(
+        max_concurrent=1, max_queue_depth=3, max_pending_per_client=2
+    )
+
+    async def nothing() -> None:
+        pass
+
+    async with anyio.create_task_group() as tg:
+        harness = Harness(scheduler, tg)
+        await harness.block()
+        await harness.queue("read", "a", "a0")
+        await harness.queue("read", "a", "a1")
+        with pytest.raises(SchedulerBusyError, match="too many pending requests"):
+            await scheduler.submit("read", "a", nothing)
+        await harness.queue("read", "b", "b0")
+        with pytest.raises(SchedulerBusyError, match="read queue is full"):
+            await scheduler.submit("read", "c", nothing)
+        await harness.queue("write", "c", "c0")  # the write queue is separate
+        harness.gate.set()
+    assert harness.log == ["a0", "b0", "a1", "c0"]
+
+
+async def test_a_cancelled_request_gives_up_its_place():
+    scheduler = RequestScheduler(max_concurrent=1, max_pending_per_client=1)
+    async with anyio.create_task_group() as tg:
+        harness = Harness(scheduler, tg)
+        await harness.block()
+        with anyio.move_on_after(0.01):
+            await scheduler.submit("read", "a", anyio.sleep_forever)
+        assert scheduler.stats()["queued"]["read"] == 0
+        await harness.queue("read", "a", "a0")  # its share is free again
+        harness.gate.set()
+    assert harness.log == ["a0"]
+    assert scheduler.stats() | {"wait": None} == {
+        "running": 0,
+        "queued": {"read": 0, "write": 0},
+        "clients": 0,
+        "wait": None,
+    }
@@ -0,0 +1,59 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+from datetime import datetime
+
+import anyio
+import pytest
+
+from rsd.api.offload import OFFLOAD_MIN_TASKS
+from rsd.api.types import Task
+from rsd.service import search
+from rsd.service.search import SearchIndex
+
+pytestmark = pytest.mark.anyio
+
+
+def tasks(count: int) -> list[Task]:
+    return [
+        Task(id=f"{i:05}", task=f"task {i} word{i % 7}", created=datetime(2025, 1, 1))
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("count", [3, OFFLOAD_MIN_TASKS + 1])
+async def test_saved_index_loads_the_same(tmp_path, count):
+    path = tmp_path / "index.json"
+    index = SearchIndex(str(path))
+    index.index_names(tasks(count))
+    index.index_description("00001", "Some *notes* about word3", 5)
+    await index.save()
+    assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
+
+    loaded = SearchIndex(str(path))
+    await loaded.load()
+    assert len(loaded) == count
+    assert loaded.reconcile(tasks(count), {"00001": 5}) == []
+    for query in ("word3", "notes", "task 2", "wor"):
+        assert loaded.search(query, 50) == index.search(query, 50)
+
+
+async def test_autosave_retries_after_a_failed_save(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, "_SAVE_INTERVAL", 0.01)
+    index = SearchIndex(str(tmp_path / "index.json"))
+    saved = []
+
+    async def save(data):
+        saved.append(data)
+        if len(saved) == 1:
+            raise OSError("read-only file system")
+
+    monkeypatch.setattr(index.store, "save", save)
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(index.autosave)
+        index.index_names(tasks(2))
+        with anyio.fail_after(1):
+            while len(saved) < 2:
+                await anyio.sleep(0.01)
+        tg.cancel_scope.cancel()
+    assert [doc["id"] for doc in saved[1]["tasks"]] == ["00000", "00001"]
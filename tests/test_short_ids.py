@@ -0,0 +1,87 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+import random
+
+import pytest
+
+from rsd.api.short_ids import (
+    AmbiguousIdError,
+    ShortIdTrie,
+    UnknownIdError,
+    short_ids,
+)
+
+
+def expected_short_id(task_id: str, ids: set[str], min_length: int = 3) -> str:
+    for length in range(min_length, len(task_id) + 1):
+        prefix = task_id[:length]
+        if prefix.isdecimal():
+            continue  # would be read as a list index
+        if not any(other.startswith(prefix) for other in ids - {task_id}):
+            return prefix
+    return task_id
+
+
+def random_ids(rng: random.Random, count: int, alphabet: str = "abc") -> list[str]:
+    # A small alphabet makes long shared prefixes common
+    return ["".join(rng.choice(alphabet) for _ in range(8)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("alphabet", ["abc", "12a"])
+def test_short_ids_are_the_shortest_unique_prefixes(alphabet):
+    ids = random_ids(random.Random(1), 300, alphabet)
+    assert short_ids(ids) == {i: expected_short_id(i, set(ids)) for i in ids}
+
+
+@pytest.mark.parametrize("alphabet", ["abc", "12a"])
+def test_trie_matches_the_definition_under_adds_and_removes(alphabet):
+    rng = random.Random(2)
+    trie, ids = ShortIdTrie(), set()
+    for step, task_id in enumerate(random_ids(rng, 2000, alphabet)):
+        if ids and rng.random() < 0.4:
+            removed = rng.choice(sorted(ids))
+            trie.remove(removed)
+            ids.remove(removed)
+            assert removed not in trie
+        else:
+            trie.add(task_id)
+            ids.add(task_id)
+        if step % 100 == 0:
+            assert len(trie) == len(ids)
+            for i in ids:
+                assert trie.short_id(i) == expected_short_id(i, ids)
+    assert {i: trie.short_id(i) for i in ids} == short_ids(ids)
+
+
+def test_resolve():
+    trie = ShortIdTrie(["abcdef", "abcxyz", "bcdefg"])
+    assert trie.resolve("abcd") == "abcdef"
+    assert trie.resolve("B") == "bcdefg"
+    assert trie.resolve("bcdefg") == "bcdefg"
+    with pytest.raises(AmbiguousIdError, match="2 task IDs start with 'abc'"):
+        trie.resolve("abc")
+    for prefix in ("abq", "bcdx", "zz", "abcdefg"):
+        with pytest.raises(UnknownIdError):
+            trie.resolve(prefix)
+    with pytest.raises(UnknownIdError):
+        trie.short_id("missing")
+
+
+def test_removing_the_last_ids_empties_the_trie():
+    trie = ShortIdTrie(["aaa111", "aaa222"])
+    trie.remove("aaa111")
+    assert trie.short_id("aaa222") == "aaa"
+    trie.remove("aaa222")
+    assert len(trie) == 0
+    with pytest.raises(UnknownIdError):
+        trie.resolve("a")
+
+
+def test_short_ids_are_never_all_digits():
+    ids = ["45312345-aaaa", "45399999-bbbb", "abc12345-cccc"]
+    assert short_ids(ids)["45312345-aaaa"] == "45312345-"
+    trie = ShortIdTrie(ids)
+    assert trie.short_id("45399999-bbbb") == "45399999-"
+    assert trie.short_id("abc12345-cccc") == "abc"
+    assert trie.resolve("4531") == "45312345-aaaa"
@@ -0,0 +1,107 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pytest
+
+from rsd.api.sorting import SORT_KEYS, SortedTasks, get_task_id_by_index, select_page
+from rsd.api.types import Task
+
+START = datetime(2025, 1, 1)
+
+
+def random_task(rng: random.Random, task_id: str) -> Task:
+    return Task(
+        id=task_id,
+        task=rng.choice(["alpha", "Beta", "gamma", "delta"]),
+        done=rng.random() < 0.3,
+        created=START + timedelta(hours=rng.randrange(100)),
+        due=START + timedelta(days=rng.randrange(10)) if rng.random() < 0.5 else None,
+        pinned=rng.random() < 0.1,
+    )
+
+
+def expected(tasks: dict[str, Task], key) -> list[Task]:
+    return sorted(tasks.values(), key=lambda task: (key(task), task.id))
+
+
+@pytest.mark.parametrize("order", sorted(SORT_KEYS))
+@pytest.mark.parametrize("batch_size", [1, 5, 200])
+def test_update_matches_a_full_sort(order, batch_size):
+    rng = random.Random(f"{order}-{batch_size}")
+    key = SORT_KEYS[order]
+    tasks = {f"{i:04}": random_task(rng, f"{i:04}") for i in range(300)}
+    view = SortedTasks(tasks.values(), key)
+    next_id = len(tasks)
+    for _ in range(40):
+        before = list(view)
+        upserts, removals = [], []
+        for _ in range(batch_size):
+            if rng.random() < 0.2 and tasks:
+                removals.append(rng.choice(sorted(tasks)))
+            elif rng.random() < 0.5:
+                upserts.append(random_task(rng, f"{next_id:04}"))
+                next_id += 1
+            else:
+                old = tasks[rng.choice(sorted(tasks))]
+                upserts.append(replace(old, done=not old.done, pinned=not old.pinned))
+        for task_id in removals:
+            tasks.pop(task_id, None)
+        for task in upserts:
+            if task.id not in removals:
+                tasks[task.id] = task
+
+        changed = view.update(
+            [t for t in upserts if t.id not in removals], set(removals)
+        )
+        after = list(view)
+        assert after == expected(tasks, key)
+        if changed is None:
+            assert after == before
+        else:
+            assert after[:changed] == before[:changed]
+        for position, task in enumerate(after):
+            assert view.position(task.id) == position
+
+
+def test_update_without_changes_returns_none():
+    tasks = [Task(id=str(i), task=str(i), created=START) for i in range(3)]
+    view = SortedTasks(tasks)
+    assert view.update(tasks, ["missing"]) is None
+    assert view.sync(tasks) is None
+
+
+def test_sync_follows_a_full_task_list():
+    rng = random.Random(3)
+    tasks = [random_task(rng, str(i)) for i in range(50)]
+    view = SortedTasks(tasks[:30])
+    view.sync(tasks[20:])
+    assert list(view) == sorted(
+        tasks[20:], key=lambda t: (SORT_KEYS["default"](t), t.id)
+    )
+
+
+def test_page_and_subset():
+    rng = random.Random(4)
+    tasks = [random_task(rng, f"{i:03}") for i in range(100)]
+    view = SortedTasks(tasks)
+    ordered = list(view)
+    assert view.page(10, 5) == ordered[10:15]
+    assert view.page(95) == ordered[95:]
+    for ids in ({t.id for t in tasks[:5]}, {t.id for t in tasks[::2]}):
+        matching = [t for t in ordered if t.id in ids]
+        assert view.subset(ids, 1, 3) == matching[1:4]
+        assert view.subset(ids | {"missing"}) == matching
+
+
+def test_select_page_and_index_agree_with_the_sort():
+    rng = random.Random(5)
+    tasks = [random_task(rng, f"{i:03}") for i in range(60)]
+    ordered = sorted(tasks, key=SORT_KEYS["default"])
+    assert select_page(tasks, limit=7, offset=3) == ordered[3:10]
+    assert get_task_id_by_index(tasks, 1).id == ordered[0].id
+    with pytest.raises(IndexError):
+        get_task_id_by_index(tasks, 61)
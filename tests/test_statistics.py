@@ -0,0 +1,78 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import anyio
+import pytest
+
+from rsd.api.types import Task
+from rsd.service import statistics
+from rsd.service.statistics import Statistics
+
+NOW = datetime(2025, 6, 15, 12, 30)
+
+
+def random_task(rng: random.Random, task_id: str) -> Task:
+    return Task(
+        id=task_id,
+        task=task_id,
+        done=rng.random() < 0.3,
+        created=NOW - timedelta(days=30),
+        due=NOW + timedelta(hours=rng.randrange(-72, 72), minutes=rng.choice([0, 30]))
+        if rng.random() < 0.7
+        else None,
+        pinned=rng.random() < 0.2,
+    )
+
+
+def test_due_counts_match_a_full_scan(tmp_path):
+    rng = random.Random(7)
+    tasks = {str(i): random_task(rng, str(i)) for i in range(200)}
+    stats = Statistics(str(tmp_path / "stats.json"))
+    stats.reset(tasks.values())
+    for step in range(1000):
+        task_id = str(rng.randrange(250))
+        before = tasks.get(task_id)
+        after = random_task(rng, task_id) if rng.random() < 0.8 else None
+        if before is not None and after is not None and rng.random() < 0.3:
+            after = replace(before, done=not before.done)
+        stats.update(before, after, NOW)
+        if after is None:
+            tasks.pop(task_id, None)
+        else:
+            tasks[task_id] = after
+        if step % 50 == 0:
+            now = NOW + timedelta(hours=rng.randrange(-48, 48))
+            due = [t.due for t in tasks.values() if t.due and not t.done]
+            result = stats.stats(now)
+            assert result.due == len(due)
+            assert result.overdue == sum(d <= now for d in due)
+            assert result.open == sum(not t.done for t in tasks.values())
+            assert result.pinned == sum(t.pinned for t in tasks.values())
+
+
+@pytest.mark.anyio
+async def test_autosave_retries_after_a_failed_save(tmp_path, monkeypatch):
+    monkeypatch.setattr(statistics, "_SAVE_INTERVAL", 0.01)
+    stats = Statistics(str(tmp_path / "stats.json"))
+    saved = []
+
+    async def save(data):
+        if not saved:
+            saved.append(None)
+            raise OSError("disk full")
+        saved.append(data)
+
+    monkeypatch.setattr(stats.store, "save", save)
+    task = Task(id="1", task="1", created=NOW)
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(stats.autosave)
+        stats.update(task, replace(task, done=True), NOW)
+        with anyio.fail_after(1):
+            while len(saved) < 2:
+                await anyio.sleep(0.01)
+        tg.cancel_scope.cancel()
+    assert saved[1]["daily"] == {NOW.strftime("%Y-%m-%d"): 1}
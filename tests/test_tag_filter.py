@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+import random
+
+import pytest
+
+from rsd.api.tag_filter import And, Has, Not, Or, parse_tag_filter, select
+
+TAGS = ["work", "home", "urgent", "waiting"]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("work", Has("work")),
+        ("+Work", Has("work")),
+        ("-waiting", Not(Has("waiting"))),
+        ("not not home", Not(Not(Has("home")))),
+        ("+work -waiting", And((Has("work"), Not(Has("waiting"))))),
+        ("work AND home", And((Has("work"), Has("home")))),
+        (
+            "+work -waiting or +urgent",
+            Or((And((Has("work"), Not(Has("waiting")))), Has("urgent"))),
+        ),
+        (
+            "work (home or urgent)",
+            And((Has("work"), Or((Has("home"), Has("urgent"))))),
+        ),
+        ("not (a or b) c", And((Not(Or((Has("a"), Has("b")))), Has("c")))),
+        ("  x-ray  ", Has("x-ray")),
+    ],
+)
+def test_parse(text, expected):
+    assert parse_tag_filter(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text", ["", "   ", "(work", "work)", "and", "work or", "not", "()", "+"]
+)
+def test_parse_errors(text):
+    with pytest.raises(ValueError):
+        parse_tag_filter(text)
+
+
+def matches(expr, tags: set[str]) -> bool:
+    match expr:
+        case Has(tag):
+            return tag in tags
+        case Not(operand):
+            return not matches(operand, tags)
+        case And(operands):
+            return all(matches(op, tags) for op in operands)
+        case Or(operands):
+            return any(matches(op, tags) for op in operands)
+
+
+def random_expression(rng: random.Random, depth: int = 0) -> str:
+    choice = rng.random()
+    if depth > 2 or choice < 0.3:
+        return rng.choice(["", "+", "-"]) + rng.choice(TAGS)
+    if choice < 0.45:
+        return f"not {random_expression(rng, depth + 1)}"
+    operator = rng.choice([" ", " and ", " or ", " AND ", " OR "])
+    operands = [random_expression(rng, depth + 1) for _ in range(rng.randint(2, 3))]
+    return f"({operator.join(operands)})"
+
+
+def test_select_matches_evaluating_each_task():
+    rng = random.Random(11)
+    tasks = {str(i): {t for t in TAGS if rng.random() < 0.4} for i in range(200)}
+    index = {tag: {i for i, tags in tasks.items() if tag in tags} for tag in TAGS}
+    universe = set(tasks)
+    for _ in range(300):
+        expr = parse_tag_filter(random_expression(rng))
+        expected = {i for i, tags in tasks.items() if matches(expr, tags)}
+        assert select(expr, index, universe) == expected
@@ -0,0 +1,157 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+import logging
+
+import anyio
+import pytest
+
+from rsd.api.types import Task
+from rsd.service import TaskService
+from rsd.service.store import TaskStore
+
+pytestmark = pytest.mark.anyio
+
+
+class GatedStore:
+    """Wraps a service's store: counts saves and can hold the next one."""
+
+    def __init__(self, service: TaskService) -> None:
+        self.save_all = service.store.save_all
+        self.saves = 0
+        self.gate: anyio.Event | None = None
+        self.waiting = anyio.Event()
+        self.error: Exception | None = None
+        service.store.save_all = self._save_all
+
+    async def _save_all(self, tasks) -> None:
+        self.saves += 1
+        if self.gate is not None:
+            self.waiting.set()
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        await self.save_all(tasks)
+
+    def hold(self) -> anyio.Event:
+        self.gate, self.waiting = anyio.Event(), anyio.Event()
+        return self.gate
+
+
+@pytest.fixture
+async def service(tmp_path):
+    service = TaskService(tmp_path / "tasks.json")
+    async with anyio.create_task_group() as tg:
+        await tg.start(service.run)
+        yield service
+        await service.aclose()
+
+
+async def test_concurrent_commands_are_committed_in_batches(tmp_path, service):
+    store = GatedStore(service)
+    tasks = [Task.new(f"task {i}") for i in range(50)]
+    async with anyio.create_task_group() as tg:
+        gate = store.hold()
+        tg.start_soon(service.add_task, tasks[0])
+        await store.waiting.wait()
+        for task in tasks[1:]:
+            tg.start_soon(service.add_task, task)
+        await anyio.sleep(0.01)
+        store.gate = None
+        gate.set()
+
+    assert store.saves == 2  # the held command, then the 49 queued behind it
+    assert service.snapshot.version == 2
+    assert set(service.snapshot.tasks) == {task.id for task in tasks}
+    stored = await TaskStore(tmp_path / "tasks.json").load_all()
+    assert {task.id for task in stored} == set(service.snapshot.tasks)
+
+
+async def test_reads_see_the_last_commit_while_a_write_is_being_saved(service):
+    store = GatedStore(service)
+    first = Task.new("first")
+    await service.add_task(first)
+    second = Task.new("second")
+    async with anyio.create_task_group() as tg:
+        gate = store.hold()
+        tg.start_soon(service.add_task, second)
+        await store.waiting.wait()
+        assert [t.id for t in await service.list_tasks()] == [first.id]
+        gate.set()
+    assert [t.id for t in await service.list_tasks()] == [first.id, second.id]
+
+
+async def test_a_failed_command_is_rolled_back_without_its_batch(service):
+    store = GatedStore(service)
+    kept, dropped, after = Task.new("kept"), Task.new("dropped"), Task.new("after")
+
+    def fail_halfway(tx) -> None:
+        tx.put(dropped)
+        raise ValueError("invalid")
+
+    errors = []
+
+    async def failing() -> None:
+        try:
+            await service._submit(fail_halfway, label="bad")
+        except ValueError as e:
+            errors.append(e)
+
+    async with anyio.create_task_group() as tg:
+        gate = store.hold()
+        tg.start_soon(service.add_task, Task.new("held"))
+        await store.waiting.wait()
+        store.gate = None
+        tg.start_soon(service.add_task, kept)
+        await anyio.sleep(0.01)
+        tg.start_soon(failing)
+        await anyio.sleep(0.01)
+        tg.start_soon(service.add_task, after)
+        await anyio.sleep(0.01)
+        gate.set()
+
+    assert [str(e) for e in errors] == ["invalid"]
+    assert store.saves == 2
+    tasks = service.snapshot.tasks
+    assert kept.id in tasks and after.id in tasks and dropped.id not in tasks
+    assert [e.label for e in await service.history_entries()] == ["add"] * 3
+
+
+async def test_a_failed_save_fails_the_whole_batch(service):
+    store = GatedStore(service)
+    await service.add_task(Task.new("before"))
+    snapshot = service.snapshot
+    store.error = OSError("disk full")
+    results = []
+
+    async def add(task: Task) -> None:
+        try:
+            await service.add_task(task)
+            results.append("ok")
+        except OSError as e:
+            results.append(str(e))
+
+    async with anyio.create_task_group() as tg:
+        for i in range(5):
+            tg.start_soon(add, Task.new(f"task {i}"))
+
+    assert results == ["disk full"] * 5
+    assert service.snapshot is snapshot
+    assert [e.label for e in await service.history_entries()] == ["add"]
+
+
+async def test_a_failing_listener_does_not_fail_the_commit(service, caplog):
+    seen = []
+
+    def broken(snapshot, changes) -> None:
+        raise RuntimeError("listener bug")
+
+    service.add_listener(broken)
+    service.add_listener(lambda snapshot, changes: seen.append(len(changes)))
+    task = Task.new("task")
+    with caplog.at_level(logging.ERROR):
+        await service.add_task(task)
+
+    assert task.id in service.snapshot.tasks
+    assert seen == [1]
+    assert "Commit listener" in caplog.text and "listener bug" in caplog.text
@@ -0,0 +1,116 @@
+# SPDX-License-Identifier: MIT
+# Copyright David Kristiansen
+
+import random
+from dataclasses import replace
+from typing import Optional
+
+from rsd.api.types import Task
+from rsd.service.task_tree import TaskTree
+
+
+def task(task_id: str, parent: Optional[str] = None, done: bool = False) -> Task:
+    return Task(id=task_id, task=task_id, done=done, parent=parent)
+
+
+def expected_children(tasks: dict[str, Task], parent: Optional[str]) -> set[str]:
+    return {t.id for t in tasks.values() if t.parent == parent}
+
+
+def expected_progress(tasks: dict[str, Task], task_id: str) -> tuple[int, int]:
+    done = total = 0
+    stack = list(expected_children(tasks, task_id))
+    while stack:
+        child = stack.pop()
+        done += tasks[child].done
+        total += 1
+        stack.extend(expected_children(tasks, child))
+    return done, total
+
+
+def descendants(tasks: dict[str, Task], task_id: str) -> set[str]:
+    found, stack = set(), [task_id]
+    while stack:
+        children = expected_children(tasks, stack.pop())
+        found |= children
+        stack.extend(children)
+    return found
+
+
+def assert_matches(tree: TaskTree, tasks: dict[str, Task]) -> None:
+    assert len(tree) == len(tasks)
+    assert tree.children(None) == expected_children(tasks, None)
+    for task_id in tasks:
+        assert tree.children(task_id) == expected_children(tasks, task_id)
+        assert tree.progress(task_id) == expected_progress(tasks, task_id)
+
+
+def test_progress_counts_the_whole_subtree():
+    tree = TaskTree(
+        [
+            task("root"),
+            task("a", "root", done=True),
+            task("b", "root"),
+            task("b1", "b", done=True),
+            task("b2", "b"),
+        ]
+    )
+    assert tree.children("root") == {"a", "b"}
+    assert tree.progress("root") == (2, 4)
+    assert tree.progress("b") == (1, 2)
+    assert tree.progress("b1") == (0, 0)
+
+
+def test_children_added_before_their_parent_are_counted():
+    tree = TaskTree([task("child", "parent", done=True), task("grandchild", "child")])
+    assert tree.children("parent") == {"child"}
+    tree.update("parent", None, task("parent"))
+    assert tree.progress("parent") == (1, 2)
+    assert tree.children(None) == {"parent"}
+
+
+def test_moving_and_deleting_a_subtree_updates_both_paths():
+    tasks = {
+        t.id: t
+        for t in [task("a"), task("b"), task("c", "a"), task("d", "c", done=True)]
+    }
+    tree = TaskTree(tasks.values())
+    moved = replace(tasks["c"], parent="b")
+    tree.update("c", tasks["c"], moved)
+    assert tree.progress("a") == (0, 0)
+    assert tree.progress("b") == (1, 2)
+    tree.update("c", moved, None)
+    tree.update("d", tasks["d"], None)
+    assert tree.progress("b") == (0, 0)
+    assert tree.children("b") == set()
+
+
+def test_random_changes_match_a_full_recount():
+    rng = random.Random(42)
+    tasks: dict[str, Task] = {}
+    tree = TaskTree()
+    for step in range(1500):
+        ids = list(tasks)
+        action = rng.random()
+        if action < 0.4 or not ids:
+            parent = rng.choice([None, f"missing{rng.randrange(3)}", *ids])
+            after = task(f"t{step}", parent, done=rng.random() < 0.3)
+            tree.update(after.id, None, after)
+            tasks[after.id] = after
+        elif action < 0.55:
+            task_id = rng.choice(ids)
+            tree.update(task_id, tasks.pop(task_id), None)
+        elif action < 0.8:
+            before = tasks[rng.choice(ids)]
+            after = replace(before, done=not before.done)
+            tree.update(after.id, before, after)
+            tasks[after.id] = after
+        else:
+            before = tasks[rng.choice(ids)]
+            allowed = set(ids) - descendants(tasks, before.id) - {before.id}
+            after = replace(before, parent=rng.choice([None, *sorted(allowed)]))
+            tree.update(after.id, before, after)
+            tasks[after.id] = after
+        if step % 50 == 0:
+            assert_matches(tree, tasks)
+    assert_matches(tree, tasks)